@@ -0,0 +1,41 @@
+# BundleTracker 클래스는 웨이퍼별 이미지 묶음이 PDF로 만들 준비가 되었는지 판단합니다.
+# 웨이퍼의 이미지가 quiet_period초 동안 더 들어오지 않거나, 이미지 수가 expected_count에 도달하면 바로 PDF를 만듭니다.
+# 조용한 시간은 첫 이미지가 들어온 뒤부터 세며, 그 전에는 wait_time초까지 이미지를 기다립니다.
+# wait_time은 상한으로도 사용되어, 이미지가 계속 들어와도 처음 등록한 뒤 wait_time초가 지나면 PDF를 만듭니다.
+# 묶음의 키는 (날짜, 시각)이며, 이미지 폴더에 파일이 생성되거나 복사될 때 image_added로 알려 줍니다.
+class BundleTracker:
+    def __init__(self, scheduler, image_index, quiet_period, expected_count, log_debug):
+        # scheduler: PDF 변환 작업을 실행할 DelayedJobScheduler
+        # image_index: 이미지 폴더의 ImageIndex
+        # quiet_period: 마지막 이미지가 들어온 뒤 묶음이 끝났다고 판단할 때까지 기다릴 시간(초)
+        # expected_count: 웨이퍼 하나의 이미지 수. 0이면 사용하지 않습니다.
+        # log_debug: 디버그 메시지를 기록하기 위한 함수
+        self.scheduler = scheduler
+        self.image_index = image_index
+        self.quiet_period = float(quiet_period)
+        self.expected_count = int(expected_count)
+        self.log_debug = log_debug
+
+    # PDF 변환 작업을 등록합니다. 이미 이미지가 있으면 조용한 시간 뒤에, 아직 없으면 wait_time초 뒤에 실행되며 wait_time초를 넘기지 않습니다.
+    def schedule(self, key, wait_time, func, *args, on_done=None):
+        delay = float(wait_time)
+        if self.image_index.find(*key):
+            delay = min(self.quiet_period, delay)
+        self.scheduler.schedule(key, delay, func, *args, on_done=on_done, max_delay=wait_time)
+        self._check_complete(key)
+
+    # 이미지 색인에 새 파일이 추가되었음을 알립니다. tokens는 ImageIndex.add가 반환한 날짜 문자열 목록입니다.
+    # 해당 웨이퍼의 작업이 대기 중이면 조용한 시간을 지금부터 다시 시작하고, 이미지 수가 채워졌는지 확인합니다.
+    def image_added(self, tokens):
+        for token in tokens:
+            key = tuple(token.split('_'))
+            if self.scheduler.reschedule(key, self.quiet_period):
+                self._check_complete(key)
+
+    # 이미지 수가 expected_count에 도달했으면 작업을 바로 실행합니다.
+    def _check_complete(self, key):
+        if not self.expected_count:
+            return
+        count = len(self.image_index.find(*key))
+        if count >= self.expected_count and self.scheduler.run_now(key):
+            self.log_debug(f"BundleTracker: {key} has {count} images, converting now")
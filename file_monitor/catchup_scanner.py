@@ -0,0 +1,170 @@
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from utils import normalize_path
+
+# 날짜 이름 폴더(YYYYMM, YYYY-MM, YYYY_MM, YYYYMMDD, YYYY-MM-DD, YYYY_MM_DD)를 찾는 패턴입니다.
+# 연도만 있는 이름은 로트 번호 등과 구분할 수 없으므로 연도와 월이 모두 있어야 하며, 구분자는 한 가지만 사용해야 합니다.
+DATE_FOLDER_PATTERN = re.compile(r"(\d{4})([-_]?)(\d{2})(?:\2(\d{2}))?")
+
+# 날짜 이름 폴더는 그 기간이 끝난 뒤에도 이만큼(초)은 파일이 더 들어올 수 있다고 보고 검색합니다. (자정을 넘겨 끝나는 작업 등)
+DATE_FOLDER_GRACE = 24 * 60 * 60
+
+# 폴더 이름이 날짜이면 그 기간이 끝나는 시각(타임스탬프)을 반환하고, 아니면 None을 반환합니다.
+def date_folder_end(name):
+    match = DATE_FOLDER_PATTERN.fullmatch(name)
+    if not match:
+        return None
+    year, month, day = (int(value) if value else None for value in match.group(1, 3, 4))
+    # 로트 번호처럼 우연히 숫자로만 된 이름을 날짜로 오인하지 않도록 연도와 월의 범위를 제한합니다.
+    if not 2000 <= year <= 2099 or not 1 <= month <= 12:
+        return None
+    try:
+        if day is not None:
+            end = datetime(year, month, day) + timedelta(days=1)
+        elif month == 12:
+            end = datetime(year + 1, 1, 1)
+        else:
+            end = datetime(year, month + 1, 1)
+    except ValueError:
+        return None
+    return end.timestamp()
+
+# CatchUpScanner 클래스는 프로그램이 멈춰 있던 동안 모니터링 폴더에 생긴 파일을 찾아 이벤트 큐에 넣습니다.
+# 폴더별로 마지막으로 처리한 시각(워터마크)을 파일에 저장해 두고, 그 이후에 수정된 파일만 다시 처리합니다.
+# 날짜 이름 폴더는 기간이 워터마크보다 충분히 이전에 끝났으면 들어가지 않습니다.
+# 검색은 감시를 시작한 뒤 별도 스레드에서 실행하므로 모니터링 시작을 늦추지 않습니다.
+class CatchUpScanner:
+    def __init__(self, watermark_file, exclude_folders, log_debug, margin=2.0, prune_date_folders=False):
+        # watermark_file: 폴더별 워터마크를 저장하는 JSON 파일 경로
+        # exclude_folders: 검색에서 제외할 폴더 목록
+        # log_debug: 디버그 메시지를 기록하기 위한 함수
+        # margin: 파일 서버와의 시간 차이를 고려해 워터마크보다 조금 이른 파일까지 포함하는 여유 시간(초)
+        # prune_date_folders: 워터마크 이전에 끝난 날짜 이름 폴더를 건너뛸지 여부
+        self.watermark_file = normalize_path(watermark_file)
+        self.exclude_folders = [normalize_path(folder) for folder in exclude_folders]
+        self.log_debug = log_debug
+        self.margin = float(margin)
+        self.prune_date_folders = prune_date_folders
+        self.watermarks = self._load()
+        self.thread = None
+        self.completed = False  # 모든 폴더의 검색이 끝났는지 여부
+
+    # 저장된 워터마크를 불러옵니다. 파일이 없거나 손상되었으면 빈 딕셔너리를 반환합니다.
+    def _load(self):
+        try:
+            with open(self.watermark_file, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    # 워터마크를 임시 파일에 쓴 뒤 교체하여, 저장 중 중단되어도 기존 파일이 손상되지 않도록 합니다.
+    def _save(self):
+        temp_file = f"{self.watermark_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as file:
+            json.dump(self.watermarks, file, ensure_ascii=False, indent=2)
+        os.replace(temp_file, self.watermark_file)
+
+    # 경로가 제외 폴더에 속하는지 확인합니다.
+    def is_excluded(self, path):
+        return any(path.startswith(exclude_folder) for exclude_folder in self.exclude_folders)
+
+    # 검색을 별도 스레드에서 시작합니다. 감시(observer)를 시작한 뒤에 호출합니다.
+    def start(self, roots, event_queue, stop_event):
+        self.thread = threading.Thread(target=self._scan_in_background, args=(roots, event_queue, stop_event), name="CatchUpScanner")
+        self.thread.daemon = True
+        self.thread.start()
+
+    # 검색 스레드가 끝날 때까지 기다립니다.
+    def join(self):
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def _scan_in_background(self, roots, event_queue, stop_event):
+        try:
+            total = self.scan(roots, event_queue, stop_event)
+        except Exception as e:
+            self.log_debug(f"CatchUpScanner: Catch-up scan failed: {str(e)}")
+            return
+        if self.completed:
+            self.log_debug(f"CatchUpScanner: Catch-up scan queued {total} files")
+        else:
+            self.log_debug(f"CatchUpScanner: Catch-up scan stopped early after queuing {total} files")
+
+    # 각 폴더에서 워터마크 이후에 수정된 파일을 찾아 수정 시각 순서대로 'created' 이벤트로 큐에 넣습니다.
+    # 처음 보는 폴더는 과거 파일 전체를 다시 처리하지 않도록 현재 시각을 기준점으로만 기록합니다.
+    # stop_event가 설정되면 검색을 멈추며, 검색을 마친 폴더의 워터마크만 옮깁니다.
+    def scan(self, roots, event_queue, stop_event=None):
+        scan_started = time.time()
+        total = 0
+        self.completed = False
+        for root in roots:
+            root = normalize_path(root)
+            watermark = self.watermarks.get(root)
+            if watermark is None:
+                self.log_debug(f"CatchUpScanner: No watermark for {root}, recording baseline only")
+            elif os.path.isdir(root):
+                found = self._scan_root(root, watermark - self.margin, stop_event)
+                if found is None:
+                    break
+                missed = sorted(found)
+                for _, path in missed:
+                    event_queue.put(('created', path))
+                total += len(missed)
+                self.log_debug(f"CatchUpScanner: Queued {len(missed)} missed files from {root}")
+            self.watermarks[root] = scan_started
+        else:
+            self.completed = True
+        self._save()
+        return total
+
+    # 모니터링을 정상적으로 멈출 때 호출합니다. 지금까지의 이벤트는 모두 처리되었으므로 워터마크를 현재 시각으로 옮깁니다.
+    # 검색이 끝나기 전에 멈췄다면 남은 파일을 다음 시작 때 찾을 수 있도록 워터마크를 옮기지 않습니다.
+    def mark_stopped(self, roots):
+        if not self.completed:
+            self.log_debug("CatchUpScanner: Catch-up scan did not finish, keeping watermarks")
+            return
+        stopped = time.time()
+        for root in roots:
+            self.watermarks[normalize_path(root)] = stopped
+        self._save()
+
+    # os.scandir로 폴더를 순회하며 since 이후에 수정된 파일의 (수정 시각, 경로)를 반환합니다.
+    # 기간이 since보다 DATE_FOLDER_GRACE 이상 먼저 끝난 날짜 이름 폴더는 들어가지 않습니다.
+    # stop_event가 설정되면 None을 반환합니다.
+    def _scan_root(self, root, since, stop_event=None):
+        found = []
+        pruned = 0
+        stack = [root]
+        while stack:
+            if stop_event is not None and stop_event.is_set():
+                return None
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        path = normalize_path(entry.path)
+                        if self.is_excluded(path):
+                            continue
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                end = date_folder_end(entry.name) if self.prune_date_folders else None
+                                if end is not None and end + DATE_FOLDER_GRACE <= since:
+                                    pruned += 1
+                                    continue
+                                stack.append(path)
+                            elif entry.is_file():
+                                mtime = entry.stat().st_mtime  # Windows에서는 목록 조회 시 함께 받아 온 값이라 추가 비용이 없습니다.
+                                if mtime > since:
+                                    found.append((mtime, path))
+                        except OSError:
+                            continue
+            except OSError as e:
+                self.log_debug(f"CatchUpScanner: Cannot scan {directory}: {str(e)}")
+        if pruned:
+            self.log_debug(f"CatchUpScanner: Skipped {pruned} date folders older than the watermark in {root}")
+        return found
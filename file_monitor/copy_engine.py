@@ -0,0 +1,111 @@
+import hashlib
+import os
+import shutil
+import time
+from utils import wait_until_stable
+
+# 복사 중인 임시 파일의 접미사입니다. 임시 파일 이름은 '.<원본 이름>.<원본 수정 시각(ns)>.part' 형식입니다.
+PARTIAL_SUFFIX = '.part'
+
+# 경로가 CopyEngine이 복사 중인 임시 파일인지 확인하는 함수입니다.
+def is_partial_copy(path):
+    name = os.path.basename(path)
+    return name.startswith('.') and name.endswith(PARTIAL_SUFFIX)
+
+# 파일 전체의 해시 값을 큰 단위로 읽어 계산하는 함수입니다.
+def file_digest(file_path, chunk_size):
+    digest = hashlib.blake2b()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+# CopyEngine 클래스는 파일 쓰기가 끝난 뒤에 파일을 안전하게 복사합니다.
+# 1. 원본의 크기와 수정 시각이 변하지 않을 때까지 기다립니다.
+# 2. 대상 파일이 이미 같은 크기와 수정 시각(선택적으로 해시)이면 복사하지 않습니다.
+# 3. 큰 단위로 임시 파일에 복사한 뒤 이름을 바꿔 한 번에 교체합니다.
+#    같은 원본(같은 수정 시각)의 임시 파일이 남아 있으면 이어서 복사합니다.
+class CopyEngine:
+    def __init__(self, log_debug, chunk_size=8 * 1024 * 1024, verify_hash=False,
+                 stable_interval=0.5, stable_checks=2, stable_timeout=60):
+        # log_debug: 디버그 메시지를 기록하기 위한 함수
+        # chunk_size: 한 번에 읽고 쓰는 크기(바이트)
+        # verify_hash: 크기와 수정 시각이 같을 때 해시까지 비교할지 여부
+        # stable_interval, stable_checks, stable_timeout: 원본이 안정되었는지 확인하는 조건
+        self.log_debug = log_debug
+        self.chunk_size = int(chunk_size)
+        self.verify_hash = verify_hash
+        self.stable_interval = float(stable_interval)
+        self.stable_checks = int(stable_checks)
+        self.stable_timeout = float(stable_timeout)
+
+    # 원본을 대상 경로로 복사합니다. 'copied', 'skipped', 'unstable' 중 하나를 반환합니다.
+    def copy(self, src_path, dest_path):
+        src_stat = wait_until_stable(src_path, self.stable_interval, self.stable_checks, self.stable_timeout)
+        if src_stat is None:
+            self.log_debug(f"CopyEngine: Source is missing or still being written: {src_path}")
+            return 'unstable'
+
+        if self._is_up_to_date(src_path, src_stat, dest_path):
+            self.log_debug(f"CopyEngine: Destination already up to date: {dest_path}")
+            return 'skipped'
+
+        dest_dir, dest_name = os.path.split(dest_path)
+        partial_path = os.path.join(dest_dir, f".{dest_name}.{src_stat.st_mtime_ns}{PARTIAL_SUFFIX}")
+        offset = 0
+        try:
+            offset = os.path.getsize(partial_path)
+            if offset > src_stat.st_size:
+                offset = 0  # 원본보다 큰 임시 파일은 잘못된 것이므로 처음부터 다시 복사합니다.
+        except OSError:
+            pass
+
+        with open(src_path, 'rb') as src_file, open(partial_path, 'ab' if offset else 'wb') as dest_file:
+            if offset:
+                self.log_debug(f"CopyEngine: Resuming copy of {src_path} at {offset} bytes")
+                src_file.seek(offset)
+            shutil.copyfileobj(src_file, dest_file, self.chunk_size)
+
+        # 복사하는 동안 원본이 바뀌었다면 임시 파일을 버리고 다음 이벤트에서 다시 복사합니다.
+        current = os.stat(src_path)
+        if (current.st_size, current.st_mtime_ns) != (src_stat.st_size, src_stat.st_mtime_ns):
+            os.remove(partial_path)
+            self.log_debug(f"CopyEngine: Source changed during copy: {src_path}")
+            return 'unstable'
+
+        shutil.copystat(src_path, partial_path)
+        os.replace(partial_path, dest_path)  # 같은 폴더 안의 이름 변경이므로 대상 파일이 한 번에 교체됩니다.
+        return 'copied'
+
+    # 중단된 복사로 남은 임시 파일 중 max_age초 이상 수정되지 않은 것을 삭제하고, 삭제한 개수를 반환합니다.
+    # 임시 파일은 대상 파일과 같은 폴더에 만들어지므로 각 폴더의 하위 폴더는 확인하지 않습니다.
+    def cleanup_partials(self, folders, max_age):
+        cutoff = time.time() - float(max_age)
+        removed = 0
+        for folder in folders:
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        try:
+                            if is_partial_copy(entry.name) and entry.is_file() and entry.stat().st_mtime < cutoff:
+                                os.remove(entry.path)
+                                removed += 1
+                        except OSError as e:
+                            self.log_debug(f"CopyEngine: Cannot remove stale partial file {entry.path}: {str(e)}")
+            except OSError:
+                continue  # 아직 만들어지지 않은 폴더에는 임시 파일도 없습니다.
+        if removed:
+            self.log_debug(f"CopyEngine: Removed {removed} stale partial files")
+        return removed
+
+    # 대상 파일이 원본과 같은지 크기와 수정 시각(선택적으로 해시)으로 확인합니다.
+    def _is_up_to_date(self, src_path, src_stat, dest_path):
+        try:
+            dest_stat = os.stat(dest_path)
+        except OSError:
+            return False
+        if dest_stat.st_size != src_stat.st_size or dest_stat.st_mtime_ns != src_stat.st_mtime_ns:
+            return False
+        if self.verify_hash:
+            return file_digest(src_path, self.chunk_size) == file_digest(dest_path, self.chunk_size)
+        return True
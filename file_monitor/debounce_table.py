@@ -0,0 +1,55 @@
+import threading
+import time
+from collections import OrderedDict
+
+# DebounceTable 클래스는 이벤트 키별 마지막 처리 시각을 저장하여 중복 이벤트를 걸러냅니다.
+# 항목은 기록된 순서대로 유지되므로, 오래된 항목(ttl 초과)과 최대 크기를 넘는 항목을 앞에서부터 O(1)로 제거합니다.
+# 여러 핸들러가 동시에 사용하므로 모든 접근은 잠금으로 보호합니다.
+class DebounceTable:
+    def __init__(self, ttl=60, max_size=50000):
+        # ttl: 항목을 보관하는 최대 시간(초). 핸들러의 디바운스 시간보다 길어야 합니다.
+        # max_size: 보관할 최대 항목 수
+        self.ttl = float(ttl)
+        self.max_size = int(max_size)
+        self.entries = OrderedDict()  # 키 -> 마지막 기록 시각(time.monotonic)
+        self.lock = threading.Lock()
+
+    # 키가 window초 안에 기록된 적이 없으면 현재 시각을 기록하고 True를 반환합니다.
+    # window초 안에 이미 기록되었다면 중복 이벤트로 보고 False를 반환합니다.
+    def should_process(self, key, window):
+        now = time.monotonic()
+        with self.lock:
+            last_time = self.entries.get(key)
+            if last_time is not None and now - last_time <= window:
+                return False
+            self._record(key, now)
+            return True
+
+    # 키의 현재 시각을 기록합니다. (예: 파일 생성 시각)
+    def mark(self, key):
+        now = time.monotonic()
+        with self.lock:
+            self._record(key, now)
+
+    # 키가 window초 안에 기록되었는지 확인합니다.
+    def seen_within(self, key, window):
+        now = time.monotonic()
+        with self.lock:
+            last_time = self.entries.get(key)
+            return last_time is not None and now - last_time < window
+
+    # 현재 보관 중인 항목 수를 반환합니다.
+    def __len__(self):
+        with self.lock:
+            return len(self.entries)
+
+    # 항목을 맨 뒤(가장 최근)로 옮겨 기록하고, 만료되었거나 최대 크기를 넘는 항목을 제거합니다.
+    def _record(self, key, now):
+        self.entries[key] = now
+        self.entries.move_to_end(key)
+        while self.entries:
+            oldest_key, oldest_time = next(iter(self.entries.items()))
+            if now - oldest_time > self.ttl or len(self.entries) > self.max_size:
+                del self.entries[oldest_key]
+            else:
+                break
@@ -0,0 +1,134 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# DelayedJobScheduler 클래스는 지정한 시간이 지난 뒤 작업을 별도의 실행기(executor)에서 실행합니다.
+# 마감 시각은 힙(heap)으로 관리하며, 같은 키로 다시 등록하면 새 작업을 만들지 않고 기존 작업의 마감 시각을 연장합니다.
+# 처음 등록할 때 max_delay를 지정하면 아무리 연장해도 그 시각을 넘기지 않으며, 대기 중인 작업을 앞당겨 바로 실행할 수도 있습니다.
+class DelayedJobScheduler:
+    def __init__(self, worker_count, log_debug):
+        # worker_count: 마감된 작업을 실행할 스레드 수
+        # log_debug: 디버그 메시지를 기록하기 위한 함수
+        self.worker_count = max(1, int(worker_count))
+        self.log_debug = log_debug
+        self.heap = []  # (마감 시각, 순번, 키) 항목을 담는 힙
+        self.jobs = {}  # 키 -> [마감 시각, 순번, 함수, 인자, 완료 콜백 목록, 최대 마감 시각(없으면 None)]
+        self.counter = itertools.count()  # 힙 항목의 순서를 구분하기 위한 순번
+        self.condition = threading.Condition()
+        self.executor = None
+        self.thread = None
+        self.stopped = False
+
+    # 타이머 스레드와 실행기를 시작합니다.
+    def start(self):
+        self.stopped = False
+        self.executor = ThreadPoolExecutor(max_workers=self.worker_count, thread_name_prefix="DelayedJob")
+        self.thread = threading.Thread(target=self._timer_loop, name="DelayedJobScheduler")
+        self.thread.daemon = True
+        self.thread.start()
+
+    # delay초 뒤에 func(*args)를 실행하도록 등록합니다.
+    # 같은 키의 작업이 이미 대기 중이면 마감 시각을 연장하고 가장 최근의 함수와 인자로 교체합니다.
+    # on_done은 작업이 끝난 뒤 성공 여부(True/False)와 함께 호출되며, 합쳐진 작업의 콜백은 모두 호출됩니다.
+    # max_delay는 처음 등록한 시각부터 작업을 미룰 수 있는 최대 시간(초)입니다. 이미 대기 중인 작업이면 처음의 값을 유지합니다.
+    def schedule(self, key, delay, func, *args, on_done=None, max_delay=None):
+        now = time.monotonic()
+        with self.condition:
+            callbacks = []
+            limit = now + float(max_delay) if max_delay is not None else None
+            if key in self.jobs:
+                self.log_debug(f"DelayedJobScheduler: Extending pending job {key} by {delay} seconds")
+                callbacks = self.jobs[key][4]
+                limit = self.jobs[key][5]
+            if on_done:
+                callbacks.append(on_done)
+            self.jobs[key] = [None, None, func, args, callbacks, limit]
+            self._set_deadline(key, now + float(delay))
+
+    # 대기 중인 작업의 마감 시각을 지금부터 delay초 뒤로 다시 정합니다. 기존 마감 시각보다 앞당겨질 수도 있으며 최대 마감 시각은 넘기지 않습니다.
+    # 대기 중인 작업이 없으면 False를 반환합니다.
+    def reschedule(self, key, delay):
+        with self.condition:
+            if key not in self.jobs:
+                return False
+            self._set_deadline(key, time.monotonic() + float(delay))
+            return True
+
+    # 대기 중인 작업을 바로 실행하도록 마감 시각을 지금으로 앞당깁니다. 대기 중인 작업이 없으면 False를 반환합니다.
+    def run_now(self, key):
+        with self.condition:
+            if key not in self.jobs:
+                return False
+            self._set_deadline(key, time.monotonic())
+            return True
+
+    # 해당 키의 작업이 대기 중인지 확인합니다.
+    def is_pending(self, key):
+        with self.condition:
+            return key in self.jobs
+
+    # 타이머 스레드를 멈추고 실행 중인 작업이 끝날 때까지 기다립니다.
+    # 대기 중인 작업은 취소되며 완료 콜백도 호출되지 않으므로, 저널에 남아 다음 시작 시 다시 등록됩니다.
+    def shutdown(self):
+        with self.condition:
+            self.stopped = True
+            cancelled = list(self.jobs)
+            self.jobs.clear()
+            self.heap = []
+            self.condition.notify()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+        if self.executor:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        for key in cancelled:
+            self.log_debug(f"DelayedJobScheduler: Cancelled pending job {key}")
+
+    # 작업의 마감 시각을 바꾸고 힙에 새 항목을 넣습니다. 잠금을 잡은 상태에서 호출됩니다.
+    def _set_deadline(self, key, deadline):
+        job = self.jobs[key]
+        if job[5] is not None:
+            deadline = min(deadline, job[5])
+        job[0] = deadline
+        job[1] = next(self.counter)
+        heapq.heappush(self.heap, (deadline, job[1], key))
+        self.condition.notify()
+
+    # 가장 빠른 마감 시각까지 기다렸다가, 마감된 작업을 실행기에 넘깁니다.
+    def _timer_loop(self):
+        while True:
+            with self.condition:
+                while not self.stopped:
+                    if not self.heap:
+                        self.condition.wait()
+                        continue
+                    deadline, seq, key = self.heap[0]
+                    job = self.jobs.get(key)
+                    if job is None or job[1] != seq:
+                        heapq.heappop(self.heap)  # 연장되었거나 취소된 작업의 오래된 항목은 버립니다.
+                        continue
+                    remaining = deadline - time.monotonic()
+                    if remaining > 0:
+                        self.condition.wait(remaining)
+                        continue
+                    heapq.heappop(self.heap)
+                    del self.jobs[key]
+                    break
+                if self.stopped:
+                    return
+            _, _, func, args, callbacks, _ = job
+            self.executor.submit(self._run_job, key, func, args, callbacks)
+
+    # 작업을 실행하고, 오류가 발생하면 디버그 로그에 기록합니다. 끝나면 성공 여부와 함께 완료 콜백을 호출합니다.
+    def _run_job(self, key, func, args, callbacks):
+        ok = True
+        try:
+            func(*args)
+        except Exception as e:
+            ok = False
+            self.log_debug(f"DelayedJobScheduler: Job {key} failed: {str(e)}")
+        for callback in callbacks:
+            callback(ok)
@@ -0,0 +1,201 @@
+import json
+import queue
+import sqlite3
+import threading
+import time
+from utils import normalize_path
+
+# EventJournal 클래스는 이벤트 큐에 들어간 이벤트를 SQLite(WAL 모드) 파일에 기록해 둡니다.
+# 처리가 끝난 이벤트는 확인(ack)되어 삭제되며, 비정상 종료 등으로 남은 이벤트는 다음 시작 시 다시 처리됩니다.
+# 처리에 실패한 이벤트는 삭제하지 않고 실패 횟수(attempts)만 늘려 두며, max_attempts번 이상 실패한 이벤트는
+# purge_failed로 journal_failed 테이블에 옮겨 다시 처리하지 않습니다.
+# 항목 ID를 메모리에서 발급하므로, 저널 파일은 한 인스턴스만 열 수 있도록 배타적으로 잠급니다.
+# (다른 인스턴스가 이미 열고 있으면 sqlite3.OperationalError가 발생합니다.)
+# 기록과 삭제는 메모리에 모았다가 백그라운드 스레드가 flush_interval초마다 하나의 트랜잭션으로 반영하므로,
+# 이벤트를 넣는 쪽은 디스크 I/O를 기다리지 않습니다. (비정상 종료 시 최대 flush_interval초 분량만 유실될 수 있습니다.)
+class EventJournal:
+    def __init__(self, db_path, flush_interval=0.05, timeout=5.0):
+        # db_path: 저널 데이터베이스 파일 경로
+        # flush_interval: 모아 둔 기록을 데이터베이스에 반영하는 간격(초)
+        # timeout: 다른 인스턴스가 저널 파일을 닫기를 기다리는 최대 시간(초)
+        self.db_path = normalize_path(db_path)
+        self.flush_interval = float(flush_interval)
+        self.lock = threading.Lock()  # 메모리에 모아 둔 기록을 보호합니다.
+        self.db_lock = threading.Lock()  # 데이터베이스 연결을 보호합니다.
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, timeout=timeout)
+        try:
+            self._open()
+        except sqlite3.Error:
+            self.connection.close()
+            raise
+        self.pending_inserts = []
+        self.pending_deletes = []
+        self.pending_failures = []
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._flush_loop, name="EventJournal")
+        self.thread.daemon = True
+        self.thread.start()
+
+    # 저널 파일을 배타적으로 잠그고 테이블을 준비한 뒤 다음 항목 ID를 정합니다.
+    def _open(self):
+        # 잠금을 놓지 않는 EXCLUSIVE 모드에서 쓰기 트랜잭션을 한 번 열어, 닫을 때까지 다른 연결이 파일을 읽거나 쓰지 못하게 합니다.
+        self.connection.execute("PRAGMA locking_mode=EXCLUSIVE")
+        # WAL 모드에서 synchronous=NORMAL이면 커밋마다 fsync를 하지 않아 기록이 빠르고, 프로세스가 죽어도 커밋된 데이터는 남습니다.
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("BEGIN EXCLUSIVE")
+        self.connection.execute("COMMIT")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS journal ("
+            "id INTEGER PRIMARY KEY, "
+            "event TEXT NOT NULL, "
+            "created REAL NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0)"
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS journal_failed ("
+            "id INTEGER PRIMARY KEY, "
+            "event TEXT NOT NULL, "
+            "created REAL NOT NULL, "
+            "attempts INTEGER NOT NULL)"
+        )
+        # 실패 횟수 열이 없던 이전 저널 파일에는 열을 추가합니다.
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(journal)")]
+        if 'attempts' not in columns:
+            self.connection.execute("ALTER TABLE journal ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+        # 항목 ID는 직접 발급하므로, 데이터베이스에 반영되기 전에도 ID를 바로 돌려줄 수 있습니다.
+        # journal_failed로 옮긴 항목의 ID도 다시 쓰지 않습니다.
+        max_id = self.connection.execute(
+            "SELECT MAX(id) FROM (SELECT id FROM journal UNION ALL SELECT id FROM journal_failed)"
+        ).fetchone()[0]
+        self.next_id = (max_id or 0) + 1
+
+    # 이벤트를 기록하고 항목 ID를 반환합니다.
+    def append(self, event):
+        record = json.dumps(list(event), ensure_ascii=False)
+        with self.lock:
+            entry_id = self.next_id
+            self.next_id += 1
+            self.pending_inserts.append((entry_id, record, time.time()))
+        return entry_id
+
+    # 처리가 끝난 이벤트를 저널에서 삭제합니다.
+    def ack(self, entry_id):
+        if entry_id is None:
+            return
+        with self.lock:
+            self.pending_deletes.append((entry_id,))
+
+    # 처리에 실패한 이벤트의 실패 횟수를 늘립니다. 이벤트는 저널에 남아 다음 시작 시 다시 처리됩니다.
+    def fail(self, entry_id):
+        if entry_id is None:
+            return
+        with self.lock:
+            self.pending_failures.append((entry_id,))
+
+    # 아직 확인되지 않은 이벤트를 기록된 순서대로 (항목 ID, 이벤트) 목록으로 반환합니다.
+    # max_attempts를 지정하면 그 횟수 이상 실패한 이벤트는 제외합니다.
+    def pending(self, max_attempts=None):
+        self.flush()
+        with self.db_lock:
+            if max_attempts is None:
+                rows = self.connection.execute("SELECT id, event FROM journal ORDER BY id").fetchall()
+            else:
+                rows = self.connection.execute(
+                    "SELECT id, event FROM journal WHERE attempts < ? ORDER BY id", (int(max_attempts),)
+                ).fetchall()
+        return [(entry_id, tuple(json.loads(event))) for entry_id, event in rows]
+
+    # max_attempts번 이상 실패한 이벤트를 journal_failed 테이블로 옮기고, 옮긴 개수를 반환합니다.
+    # 옮긴 이벤트는 다시 처리하지 않으며, 원인을 확인할 수 있도록 이벤트 내용과 실패 횟수를 남겨 둡니다.
+    def purge_failed(self, max_attempts):
+        self.flush()
+        with self.db_lock:
+            self.connection.execute("BEGIN")
+            try:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO journal_failed (id, event, created, attempts) "
+                    "SELECT id, event, created, attempts FROM journal WHERE attempts >= ?", (int(max_attempts),)
+                )
+                count = self.connection.execute(
+                    "DELETE FROM journal WHERE attempts >= ?", (int(max_attempts),)
+                ).rowcount
+                self.connection.execute("COMMIT")
+            except sqlite3.Error:
+                self.connection.execute("ROLLBACK")
+                raise
+        return count
+
+    # 메모리에 모아 둔 기록과 삭제를 하나의 트랜잭션으로 데이터베이스에 반영합니다.
+    def flush(self):
+        with self.lock:
+            inserts, self.pending_inserts = self.pending_inserts, []
+            deletes, self.pending_deletes = self.pending_deletes, []
+            failures, self.pending_failures = self.pending_failures, []
+        if not inserts and not deletes and not failures:
+            return
+        with self.db_lock:
+            self.connection.execute("BEGIN")
+            try:
+                # 같은 주기 안에 기록과 확인이 모두 끝난 이벤트도 있으므로 기록을 먼저 반영합니다.
+                self.connection.executemany("INSERT INTO journal (id, event, created) VALUES (?, ?, ?)", inserts)
+                self.connection.executemany("DELETE FROM journal WHERE id = ?", deletes)
+                self.connection.executemany("UPDATE journal SET attempts = attempts + 1 WHERE id = ?", failures)
+                self.connection.execute("COMMIT")
+            except sqlite3.Error:
+                self.connection.execute("ROLLBACK")
+                # 반영하지 못한 기록은 다음 주기에 다시 시도합니다.
+                with self.lock:
+                    self.pending_inserts[:0] = inserts
+                    self.pending_deletes[:0] = deletes
+                    self.pending_failures[:0] = failures
+                raise
+
+    # flush_interval초마다 모아 둔 기록을 반영합니다.
+    def _flush_loop(self):
+        while not self.stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except sqlite3.Error:
+                pass  # 다음 주기에 다시 시도합니다.
+
+    # 남은 기록을 모두 반영하고 데이터베이스 연결을 닫습니다.
+    def close(self):
+        self.stop_event.set()
+        self.thread.join()
+        self.flush()
+        with self.db_lock:
+            self.connection.close()
+
+# JournaledQueue 클래스는 이벤트를 넣을 때 저널에 먼저 기록하는 큐입니다.
+# 핸들러는 기존과 같이 put(event)를 호출하고, 큐에서 꺼낸 항목은 (항목 ID, 이벤트) 형태가 됩니다.
+# 저널이 없으면(None) 항목 ID는 None이 됩니다.
+class JournaledQueue(queue.Queue):
+    def __init__(self, journal=None):
+        super().__init__()
+        self.journal = journal
+
+    # 이벤트를 저널에 기록한 뒤 큐에 넣습니다.
+    def put(self, event, block=True, timeout=None):
+        entry_id = self.journal.append(event) if self.journal else None
+        super().put((entry_id, event), block, timeout)
+
+    # 이전 실행에서 처리되지 못한 이벤트를 다시 큐에 넣고, 넣은 개수를 반환합니다.
+    # max_attempts번 이상 실패한 이벤트는 다시 넣지 않습니다.
+    def replay(self, max_attempts=None):
+        if not self.journal:
+            return 0
+        entries = self.journal.pending(max_attempts)
+        for entry in entries:
+            super().put(entry)
+        return len(entries)
+
+    # 처리가 끝난 이벤트를 저널에서 삭제합니다.
+    def ack(self, entry_id):
+        if self.journal:
+            self.journal.ack(entry_id)
+
+    # 처리에 실패한 이벤트를 저널에 남겨 두고 실패 횟수를 늘립니다.
+    def fail(self, entry_id):
+        if self.journal:
+            self.journal.fail(entry_id)
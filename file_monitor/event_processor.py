@@ -1,13 +1,11 @@
+import codecs
 import os
 import re
-import shutil
-import time
 import queue
 from datetime import datetime
-from PIL import Image
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
 from utils import normalize_path
+from process_pool import run_cpu_job
+from file_monitor.pdf_writer import write_images_pdf, prepare_image, load_pdf_profile
 
 # 파일 이름에서 특정 정보를 추출하는 함수입니다.
 # 예를 들어 '20230825_123456_A12345_B67890_' 같은 이름에서 날짜, 비교 문자열, 추출 문자열을 추출합니다.
@@ -22,25 +20,6 @@ def extract_file_info(filename):
     # 매칭이 되지 않으면 None을 반환합니다.
     return None, None, None
 
-# 지정된 폴더 내에서 파일 이름의 특정 텍스트를 바꾸는 함수입니다.
-# 예를 들어, 파일 이름에 포함된 "#1"을 다른 문자열로 바꿉니다.
-def replace_text_in_files(wf_file_info, target_folder, log_debug, log_event):
-    # 파일에서 추출한 정보를 사용하여 파일을 찾고 이름을 변경합니다.
-    wf_datetime, wf_compare, wf_extract = wf_file_info
-    log_debug(f"event_processor: Attempting to replace text in files in {target_folder} matching {wf_file_info}")
-    for root, _, files in os.walk(target_folder):
-        for filename in files:
-            # 파일 이름에 특정 문자열이 포함되어 있는지 확인합니다.
-            if wf_datetime in filename and wf_compare in filename:
-                old_path = os.path.join(root, filename)
-                new_filename = filename.replace("#1", wf_extract)
-                new_path = os.path.join(root, new_filename)
-                if "#1" in filename:
-                    log_debug(f"event_processor: Renaming {old_path} to {new_path}")
-                    # 파일 이름을 새 이름으로 변경합니다.
-                    os.rename(old_path, new_path)
-                    log_event("File Renamed", f"{old_path} -> {new_filename}")
-
 # 여러 파일 경로에서 공통된 이름 부분을 추출하는 함수입니다.
 # 예를 들어, 'file_01.txt', 'file_02.txt'에서 'file_'을 추출합니다.
 def extract_common_name(file_paths):
@@ -63,31 +42,54 @@ def extract_common_name(file_paths):
     
     return common_name
 
-# 파일 내용을 읽고 특정 날짜와 시간 정보를 추출하여 새로운 파일을 생성하는 함수입니다.
+# 'Date and Time' 헤더를 찾을 때 읽는 최대 크기(바이트)입니다. 헤더는 파일 앞부분에만 있으므로 측정 데이터는 읽지 않습니다.
+HEADER_SCAN_BYTES = 64 * 1024
+HEADER_CHUNK_SIZE = 8 * 1024
+
+# 'Date and Time' 헤더를 찾는 패턴입니다. cp949, utf-8, latin1은 모두 ASCII와 호환되므로 바이트 그대로 검색합니다.
+DATETIME_HEADER_PATTERN = r"Date and Time:\s+(\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}\s+[APM]{2})"
+DATETIME_HEADER_BYTES = re.compile(DATETIME_HEADER_PATTERN.encode('ascii'))
+DATETIME_HEADER_TEXT = re.compile(DATETIME_HEADER_PATTERN)
+
+# 파일 앞부분만 조금씩 읽어 'Date and Time' 값을 찾는 함수입니다.
+# UTF-16 BOM이 있으면 UTF-16으로 디코딩하고, 그 외에는 바이트에서 바로 검색합니다.
+# 값을 찾거나 측정 표('Point#')가 시작되거나 max_bytes를 넘으면 읽기를 멈춥니다. 찾지 못하면 None을 반환합니다.
+def read_header_datetime(file_path, max_bytes=HEADER_SCAN_BYTES):
+    with open(file_path, 'rb') as file:
+        head = file.read(HEADER_CHUNK_SIZE)
+        decoder = None
+        if head.startswith(codecs.BOM_UTF16_LE) or head.startswith(codecs.BOM_UTF16_BE):
+            decoder = codecs.getincrementaldecoder('utf-16')(errors='replace')
+        buffer = decoder.decode(head) if decoder else head
+        pattern, table_marker = (DATETIME_HEADER_TEXT, 'Point#') if decoder else (DATETIME_HEADER_BYTES, b'Point#')
+        read_bytes = len(head)
+        while True:
+            # 측정 표가 시작된 뒤의 내용은 헤더가 아니므로 검색하지 않습니다.
+            table_start = buffer.find(table_marker)
+            match = pattern.search(buffer, 0, table_start if table_start >= 0 else len(buffer))
+            if match:
+                value = match.group(1)
+                return value if decoder else value.decode('ascii')
+            if table_start >= 0 or read_bytes >= max_bytes:
+                return None
+            chunk = file.read(min(HEADER_CHUNK_SIZE, max_bytes - read_bytes))
+            if not chunk:
+                return None
+            read_bytes += len(chunk)
+            # 청크 경계에 걸친 값도 찾을 수 있도록 지금까지 읽은 내용 전체에서 다시 검색합니다.
+            buffer += decoder.decode(chunk) if decoder else chunk
+
+# 파일 헤더에서 날짜와 시간 정보를 추출하여 새로운 파일을 생성하는 함수입니다.
 def create_file_based_on_datetime(file_path, log_debug, log_event, save_to_folder):
-    # 여러 인코딩 방식을 시도하여 파일을 읽습니다.
-    encodings = ['cp949', 'utf-8', 'latin1']     # 시도할 인코딩 목록
-    content = None
-    
-    for encoding in encodings:
-        try:
-            log_debug(f"event_processor: Trying to read file with {encoding} encoding: {file_path}")
-            with open(file_path, 'r', encoding=encoding) as file:
-                content = file.read()
-                log_debug(f"event_processor: File content read successfully with {encoding} encoding.")
-                break   # 성공하면 반복을 중단
-        except Exception as e:
-            log_debug(f"event_processor: Error reading file with {encoding} encoding: {str(e)}")
-    
-    if content is None:
-        log_debug(f"event_processor: Failed to read file with all attempted encodings: {file_path}")
+    try:
+        datetime_value = read_header_datetime(file_path)
+    except OSError as e:
+        log_debug(f"event_processor: Failed to read file header: {file_path}: {str(e)}")
         return False
-    
-    # 파일 내용에서 'Date and Time' 정보를 추출합니다.
-    match = re.search(r"Date and Time:\s+(\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}\s+[APM]{2})", content)
-    if match:
-        log_debug(f"event_processor: Match found: {match.group(1)}")
-        datetime_str = datetime.strptime(match.group(1), '%m/%d/%Y %I:%M:%S %p').strftime('%Y%m%d_%H%M%S')
+
+    if datetime_value:
+        log_debug(f"event_processor: Match found: {datetime_value}")
+        datetime_str = datetime.strptime(datetime_value, '%m/%d/%Y %I:%M:%S %p').strftime('%Y%m%d_%H%M%S')
         _, file_name = os.path.split(file_path)
         
         # 파일을 저장할 디렉토리를 생성합니다.
@@ -110,121 +112,159 @@ def create_file_based_on_datetime(file_path, log_debug, log_event, save_to_folde
         log_debug(f"event_processor: No Date and Time found in {file_path}")
         return False
 
-# 이미지 파일들을 PDF로 변환하는 함수입니다.
-def images_to_pdf(image_paths, output_folder, base_name):
+# 이미지 파일들을 PDF로 변환하는 함수입니다. 이미지 한 장이 이미지 크기와 같은 한 페이지가 됩니다.
+# JPEG는 헤더에서 크기만 읽고 원본 데이터를 그대로 넣으며, 페이지는 준비되는 대로 파일에 순서대로 씁니다.
+# profile을 지정하면 이미지를 축소하거나 다시 압축할 수 있습니다. (기본값은 원본 그대로)
+# 변환은 GUI와 감시 스레드를 방해하지 않도록 프로세스 풀에서 실행하며, 이미지 경로만 전달하고 PDF 경로를 돌려받습니다.
+def images_to_pdf(image_paths, output_folder, base_name, profile=None):
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
 
     pdf_path = os.path.join(output_folder, f"{base_name}.pdf")
-    c = canvas.Canvas(pdf_path, pagesize=letter)
-
-    for image_path in image_paths:
-        img = Image.open(image_path)
-        img_width, img_height = img.size
-
-        # 페이지 크기를 이미지 크기로 설정합니다.
-        c.setPageSize((img_width, img_height))
+    run_cpu_job(write_images_pdf, image_paths, pdf_path, prepare=profile.prepare if profile else prepare_image)
+    return pdf_path
 
-        # 이미지를 PDF에 추가합니다.
-        c.drawImage(image_path, 0, 0, img_width, img_height)
-        c.showPage()
-
-    c.save()
-
-# 이미지 이벤트를 처리하고, 필요 시 이미지들을 PDF로 변환하는 함수입니다.
-def process_images(event_type, src_path, target_image_folder, wait_time, image_save_folder, log_debug):
+# 이미지 이벤트를 처리하고, 필요 시 이미지들을 PDF로 변환하는 작업을 예약하는 함수입니다.
+# 대기 시간 동안 스레드를 멈추지 않고 작업을 등록하므로, 복사 작업은 계속 진행됩니다.
+# 웨이퍼(날짜, 패턴)의 이미지가 더 들어오지 않거나 예상 수만큼 모이면 바로 변환하며, wait_time은 최대 대기 시간입니다.
+# ack는 PDF 변환이 끝난 뒤 성공 여부와 함께 호출되며, 성공했을 때만 저널에서 이벤트를 확인 처리합니다.
+def process_images(event_type, src_path, image_index, wait_time, image_save_folder, log_debug, bundle_tracker, ack=None):
     log_debug(f"event_processor: Processing images for {event_type} event: {src_path}")
 
     filename = os.path.basename(src_path)
     datetime_str, specific_pattern = filename.split('_')[:2]
 
-    log_debug(f"event_processor: Waiting for {wait_time} seconds before processing images.")
-    time.sleep(wait_time)
+    log_debug(f"event_processor: Scheduling image processing within {wait_time} seconds.")
+    bundle_tracker.schedule(
+        (datetime_str, specific_pattern),
+        int(wait_time),
+        bundle_images,
+        datetime_str, specific_pattern, image_index, image_save_folder, log_debug,
+        on_done=ack
+    )
 
-    matching_images = []
-    for root, _, files in os.walk(target_image_folder):
-        for file in files:
-            if specific_pattern in file and datetime_str in file:
-                matching_images.append(os.path.join(root, file))
+# 대기 시간이 지난 뒤 조건에 맞는 이미지를 찾아 PDF로 변환하는 함수입니다.
+# 이미지 색인에서 바로 찾으므로 이미지 폴더를 검색하지 않으며, 이미지는 이름의 자연 정렬 순서로 페이지가 됩니다.
+def bundle_images(datetime_str, specific_pattern, image_index, image_save_folder, log_debug):
+    matching_images = image_index.find(datetime_str, specific_pattern)
 
     if matching_images:
         log_debug(f"event_processor: Found {len(matching_images)} matching images. Converting to PDF.")
         base_name = extract_common_name(matching_images)
-        images_to_pdf(matching_images, image_save_folder, base_name)
+        # Image Trans 탭에서 저장 폴더별로 고른 출력 프로필을 변환할 때마다 읽으므로, 바꾼 설정이 다음 PDF부터 적용됩니다.
+        images_to_pdf(matching_images, image_save_folder, base_name, load_pdf_profile(image_save_folder))
     else:
         log_debug("event_processor: No matching images found.")
 
-# 이벤트 큐에서 이벤트를 가져와 처리하는 메인 루프입니다.
-def event_processor(event_queue, log_event, log_debug, perf_monitor, dest_folder, regex_folders, base_date_folder, save_to_folder, target_compare_folders):
+# 이벤트 큐에서 이벤트를 가져와 워커 풀에 분배하는 메인 루프입니다.
+# stop_event가 설정되면 큐에 남은 이벤트를 모두 분배한 뒤 워커 풀을 정리하고 종료합니다.
+def event_processor(event_queue, stop_event, worker_pool, log_debug):
     while True:
         try:
             # 큐에서 이벤트를 가져옵니다. 이 이벤트는 파일 생성, 수정, 삭제 또는 이동과 같은 파일 시스템에서 발생한 이벤트를 나타냅니다.
-            event = event_queue.get(timeout=1)  # 큐에서 이벤트를 기다립니다.
+            # 큐 항목은 (저널 항목 ID, 이벤트) 형태입니다.
+            entry_id, event = event_queue.get(timeout=1)  # 큐에서 이벤트를 기다립니다.
             log_debug(f"event_processor: Received event: {event}")
         except queue.Empty:
+            if stop_event.is_set():
+                break  # 중지 요청이 있고 큐가 비어 있으면 루프를 종료합니다.
             continue  # 이벤트가 없으면 루프를 계속 돌면서 기다립니다.
+
+        # 같은 원본 경로의 이벤트는 같은 워커로 전달되어 순서가 유지됩니다.
+        worker_pool.submit(event, entry_id)
+
+    worker_pool.shutdown()  # 워커에 남은 이벤트를 모두 처리한 뒤 종료합니다.
+    log_debug("event_processor: Event queue drained")
+
+# 이벤트 하나를 처리하는 함수입니다. 워커 풀의 각 워커 스레드에서 호출됩니다.
+# 이미지 작업처럼 처리를 스케줄러에 넘긴 경우에는 False를 반환하며, 그 작업이 끝날 때 ack가 호출됩니다.
+# 복사에 실패하면 예외를 다시 발생시켜, 워커 풀이 이벤트를 확인하지 않고 저널에 남겨 두도록 합니다.
+def handle_event(event, ack, log_event, log_debug, perf_monitor, dest_folder, router, copy_engine, rename_index, image_index, base_date_folder, save_to_folder, target_compare_folders, bundle_tracker):
+    try:
+        event_type, src_path, *extra = event
+        target_image_folder = extra[0] if len(extra) > 0 else None
+        wait_time = extra[1] if len(extra) > 1 else None
+        image_save_folder = extra[2] if len(extra) > 2 else save_to_folder
+
+        log_debug(f"event_processor: Processing event of type '{event_type}' for file: {src_path}")
+
+        # 이벤트 유형에 따라 다른 작업을 수행합니다.
+        if event_type in ['created', 'modified', 'deleted', 'moved']:
+            # 이벤트가 발생하면 성능 로그를 기록합니다.
+            perf_monitor.log_performance()
+
+        if event_type in ['created', 'modified']:
+            # 파일이 생성되거나 수정되었을 때 처리하는 로직입니다.
+            rename_index.add(src_path)  # 이미지 폴더에 직접 생성된 "#1" 파일도 색인에 추가합니다.
+            bundle_tracker.image_added(image_index.add(src_path))
+            # 라우터가 파일 이름에 맞는 첫 번째 규칙의 폴더를 찾아줍니다.
+            subfolder = router.match(os.path.basename(src_path))
+            if subfolder:
+                # 파일을 지정된 경로로 복사합니다.
+                dest_path = normalize_path(os.path.join(dest_folder, subfolder, os.path.basename(src_path)))
+                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                if normalize_path(src_path) != normalize_path(dest_path):
+                    try:
+                        # 파일 쓰기가 끝난 뒤 복사하며, 이미 같은 파일이 있으면 복사를 건너뜁니다.
+                        result = copy_engine.copy(src_path, dest_path)
+                        if result == 'copied':
+                            log_event(event_type, src_path, dest_path)
+                            log_debug(f"File {event_type} detected. Copied to {dest_path}")
+                            rename_index.add(dest_path)  # 이미지 폴더로 복사된 "#1" 파일을 색인에 추가합니다.
+                            # 이미지 폴더로 복사된 파일을 이미지 색인에 추가하고, 대기 중인 웨이퍼 묶음에 알립니다.
+                            bundle_tracker.image_added(image_index.add(dest_path))
+                    except Exception as e:
+                        log_debug(f"event_processor: Error copying file {src_path} to {dest_path}: {str(e)}")
+                        raise
+                    if result == 'unstable':
+                        # 원본이 없거나 아직 쓰는 중이면 복사하지 못했으므로 실패로 처리합니다.
+                        raise OSError(f"Source is missing or still being written: {src_path}")
+                else:
+                    log_debug(f"event_processor: Source and destination paths are the same: {src_path}")
+            else:
+                log_event(event_type, src_path)
+                log_debug(f"event_processor: File {event_type} detected but no matching regex pattern found for copying.")
+
+        elif event_type == 'deleted':
+            # 파일이 삭제되었을 때 처리하는 로직입니다.
+            log_event("deleted", src_path)
+            rename_index.discard(src_path)
+            image_index.discard(src_path)
+            log_debug(f"event_processor: Processed 'deleted' event for file: {src_path}")
+        elif event_type == 'moved':
+            # 파일이 이동되었을 때 처리하는 로직입니다.
+            dest_path = extra[0] if extra else None
+            log_event("moved", src_path, dest_path)
+            rename_index.discard(src_path)
+            image_index.discard(src_path)
+            if dest_path:
+                rename_index.add(dest_path)
+                bundle_tracker.image_added(image_index.add(dest_path))
+            log_debug(f"event_processor: Processed 'moved' event from {src_path} to {dest_path}")
+
+        elif event_type in ['base_date_created', 'base_date_modified']:
+            # 기본 날짜 폴더가 생성되거나 수정되었을 때 처리하는 로직입니다.
+            log_debug(f"event_processor: Processing base date event: {event_type} for file: {src_path}")
+            success = create_file_based_on_datetime(src_path, log_debug, log_event, save_to_folder)
+            if success:
+                log_debug(f"event_processor: File created based on datetime extraction from {src_path}")
+            if target_image_folder and wait_time and image_save_folder:
+                process_images(event_type, src_path, image_index, wait_time, image_save_folder, log_debug, bundle_tracker, ack)
+                return False  # PDF 변환이 끝나면 스케줄러가 ack를 호출합니다.
         
-        try:
-            event_type, src_path, *extra = event
-            target_image_folder = extra[0] if len(extra) > 0 else None
-            wait_time = extra[1] if len(extra) > 1 else None
-            image_save_folder = extra[2] if len(extra) > 2 else save_to_folder
-            
-            log_debug(f"event_processor: Processing event of type '{event_type}' for file: {src_path}")
-
-            # 이벤트 유형에 따라 다른 작업을 수행합니다.
-            if event_type in ['created', 'modified', 'deleted', 'moved']:
-                # 이벤트가 발생하면 성능 로그를 기록합니다.
-                perf_monitor.log_performance()
-
-            if event_type in ['created', 'modified']:
-                # 파일이 생성되거나 수정되었을 때 처리하는 로직입니다.
-                matched = False
-                for pattern, subfolder in regex_folders.items():
-                    if re.search(pattern, os.path.basename(src_path)):
-                        # 파일을 지정된 경로로 복사합니다.
-                        dest_path = normalize_path(os.path.join(dest_folder, subfolder, os.path.basename(src_path)))
-                        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-                        if normalize_path(src_path) != normalize_path(dest_path):
-                            try:
-                                shutil.copy2(src_path, dest_path)
-                                log_event(event_type, src_path, dest_path)
-                                log_debug(f"File {event_type} detected. Copied to {dest_path}")
-                            except Exception as e:
-                                log_debug(f"event_processor: Error copying file {src_path} to {dest_path}: {str(e)}")
-                        else:
-                            log_debug(f"event_processor: Source and destination paths are the same: {src_path}")
-                        matched = True
-                        break
-                if not matched:
-                    log_event(event_type, src_path)
-                    log_debug(f"event_processor: File {event_type} detected but no matching regex pattern found for copying.")
-
-            elif event_type == 'deleted':
-                # 파일이 삭제되었을 때 처리하는 로직입니다.
-                log_event("deleted", src_path)
-                log_debug(f"event_processor: Processed 'deleted' event for file: {src_path}")
-            elif event_type == 'moved':
-                # 파일이 이동되었을 때 처리하는 로직입니다.
-                dest_path = extra[0] if extra else None
-                log_event("moved", src_path, dest_path)
-                log_debug(f"event_processor: Processed 'moved' event from {src_path} to {dest_path}")
-
-            elif event_type in ['base_date_created', 'base_date_modified']:
-                # 기본 날짜 폴더가 생성되거나 수정되었을 때 처리하는 로직입니다.
-                log_debug(f"event_processor: Processing base date event: {event_type} for file: {src_path}")
-                success = create_file_based_on_datetime(src_path, log_debug, log_event, save_to_folder)
-                if success:
-                    log_debug(f"event_processor: File created based on datetime extraction from {src_path}")
-                if target_image_folder and wait_time and image_save_folder:
-                    process_images(event_type, src_path, target_image_folder, wait_time, image_save_folder, log_debug)
-            
-            elif event_type in ['wf_info_created', 'wf_info_modified']:
-                # wf_info 파일이 생성되거나 수정되었을 때 처리하는 로직입니다.
-                log_debug(f"event_processor: Processing wf_info event: {event_type} for file: {src_path}")
-                if target_image_folder and wait_time and image_save_folder:
-                    process_images(event_type, src_path, target_image_folder, wait_time, image_save_folder, log_debug)
-
-        except Exception as e:
-            # 이벤트 처리 중 오류가 발생하면 로그에 기록합니다.
-            log_debug(f"event_processor: Error processing event {event}: {str(e)}")
+        elif event_type in ['wf_info_created', 'wf_info_modified']:
+            # wf_info 파일이 생성되거나 수정되었을 때 처리하는 로직입니다.
+            log_debug(f"event_processor: Processing wf_info event: {event_type} for file: {src_path}")
+            if event_type == 'wf_info_created':
+                # 파일 이름의 정보로 이미지 파일의 "#1"을 바꿉니다. 색인을 사용하므로 폴더 전체를 검색하지 않습니다.
+                wf_file_info = extract_file_info(os.path.basename(src_path))
+                if wf_file_info[0] and wf_file_info[1] and wf_file_info[2]:
+                    rename_index.rename(wf_file_info, log_event, on_renamed=image_index.move)
+            if target_image_folder and wait_time and image_save_folder:
+                process_images(event_type, src_path, image_index, wait_time, image_save_folder, log_debug, bundle_tracker, ack)
+                return False  # PDF 변환이 끝나면 스케줄러가 ack를 호출합니다.
+
+    except Exception as e:
+        # 이벤트 처리 중 오류가 발생하면 로그에 기록하고, 이벤트가 확인되지 않도록 예외를 다시 발생시킵니다.
+        log_debug(f"event_processor: Error processing event {event}: {str(e)}")
+        raise
@@ -0,0 +1,75 @@
+import queue
+import threading
+from functools import partial
+
+# 워커 스레드에 종료를 알리기 위한 표식 객체입니다.
+_STOP = object()
+
+# EventWorkerPool 클래스는 여러 워커 스레드로 이벤트를 병렬 처리합니다.
+# 같은 원본 경로의 이벤트는 항상 같은 워커로 전달되므로, 경로별 처리 순서는 그대로 유지됩니다.
+class EventWorkerPool:
+    def __init__(self, worker_count, handle_event, log_debug, on_done=None, on_failed=None):
+        # worker_count: 생성할 워커 스레드 수
+        # handle_event: 이벤트 하나와 완료 콜백(ack)을 받아 처리하는 함수. 처리에 실패하면 예외를 발생시킵니다.
+        #               처리를 다른 작업에 넘기고 False를 반환하면 그 작업이 직접 ack(성공 여부)를 호출합니다.
+        # log_debug: 디버그 메시지를 기록하기 위한 함수
+        # on_done: 이벤트 처리가 성공했을 때 항목 ID와 함께 호출되는 함수 (예: 저널 확인)
+        # on_failed: 이벤트 처리가 실패했을 때 항목 ID와 함께 호출되는 함수 (예: 저널 실패 횟수 증가)
+        self.worker_count = max(1, int(worker_count))
+        self.handle_event = handle_event
+        self.log_debug = log_debug
+        self.on_done = on_done or (lambda entry_id: None)
+        self.on_failed = on_failed or (lambda entry_id: None)
+        self.worker_queues = [queue.Queue() for _ in range(self.worker_count)]  # 워커별 작업 큐
+        self.threads = []
+
+    # 워커 스레드들을 시작합니다.
+    def start(self):
+        for index, worker_queue in enumerate(self.worker_queues):
+            thread = threading.Thread(target=self._worker_loop, args=(index, worker_queue), name=f"EventWorker-{index}")
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+        self.log_debug(f"EventWorkerPool: Started {self.worker_count} worker threads")
+
+    # 이벤트를 원본 경로에 해당하는 워커의 큐에 넣습니다. entry_id는 완료 시 on_done에 전달됩니다.
+    def submit(self, event, entry_id=None):
+        self.worker_queues[self._worker_index(event)].put((entry_id, event))
+
+    # 이벤트의 원본 경로(두 번째 항목)를 기준으로 워커를 선택합니다.
+    def _worker_index(self, event):
+        key = event[1] if len(event) > 1 else event[0]
+        return hash(key) % self.worker_count
+
+    # 남아 있는 이벤트를 모두 처리한 뒤 워커 스레드를 종료합니다.
+    def shutdown(self):
+        for worker_queue in self.worker_queues:
+            worker_queue.put(_STOP)
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+        self.log_debug("EventWorkerPool: All worker threads stopped")
+
+    # 각 워커 스레드가 실행하는 루프입니다. 종료 표식을 받을 때까지 자신의 큐를 순서대로 처리합니다.
+    def _worker_loop(self, index, worker_queue):
+        while True:
+            item = worker_queue.get()
+            if item is _STOP:
+                break
+            entry_id, event = item
+            ack = partial(self._finish, entry_id)
+            try:
+                finished = self.handle_event(event, ack)
+            except Exception as e:
+                self.log_debug(f"EventWorkerPool: Worker {index} failed to process event {event}: {str(e)}")
+                ack(False)
+                continue
+            if finished is not False:
+                ack()
+
+    # 이벤트 처리 결과에 따라 on_done 또는 on_failed를 호출합니다.
+    def _finish(self, entry_id, ok=True):
+        if ok:
+            self.on_done(entry_id)
+        else:
+            self.on_failed(entry_id)
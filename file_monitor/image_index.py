@@ -0,0 +1,101 @@
+import os
+import re
+import threading
+from utils import normalize_path
+from file_monitor.rename_index import DATETIME_TOKEN
+
+# 파일 이름 전체가 날짜 문자열(예: 20230825_123456)인지 확인하는 패턴입니다.
+DATETIME_KEY = re.compile(r"\d{8}_\d{6}")
+
+# 파일 이름을 숫자 부분은 숫자로 비교하도록 나누는 함수입니다. (예: img_2 < img_10)
+def natural_key(path):
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', os.path.basename(path))]
+
+# ImageIndex 클래스는 이미지 폴더(target_image_folder)의 파일을 이름에 들어 있는 날짜 문자열별로 기억합니다.
+# PDF로 묶을 웨이퍼의 이미지를 찾을 때 폴더 전체를 검색하지 않고 날짜 문자열로 바로 찾습니다.
+# 색인은 파일 이벤트로 채워지며, 처음 조회할 때 폴더를 os.scandir로 한 번 검색해 기존 파일을 추가합니다.
+class ImageIndex:
+    def __init__(self, root, log_debug):
+        # root: 이미지 파일이 있는 폴더 (target_image_folder)
+        # log_debug: 디버그 메시지를 기록하기 위한 함수
+        self.root = normalize_path(root)
+        self.log_debug = log_debug
+        self.buckets = {}  # 날짜 문자열 -> 해당 날짜가 들어 있는 파일 경로 집합
+        self.others = set()  # 이름에 날짜 문자열이 없는 파일 경로
+        self.seeded = False
+        self.lock = threading.Lock()
+
+    # 경로가 이미지 폴더 안의 파일이면 색인에 추가합니다. 추가된 날짜 문자열 목록을 반환합니다.
+    def add(self, path):
+        path = normalize_path(path)
+        if not path.startswith(self.root + os.sep):
+            return []
+        with self.lock:
+            return self._add(path)
+
+    # 경로를 색인에서 제거합니다.
+    def discard(self, path):
+        path = normalize_path(path)
+        with self.lock:
+            self._discard(path)
+
+    # 이름이 바뀐 파일을 색인에 반영합니다.
+    def move(self, old_path, new_path):
+        self.discard(old_path)
+        self.add(new_path)
+
+    # 날짜(datetime_str)와 패턴(specific_pattern)이 모두 이름에 들어 있는 파일을 자연 정렬 순서로 반환합니다.
+    # 두 값이 합쳐서 날짜 문자열(YYYYMMDD_HHMMSS)이 되면 해당 날짜의 목록만 확인하고, 아니면 색인 전체에서 찾습니다.
+    def find(self, datetime_str, specific_pattern):
+        with self.lock:
+            if not self.seeded:
+                self._seed()
+            token = f"{datetime_str}_{specific_pattern}"
+            if DATETIME_KEY.fullmatch(token):
+                candidates = self.buckets.get(token, ())
+            else:
+                candidates = [path for bucket in self.buckets.values() for path in bucket] + list(self.others)
+            matches = [path for path in set(candidates)
+                       if datetime_str in os.path.basename(path) and specific_pattern in os.path.basename(path)]
+        return sorted(matches, key=natural_key)
+
+    def _add(self, path):
+        tokens = set(DATETIME_TOKEN.findall(os.path.basename(path)))
+        for token in tokens:
+            self.buckets.setdefault(token, set()).add(path)
+        if not tokens:
+            self.others.add(path)
+        return list(tokens)
+
+    def _discard(self, path):
+        self.others.discard(path)
+        for token in set(DATETIME_TOKEN.findall(os.path.basename(path))):
+            bucket = self.buckets.get(token)
+            if bucket is not None:
+                bucket.discard(path)
+                if not bucket:
+                    del self.buckets[token]
+
+    # 색인을 만들기 전부터 있던 파일을 os.scandir로 찾아 추가합니다. 잠금을 잡은 상태에서 한 번만 호출됩니다.
+    def _seed(self):
+        self.seeded = True
+        if not os.path.isdir(self.root):
+            return
+        count = 0
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.is_file():
+                                self._add(normalize_path(entry.path))
+                                count += 1
+                        except OSError:
+                            continue
+            except OSError as e:
+                self.log_debug(f"ImageIndex: Cannot scan {directory}: {str(e)}")
+        self.log_debug(f"ImageIndex: Indexed {count} files in {self.root}")
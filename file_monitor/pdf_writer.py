@@ -0,0 +1,217 @@
+import io
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from config import load_pdf_profile_settings
+
+# 이미지 크기를 읽을 수 있는 JPEG SOF(Start Of Frame) 마커입니다. (기본, 확장 허프만 부호화)
+# 프로그레시브 JPEG는 일부 PDF 뷰어와 인쇄 장치가 처리하지 못하므로 PIL로 디코딩해 넣습니다.
+SOF_MARKERS = (0xC0, 0xC1)
+# 길이 필드가 없는 JPEG 마커입니다. (SOI, TEM, RST0~RST7)
+STANDALONE_MARKERS = (0xD8, 0x01) + tuple(range(0xD0, 0xD8))
+# JPEG 색상 요소 수에 해당하는 PDF 색 공간입니다.
+COLOR_SPACES = {1: '/DeviceGray', 3: '/DeviceRGB', 4: '/DeviceCMYK'}
+
+# PdfImage 클래스는 PDF 페이지 하나에 넣을 이미지 데이터입니다.
+class PdfImage:
+    def __init__(self, width, height, color_space, data, filter_name, decode=None, page_size=None):
+        # width, height: 픽셀 크기
+        # color_space: PDF 색 공간 이름
+        # data: 압축된 이미지 데이터
+        # filter_name: '/DCTDecode'(JPEG) 또는 '/FlateDecode'
+        # decode: 색상 값을 뒤집어야 하는 경우의 Decode 배열 (Adobe CMYK JPEG)
+        # page_size: 페이지 크기. 축소한 이미지도 원본과 같은 페이지 크기를 유지하도록 원본 픽셀 크기를 지정합니다.
+        self.width = width
+        self.height = height
+        self.color_space = color_space
+        self.data = data
+        self.filter_name = filter_name
+        self.decode = decode
+        self.page_width, self.page_height = page_size or (width, height)
+
+# JPEG 헤더만 읽어 (너비, 높이, 색상 요소 수, Adobe 여부)를 반환하는 함수입니다.
+# 이미지 전체를 디코딩하지 않으며, PDF에 그대로 넣을 수 없는 JPEG(12비트, 프로그레시브, 산술 부호화 등)이거나 헤더가 잘렸으면 None을 반환합니다.
+def read_jpeg_header(data):
+    if data[:2] != b'\xff\xd8':
+        return None
+    adobe = False
+    index = 2
+    while index + 4 <= len(data):
+        if data[index] != 0xFF:
+            return None
+        marker = data[index + 1]
+        if marker == 0xFF:  # 채움 바이트
+            index += 1
+            continue
+        if marker in STANDALONE_MARKERS:
+            index += 2
+            continue
+        if marker in (0xD9, 0xDA):  # 크기 정보 전에 이미지 끝이나 스캔 데이터가 나오면 잘못된 파일입니다.
+            return None
+        length = int.from_bytes(data[index + 2:index + 4], 'big')
+        if marker == 0xEE and data[index + 4:index + 9] == b'Adobe':
+            adobe = True
+        if marker in SOF_MARKERS:
+            if index + 10 > len(data):  # 크기 정보가 잘린 파일입니다.
+                return None
+            precision = data[index + 4]
+            height = int.from_bytes(data[index + 5:index + 7], 'big')
+            width = int.from_bytes(data[index + 7:index + 9], 'big')
+            components = data[index + 9]
+            if precision != 8 or components not in COLOR_SPACES or not width or not height:
+                return None
+            return width, height, components, adobe
+        if 0xC2 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            return None  # 프로그레시브, 무손실, 산술 부호화 등 PDF 뷰어가 지원하지 않을 수 있는 JPEG입니다.
+        index += 2 + length
+    return None
+
+# 이미지 파일을 PDF에 넣을 형태로 준비하는 함수입니다.
+# JPEG는 다시 압축하지 않고 원본 바이트를 그대로 사용하며, 그 외 형식은 PIL로 디코딩해 Flate로 압축합니다.
+def prepare_image(image_path):
+    with open(image_path, 'rb') as file:
+        data = file.read()
+    header = read_jpeg_header(data)
+    if header:
+        width, height, components, adobe = header
+        # Adobe가 만든 CMYK JPEG는 색상 값이 반전되어 저장됩니다.
+        decode = '[1 0 1 0 1 0 1 0]' if components == 4 and adobe else None
+        return PdfImage(width, height, COLOR_SPACES[components], data, '/DCTDecode', decode)
+    return _prepare_with_pil(image_path)
+
+# JPEG가 아닌 이미지를 PIL로 디코딩해 Flate로 압축하는 함수입니다.
+def _prepare_with_pil(image_path):
+    from PIL import Image  # JPEG가 아닌 이미지를 처리할 때만 필요합니다.
+    with Image.open(image_path) as img:
+        if img.mode not in ('L', 'RGB'):
+            img = img.convert('RGB')
+        width, height = img.size
+        color_space = '/DeviceGray' if img.mode == 'L' else '/DeviceRGB'
+        data = zlib.compress(img.tobytes(), 6)
+    return PdfImage(width, height, color_space, data, '/FlateDecode')
+
+# PDF 출력 프로필 목록입니다.
+# passthrough: JPEG를 그대로 넣습니다. (가장 빠르고 화질 손실이 없습니다.)
+# downscale: 긴 변이 max_edge 픽셀보다 큰 이미지만 줄여서 quality로 다시 압축합니다.
+# recompress: 모든 이미지를 원래 크기로 quality로 다시 압축합니다.
+PROFILES = ('passthrough', 'downscale', 'recompress')
+
+# PdfProfile 클래스는 PDF에 넣기 전에 이미지를 어떻게 처리할지 정합니다. prepare는 스레드 풀에서 호출됩니다.
+class PdfProfile:
+    def __init__(self, name='passthrough', max_edge=1600, quality=75):
+        if name not in PROFILES:
+            raise ValueError(f"Unknown PDF profile: {name}")
+        self.name = name
+        self.max_edge = max(1, int(max_edge))
+        self.quality = min(95, max(1, int(quality)))
+
+    # 이미지 파일을 프로필에 맞게 PDF에 넣을 형태로 준비합니다.
+    def prepare(self, image_path):
+        if self.name == 'passthrough':
+            return prepare_image(image_path)
+        if self.name == 'downscale':
+            with open(image_path, 'rb') as file:
+                header = read_jpeg_header(file.read(64 * 1024))
+            if header and max(header[0], header[1]) <= self.max_edge:
+                return prepare_image(image_path)  # 이미 충분히 작은 JPEG는 그대로 넣습니다.
+        return self._reencode(image_path)
+
+    # PIL로 디코딩해 (필요하면 줄인 뒤) JPEG로 다시 압축합니다. 페이지 크기는 원본 크기를 유지합니다.
+    def _reencode(self, image_path):
+        from PIL import Image  # 다시 압축하는 프로필에서만 필요합니다.
+        with Image.open(image_path) as img:
+            page_size = img.size
+            target = None
+            if self.name == 'downscale' and max(page_size) > self.max_edge:
+                scale = self.max_edge / max(page_size)
+                target = (max(1, round(page_size[0] * scale)), max(1, round(page_size[1] * scale)))
+                img.draft('RGB', target)  # JPEG는 디코딩 단계에서 1/2, 1/4, 1/8로 줄여 읽어 훨씬 빠릅니다.
+            img = img.convert('L' if img.mode == 'L' else 'RGB')
+            if target:
+                img.thumbnail(target)
+            buffer = io.BytesIO()
+            img.save(buffer, 'JPEG', quality=self.quality, optimize=True)
+            color_space = '/DeviceGray' if img.mode == 'L' else '/DeviceRGB'
+            return PdfImage(img.size[0], img.size[1], color_space, buffer.getvalue(), '/DCTDecode', page_size=page_size)
+
+# PDF 저장 폴더(folder)의 프로필 설정으로 출력 프로필을 만드는 함수입니다. 폴더별 설정이 없으면 [PdfProfile] 섹션을 사용합니다.
+def load_pdf_profile(folder=None):
+    settings = load_pdf_profile_settings(folder)
+    return PdfProfile(settings['profile'], settings['max_edge'], settings['quality'])
+
+# PdfStreamWriter 클래스는 이미지 한 장을 한 페이지로 하는 PDF를 파일에 순서대로 씁니다.
+# 페이지를 쓰는 즉시 파일로 내보내므로 메모리에는 현재 페이지만 남고, 마지막에 페이지 목록과 상호 참조 표를 씁니다.
+class PdfStreamWriter:
+    def __init__(self, file):
+        self.file = file
+        self.offsets = {}  # 객체 번호 -> 파일 내 위치
+        self.page_ids = []
+        self.next_id = 3  # 1: 카탈로그, 2: 페이지 목록
+        self.file.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+    # 이미지 한 장을 한 페이지로 추가합니다. 페이지 크기는 원본 이미지의 픽셀 크기입니다.
+    def add_page(self, image):
+        image_id, content_id, page_id = self.next_id, self.next_id + 1, self.next_id + 2
+        self.next_id += 3
+
+        decode = f" /Decode {image.decode}" if image.decode else ""
+        self._write_stream(image_id, (
+            f"<< /Type /XObject /Subtype /Image /Width {image.width} /Height {image.height} "
+            f"/ColorSpace {image.color_space} /BitsPerComponent 8 /Filter {image.filter_name}{decode} "
+            f"/Length {len(image.data)} >>"
+        ), image.data)
+        content = f"q {image.page_width} 0 0 {image.page_height} 0 0 cm /Im0 Do Q".encode('ascii')
+        self._write_stream(content_id, f"<< /Length {len(content)} >>", content)
+        self._write_object(page_id, (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {image.page_width} {image.page_height}] "
+            f"/Resources << /XObject << /Im0 {image_id} 0 R >> >> /Contents {content_id} 0 R >>"
+        ))
+        self.page_ids.append(page_id)
+
+    # 카탈로그, 페이지 목록, 상호 참조 표를 쓰고 PDF를 마칩니다.
+    def close(self):
+        kids = ' '.join(f"{page_id} 0 R" for page_id in self.page_ids)
+        self._write_object(1, "<< /Type /Catalog /Pages 2 0 R >>")
+        self._write_object(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>")
+        xref_offset = self.file.tell()
+        lines = [f"xref\n0 {self.next_id}\n", "0000000000 65535 f \n"]
+        lines += [f"{self.offsets[object_id]:010d} 00000 n \n" for object_id in range(1, self.next_id)]
+        lines.append(f"trailer\n<< /Size {self.next_id} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n")
+        self.file.write(''.join(lines).encode('ascii'))
+
+    def _write_object(self, object_id, body):
+        self.offsets[object_id] = self.file.tell()
+        self.file.write(f"{object_id} 0 obj\n{body}\nendobj\n".encode('ascii'))
+
+    def _write_stream(self, object_id, dictionary, data):
+        self.offsets[object_id] = self.file.tell()
+        self.file.write(f"{object_id} 0 obj\n{dictionary}\nstream\n".encode('ascii'))
+        self.file.write(data)
+        self.file.write(b"\nendstream\nendobj\n")
+
+# 이미지 파일들을 순서대로 한 페이지씩 PDF로 쓰는 함수입니다.
+# 이미지는 스레드 풀에서 미리 준비하되, 한 번에 window장까지만 준비해 두어 메모리 사용량이 이미지 수와 관계없이 일정합니다.
+# 임시 파일에 쓴 뒤 이름을 바꾸므로, 쓰는 도중의 PDF가 보이지 않습니다.
+def write_images_pdf(image_paths, pdf_path, workers=4, window=8, prepare=prepare_image):
+    temp_path = f"{pdf_path}.tmp"
+    try:
+        with open(temp_path, 'wb') as file, ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="PdfImage") as executor:
+            writer = PdfStreamWriter(file)
+            pending = []
+            paths = iter(image_paths)
+            for image_path in paths:
+                pending.append(executor.submit(prepare, image_path))
+                if len(pending) >= window:
+                    break
+            while pending:
+                writer.add_page(pending.pop(0).result())
+                next_path = next(paths, None)
+                if next_path is not None:
+                    pending.append(executor.submit(prepare, next_path))
+            writer.close()
+        os.replace(temp_path, pdf_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return pdf_path
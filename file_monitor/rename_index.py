@@ -0,0 +1,105 @@
+import os
+import re
+import threading
+from utils import normalize_path
+
+# 파일 이름에 들어 있는 날짜 문자열(예: 20230825_123456)을 찾는 패턴입니다. 겹치는 위치도 모두 찾습니다.
+DATETIME_TOKEN = re.compile(r"(?=(\d{8}_\d{6}))")
+
+# RenameIndex 클래스는 이미지 폴더에서 아직 이름이 바뀌지 않은("#1"이 들어 있는) 파일을 날짜 문자열별로 기억합니다.
+# wf_info 파일이 생성되면 폴더 전체를 다시 검색하지 않고, 해당 날짜의 파일 중 비교 문자열이 들어 있는 파일만 이름을 바꿉니다.
+# 색인은 파일이 복사되거나 생성될 때마다 채워지며, 처음 조회할 때 폴더를 한 번 검색해 기존 파일을 추가합니다.
+class RenameIndex:
+    def __init__(self, root, log_debug, placeholder='#1'):
+        # root: 이름을 바꿀 이미지 파일이 있는 폴더 (target_image_folder)
+        # log_debug: 디버그 메시지를 기록하기 위한 함수
+        # placeholder: wf_info의 추출 문자열로 바꿀 자리 표시 문자열
+        self.root = normalize_path(root)
+        self.log_debug = log_debug
+        self.placeholder = placeholder
+        self.buckets = {}  # 날짜 문자열 -> 해당 날짜가 들어 있는 파일 경로 집합
+        self.seeded = False
+        self.lock = threading.Lock()
+
+    # 경로가 색인 대상(이미지 폴더 안의 "#1" 파일)이면 색인에 추가합니다.
+    def add(self, path):
+        path = normalize_path(path)
+        if not self._is_candidate(path):
+            return
+        with self.lock:
+            self._add(path)
+
+    # 경로를 색인에서 제거합니다.
+    def discard(self, path):
+        path = normalize_path(path)
+        with self.lock:
+            self._discard(path)
+
+    # wf_info 파일 정보(날짜, 비교 문자열, 추출 문자열)에 맞는 파일의 "#1"을 추출 문자열로 바꿉니다.
+    # 바꾼 파일 수를 반환합니다. on_renamed를 지정하면 이름을 바꾼 파일마다 (이전 경로, 새 경로)로 호출합니다.
+    def rename(self, wf_file_info, log_event, on_renamed=None):
+        wf_datetime, wf_compare, wf_extract = wf_file_info
+        with self.lock:
+            if not self.seeded:
+                self._seed()
+            matches = [path for path in self.buckets.get(wf_datetime, ()) if wf_compare in os.path.basename(path)]
+            for path in matches:
+                self._discard(path)
+
+        renamed = 0
+        for old_path in matches:
+            directory, filename = os.path.split(old_path)
+            new_filename = filename.replace(self.placeholder, wf_extract)
+            new_path = os.path.join(directory, new_filename)
+            try:
+                self.log_debug(f"RenameIndex: Renaming {old_path} to {new_path}")
+                os.rename(old_path, new_path)
+                log_event("File Renamed", f"{old_path} -> {new_filename}")
+                renamed += 1
+                if on_renamed:
+                    on_renamed(old_path, new_path)
+            except OSError as e:
+                # 이미 삭제되었거나 이름이 바뀐 파일은 색인에서만 제거됩니다.
+                self.log_debug(f"RenameIndex: Failed to rename {old_path}: {str(e)}")
+        self.log_debug(f"RenameIndex: Renamed {renamed} of {len(matches)} files matching {wf_file_info}")
+        return renamed
+
+    # 이미지 폴더 안에 있고 이름에 "#1"이 들어 있는 파일인지 확인합니다.
+    def _is_candidate(self, path):
+        return path.startswith(self.root + os.sep) and self.placeholder in os.path.basename(path)
+
+    def _add(self, path):
+        for token in set(DATETIME_TOKEN.findall(os.path.basename(path))):
+            self.buckets.setdefault(token, set()).add(path)
+
+    def _discard(self, path):
+        for token in set(DATETIME_TOKEN.findall(os.path.basename(path))):
+            bucket = self.buckets.get(token)
+            if bucket is not None:
+                bucket.discard(path)
+                if not bucket:
+                    del self.buckets[token]
+
+    # 색인을 만들기 전부터 있던 파일을 os.scandir로 찾아 추가합니다. 잠금을 잡은 상태에서 한 번만 호출됩니다.
+    def _seed(self):
+        self.seeded = True
+        if not os.path.isdir(self.root):
+            return
+        count = 0
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif self.placeholder in entry.name and entry.is_file():
+                                self._add(normalize_path(entry.path))
+                                count += 1
+                        except OSError:
+                            continue
+            except OSError as e:
+                self.log_debug(f"RenameIndex: Cannot scan {directory}: {str(e)}")
+        self.log_debug(f"RenameIndex: Indexed {count} pending files in {self.root}")
@@ -0,0 +1,67 @@
+import re
+import threading
+from utils import normalize_path
+
+# 번호로 그룹을 가리키는 패턴(역참조 \1, 조건식 (?(1)...))은 하나의 정규식으로 합치면 그룹 번호가 바뀌어
+# 다른 그룹을 가리키게 되므로, 이런 패턴과 (?P=name) 역참조가 있는 규칙은 합치지 않습니다.
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(\d")
+
+# Router 클래스는 [Regex] 규칙을 한 번만 컴파일해 두고, 파일 이름에 맞는 대상 폴더를 찾습니다.
+# 모든 규칙을 하나의 정규식(alternation)으로 합쳐 한 번의 검색으로 후보 규칙을 찾고,
+# 그보다 앞선 규칙만 개별적으로 확인하여 기존과 같은 "먼저 등록된 규칙 우선" 규칙을 유지합니다.
+class Router:
+    def __init__(self, regex_folders, log_debug=None):
+        # regex_folders: 정규 표현식 -> 폴더 경로 매핑
+        # log_debug: 디버그 메시지를 기록하기 위한 함수
+        self.log_debug = log_debug or (lambda message: None)
+        self.lock = threading.Lock()
+        self.reload(regex_folders)
+
+    # 규칙을 다시 컴파일합니다. 규칙이 변경되었을 때 호출하는 핫 리로드 훅입니다.
+    def reload(self, regex_folders):
+        rules = []
+        for pattern, folder in regex_folders.items():
+            try:
+                rules.append((pattern, re.compile(pattern), normalize_path(folder)))
+            except re.error as e:
+                self.log_debug(f"Router: Invalid regex pattern skipped: {pattern} ({str(e)})")
+
+        combined = None
+        if rules and not any(_BACKREFERENCE.search(pattern) for pattern, _, _ in rules):
+            try:
+                combined = re.compile('|'.join(f"(?P<_rule{index}>{pattern})" for index, (pattern, _, _) in enumerate(rules)))
+            except re.error as e:
+                # 인라인 플래그 등으로 합칠 수 없는 경우에는 규칙을 하나씩 확인합니다.
+                self.log_debug(f"Router: Falling back to per-rule matching: {str(e)}")
+
+        # 컴파일된 결과를 한 번에 교체하여, 검색 중인 스레드가 중간 상태를 보지 않도록 합니다.
+        with self.lock:
+            self.snapshot = (tuple(rules), combined)
+        self.log_debug(f"Router: Loaded {len(rules)} regex rules")
+
+    # 규칙에 등록된 폴더 목록을 중복 없이 등록 순서대로 반환합니다.
+    def folders(self):
+        rules, _ = self.snapshot
+        return list(dict.fromkeys(folder for _, _, folder in rules))
+
+    # 파일 이름에 맞는 첫 번째 규칙의 폴더를 반환합니다. 맞는 규칙이 없으면 None을 반환합니다.
+    # 어떤 규칙에도 맞지 않는 파일은 한 번의 검색으로 끝나지만, 맞는 규칙이 있으면 그보다 앞선 규칙(rules[:index])을
+    # 다시 하나씩 확인하므로 최악의 경우 규칙 수에 비례하는 시간이 걸립니다.
+    def match(self, filename):
+        rules, combined = self.snapshot
+        if combined is None:
+            for _, compiled, folder in rules:
+                if compiled.search(filename):
+                    return folder
+            return None
+
+        found = combined.search(filename)
+        if not found:
+            return None  # 어떤 규칙에도 맞지 않으면 한 번의 검색으로 끝납니다.
+
+        # 가장 왼쪽에서 일치한 규칙보다 앞선 규칙이 다른 위치에서 일치할 수 있으므로 그 규칙들만 확인합니다.
+        index = int(found.lastgroup[len('_rule'):])
+        for _, compiled, folder in rules[:index]:
+            if compiled.search(filename):
+                return folder
+        return rules[index][2]
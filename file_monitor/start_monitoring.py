@@ -1,26 +1,68 @@
 import os
-import queue
 import threading
+import sqlite3
+from functools import partial
 from watchdog.observers import Observer
 from performance_monitor import PerformanceMonitor
+from config import load_performance_settings
 from utils import normalize_path
 from file_monitor.base_date_folder_handler import BaseDateFolderHandler
 from file_monitor.target_folders_handler import TargetFoldersHandler
 from file_monitor.wf_info_folder_handler import WfInfoFolderHandler
-from file_monitor.event_processor import event_processor
+from file_monitor.event_processor import event_processor, handle_event
+from file_monitor.event_worker_pool import EventWorkerPool
+from file_monitor.delayed_scheduler import DelayedJobScheduler
+from file_monitor.router import Router
+from file_monitor.debounce_table import DebounceTable
+from file_monitor.catchup_scanner import CatchUpScanner
+from file_monitor.event_journal import EventJournal, JournaledQueue
+from file_monitor.copy_engine import CopyEngine
+from file_monitor.rename_index import RenameIndex
+from file_monitor.image_index import ImageIndex
+from file_monitor.bundle_tracker import BundleTracker
+from upload.upload_service import create_upload_handlers
 
 def start_monitoring(app):
     # 로그 파일이 저장될 디렉토리를 가져옵니다.
     log_dir = app.logger.log_dir_path
 
-    # 성능 모니터링 객체를 초기화합니다. (로그 디렉토리를 사용합니다.)
-    perf_monitor = PerformanceMonitor(log_dir)
+    # 성능 관련 설정을 불러옵니다.
+    performance_settings = load_performance_settings()
+
+    # 성능 모니터링 객체를 초기화하고 백그라운드 샘플러를 시작합니다. (로그 디렉토리를 사용합니다.)
+    # 성능 로그도 이벤트 로그와 같은 LogWriter 스레드로 기록합니다.
+    perf_monitor = PerformanceMonitor(log_dir, float(performance_settings['perf_sample_interval']), writer=app.logger.writer)
+    perf_monitor.start()
 
     # 이벤트를 저장할 큐(queue)를 생성합니다.
-    event_queue = queue.Queue()
+    # 큐에 넣은 이벤트는 저널(EventLog/event_journal.db)에 함께 기록되어, 비정상 종료 후 다시 시작하면 이어서 처리됩니다.
+    journal = None
+    if performance_settings['journal_enabled'].lower() == 'true':
+        try:
+            journal = EventJournal(os.path.join(log_dir, 'event_journal.db'))
+        except sqlite3.Error as e:
+            # 다른 인스턴스가 저널을 열고 있으면 저널 없이 모니터링합니다.
+            app.logger.log_debug(f"start_monitoring: Event journal unavailable, continuing without it: {str(e)}")
+    event_queue = JournaledQueue(journal)
+    # 실패한 이벤트는 저널에 남으며, journal_max_attempts번까지만 다시 처리합니다.
+    # 그 횟수 이상 실패한 이벤트는 다시 처리하기 전에 journal_failed 테이블로 옮깁니다.
+    max_attempts = int(performance_settings['journal_max_attempts'])
+    if journal:
+        failed_count = journal.purge_failed(max_attempts)
+        if failed_count:
+            app.logger.log_debug(f"start_monitoring: Moved {failed_count} journal events that failed {max_attempts} times to journal_failed")
+    replayed_count = event_queue.replay(max_attempts)
+    if replayed_count:
+        app.logger.log_debug(f"start_monitoring: Replaying {replayed_count} unfinished events from the journal")
+
+    # [Regex] 규칙을 한 번만 컴파일하는 라우터를 생성합니다.
+    # 앱 컨텍스트에 등록해 두면 규칙이 편집될 때 UI에서 다시 불러올 수 있습니다.
+    router = Router(app.app_context.regex_folders, app.logger.log_debug)
+    app.app_context.router = router
 
-    # 이미 처리된 이벤트를 추적하기 위한 딕셔너리를 초기화합니다.
-    processed_events = {}
+    # 이미 처리된 이벤트를 추적하기 위한 디바운스 테이블을 초기화합니다. 모든 핸들러가 함께 사용합니다.
+    # 오래된 항목은 시간이 지나면 제거되고 최대 크기도 제한되므로, 장기간 실행해도 메모리가 늘어나지 않습니다.
+    debounce_table = DebounceTable(performance_settings['debounce_ttl'], performance_settings['debounce_max_size'])
 
     # 설정된 제외 폴더와 저장 폴더를 가져옵니다.
     exclude_folders = app.app_context.exclude_folders
@@ -33,7 +75,8 @@ def start_monitoring(app):
 
     # 기본 날짜 폴더와 모니터링할 폴더들을 가져옵니다.
     base_date_folder = app.app_context.base_date_folder
-    monitored_paths = app.app_context.monitored_folders
+    # 설정의 폴더 목록이 실행할 때마다 늘어나지 않도록 복사본을 사용합니다.
+    monitored_paths = list(app.app_context.monitored_folders)
     if base_date_folder != "Unselected":  # 기본 날짜 폴더가 선택된 경우
         monitored_paths += [base_date_folder]
 
@@ -44,18 +87,18 @@ def start_monitoring(app):
         app.logger.log_event,
         app.logger.log_debug,
         event_queue,
-        processed_events
+        debounce_table
     )
 
     # 타겟 폴더 핸들러를 초기화합니다.
     target_folders_handler = TargetFoldersHandler(
         app.app_context.dest_folder,
-        app.app_context.regex_folders,
+        router,
         exclude_folders,
         app.logger.log_event,
         app.logger.log_debug,
         event_queue,
-        processed_events
+        debounce_table
     )
 
     # WF 정보 폴더 핸들러를 초기화합니다.
@@ -66,7 +109,7 @@ def start_monitoring(app):
         app.logger.log_event,
         app.logger.log_debug,
         event_queue,
-        processed_events
+        debounce_table
     )
 
     # 파일 시스템 변경 사항을 감시하는 Observer 객체를 초기화합니다.
@@ -84,29 +127,94 @@ def start_monitoring(app):
     
     # wf_info 폴더도 모니터링하도록 설정합니다.
     observer.schedule(wf_info_folder_handler, path=os.path.join(save_to_folder, 'wf_info'), recursive=True)
+
+    # Upload Data 탭에서 선택한 폴더의 결과 파일을 업로드 큐를 통해 데이터베이스에 올립니다.
+    upload_handlers = create_upload_handlers(app.app_context, app.logger.log_debug)
+    for handler in upload_handlers:
+        os.makedirs(handler.folder_to_track, exist_ok=True)
+        observer.schedule(handler, path=handler.folder_to_track, recursive=False)
+        app.logger.log_debug(f"start_monitoring: Upload monitoring started for path: {handler.folder_to_track}")
     
     # 파일 시스템 변경 감시를 시작합니다.
     observer.start()
 
+    # 감시를 시작한 뒤, 프로그램이 멈춰 있던 동안 생긴 파일을 별도 스레드에서 찾아 이벤트 큐에 넣습니다.
+    # 검색 중에 생긴 파일은 감시로도 들어오지만, 이미 복사된 파일은 CopyEngine이 건너뜁니다.
+    catchup_scanner = None
+    if performance_settings['catchup_enabled'].lower() == 'true':
+        catchup_scanner = CatchUpScanner(
+            os.path.join(log_dir, 'catchup_watermark.json'),
+            exclude_folders,
+            app.logger.log_debug,
+            prune_date_folders=performance_settings['catchup_prune_date_folders'].lower() == 'true'
+        )
+        catchup_scanner.start(app.app_context.monitored_folders, event_queue, app.stop_event)
+
     # 애플리케이션의 모니터링 상태를 설정합니다.
     if not hasattr(app, 'monitoring_started') or not app.monitoring_started:
         app.logger.log_event("Monitoring started", "")
         app.monitoring_started = True
 
-    # 이벤트를 처리하는 스레드를 시작합니다.
+    # 이미지 PDF 변환 작업을 대기 시간 뒤에 실행할 스케줄러를 시작합니다.
+    image_scheduler = DelayedJobScheduler(performance_settings['image_worker_count'], app.logger.log_debug)
+    image_scheduler.start()
+
+    # 파일 쓰기가 끝난 뒤 임시 파일을 거쳐 안전하게 복사하는 복사 엔진을 생성합니다.
+    copy_engine = CopyEngine(
+        app.logger.log_debug,
+        chunk_size=int(performance_settings['copy_chunk_size_mb']) * 1024 * 1024,
+        verify_hash=performance_settings['copy_verify_hash'].lower() == 'true',
+        stable_interval=performance_settings['copy_stable_interval'],
+        stable_checks=performance_settings['copy_stable_checks'],
+        stable_timeout=performance_settings['copy_stable_timeout']
+    )
+    # 중단된 복사로 대상 폴더에 남은 오래된 임시 파일(.part)을 정리합니다. 같은 원본의 복사는 새 임시 파일로 다시 시작됩니다.
+    copy_engine.cleanup_partials(
+        [normalize_path(os.path.join(app.app_context.dest_folder, folder)) for folder in router.folders()],
+        performance_settings['copy_partial_max_age']
+    )
+
+    # 이미지 폴더에서 이름을 바꿔야 하는 "#1" 파일을 날짜별로 기억하는 색인을 생성합니다.
+    rename_index = RenameIndex(target_image_folder, app.logger.log_debug)
+    # PDF로 묶을 이미지를 날짜 문자열로 바로 찾을 수 있도록 이미지 폴더의 파일을 기억하는 색인을 생성합니다.
+    image_index = ImageIndex(target_image_folder, app.logger.log_debug)
+    # 웨이퍼의 이미지가 모두 들어왔는지 판단해 PDF 변환 시점을 정합니다.
+    bundle_tracker = BundleTracker(
+        image_scheduler,
+        image_index,
+        performance_settings['bundle_quiet_period'],
+        performance_settings['bundle_expected_count'],
+        app.logger.log_debug
+    )
+
+    # 이벤트를 병렬로 처리할 워커 풀을 생성합니다. 워커 수는 [Performance] 섹션에서 설정합니다.
+    worker_pool = EventWorkerPool(
+        performance_settings['worker_count'],
+        partial(
+            handle_event,
+            log_event=app.logger.log_event,
+            log_debug=app.logger.log_debug,
+            perf_monitor=perf_monitor,
+            dest_folder=app.app_context.dest_folder,
+            router=router,
+            copy_engine=copy_engine,
+            rename_index=rename_index,
+            image_index=image_index,
+            base_date_folder=base_date_folder,
+            save_to_folder=save_to_folder,
+            target_compare_folders=app.app_context.target_compare_folders,
+            bundle_tracker=bundle_tracker
+        ),
+        app.logger.log_debug,
+        on_done=event_queue.ack,  # 처리가 끝난 이벤트를 저널에서 확인 처리합니다.
+        on_failed=event_queue.fail  # 처리에 실패한 이벤트는 저널에 남기고 실패 횟수를 늘립니다.
+    )
+    worker_pool.start()
+
+    # 이벤트 큐의 이벤트를 워커 풀에 분배하는 스레드를 시작합니다.
     processor_thread = threading.Thread(
-        target=event_processor, 
-        args=(
-            event_queue, 
-            app.logger.log_event, 
-            app.logger.log_debug, 
-            perf_monitor, 
-            app.app_context.dest_folder, 
-            app.app_context.regex_folders, 
-            base_date_folder, 
-            save_to_folder, 
-            app.app_context.target_compare_folders
-        )
+        target=event_processor,
+        args=(event_queue, app.stop_event, worker_pool, app.logger.log_debug)
     )
     processor_thread.daemon = True
     processor_thread.start()
@@ -120,6 +228,19 @@ def start_monitoring(app):
         # 모니터링 중지 시, 감시를 중지하고 자원을 정리합니다.
         observer.stop()
         observer.join()
+        # 업로드 핸들러가 대기 중인 파일을 모두 업로드 큐에 넣을 때까지 기다립니다.
+        for handler in upload_handlers:
+            handler.stop()
+        # 놓친 파일 검색이 멈출 때까지 기다린 뒤, 큐에 남은 이벤트가 모두 처리될 때까지 기다립니다.
+        if catchup_scanner:
+            catchup_scanner.join()
+        processor_thread.join()
+        if catchup_scanner:
+            catchup_scanner.mark_stopped(app.app_context.monitored_folders)
+        image_scheduler.shutdown()
+        if journal:
+            journal.close()
+        perf_monitor.stop()
         if app.monitoring_started:
             app.logger.log_event("Monitoring stopped", "")
             app.monitoring_started = False
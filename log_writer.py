@@ -0,0 +1,167 @@
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from utils import normalize_path, get_log_file_size
+
+# 로그 파일을 회전(백업)하는 기준 크기입니다. (5MB)
+MAX_LOG_FILE_SIZE = 5 * 1024 * 1024
+
+# 로그 기록 스레드에 종료를 알리기 위한 표식 객체입니다.
+_STOP = object()
+
+class LogWriter:
+    # LogWriter 클래스는 여러 로그 파일에 쓸 줄을 메모리 큐에 모았다가 백그라운드 스레드에서 한 번에 기록합니다.
+    # 파일 이름은 'YYYYMMDD_<종류>.log' 형식을 따르며, 파일 크기는 메모리에서 추적하여 5MB가 넘으면 회전합니다.
+    def __init__(self, log_dir, flush_lines=200, flush_interval=0.5):
+        # 로그를 저장할 디렉토리 경로를 설정합니다.
+        self.log_dir = normalize_path(log_dir)
+        os.makedirs(self.log_dir, exist_ok=True)
+        # 모아 둔 줄이 flush_lines개 이상이 되거나 flush_interval초가 지나면 파일에 기록합니다.
+        self.flush_lines = int(flush_lines)
+        self.flush_interval = float(flush_interval)
+        self.queue = queue.Queue()
+        # 로그 종류별 상태: 종류 -> [날짜, 기본 파일 이름, 파일 경로, 현재 파일 크기]
+        self.targets = {}
+        self.thread = None
+        # close() 이후에는 큐를 거치지 않고 호출한 스레드에서 바로 기록합니다.
+        self.closed = False
+        self.state_lock = threading.Lock()  # closed 확인과 큐에 넣기를 한 번에 처리하기 위한 잠금
+        self.write_lock = threading.Lock()  # 기록 스레드와 직접 기록이 같은 파일을 동시에 쓰지 않도록 하는 잠금
+
+    def start(self):
+        # 로그 기록 스레드를 시작합니다.
+        if self.thread and self.thread.is_alive():
+            return self
+        self.thread = threading.Thread(target=self._writer_loop, name="LogWriter")
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def write(self, kind, line):
+        # 로그 한 줄을 큐에 넣습니다. kind는 'event', 'debug', 'performance'와 같은 로그 종류입니다.
+        # 이미 닫힌 뒤라면 늦게 도착한 로그가 사라지지 않도록 바로 파일에 기록합니다.
+        with self.state_lock:
+            if not self.closed:
+                self.queue.put((kind, line))
+                return
+        self._flush({kind: [line]})
+
+    def close(self):
+        # 큐에 남은 로그를 모두 기록한 뒤 스레드를 종료합니다.
+        # closed를 먼저 표시하므로 종료 표식보다 늦게 큐에 들어가는 로그는 없습니다.
+        with self.state_lock:
+            self.closed = True
+        if self.thread and self.thread.is_alive():
+            self.queue.put(_STOP)
+            self.thread.join()
+        self.thread = None
+        # 스레드를 시작하지 않았던 경우에도 큐에 남은 로그를 기록합니다.
+        pending = {}
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                pending.setdefault(item[0], []).append(item[1])
+        self._flush(pending)
+
+    def _writer_loop(self):
+        # 큐에서 줄을 꺼내 종류별로 모으고, 크기 또는 시간 조건이 되면 파일에 기록합니다.
+        pending = {}
+        pending_count = 0
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is not None and item is not _STOP:
+                kind, line = item
+                pending.setdefault(kind, []).append(line)
+                pending_count += 1
+
+            if item is _STOP or pending_count >= self.flush_lines or time.monotonic() - last_flush >= self.flush_interval:
+                self._flush(pending)
+                pending = {}
+                pending_count = 0
+                last_flush = time.monotonic()
+
+            if item is _STOP:
+                break
+
+    def _flush(self, pending):
+        # 종류별로 모은 줄을 파일에 기록합니다.
+        # 다른 프로그램이 파일을 잠그는 등 일시적으로 실패하면 파일 상태를 다시 읽어 한 번 더 시도하고,
+        # 그래도 실패하면 로그가 사라지지 않도록 표준 오류로 내보냅니다. (로그 기록 실패가 다른 작업을 멈추게 하지는 않습니다.)
+        with self.write_lock:
+            for kind, lines in pending.items():
+                try:
+                    self._write_lines(kind, lines)
+                except OSError:
+                    self.targets.pop(kind, None)
+                    try:
+                        self._write_lines(kind, lines)
+                    except OSError as e:
+                        self.targets.pop(kind, None)
+                        self._write_stderr(kind, lines, e)
+
+    def _write_stderr(self, kind, lines, error):
+        # 파일에 기록하지 못한 줄을 표준 오류로 내보냅니다. 콘솔이 없는 실행(pythonw)에서는 sys.stderr가 None일 수 있습니다.
+        if sys.stderr is None:
+            return
+        try:
+            sys.stderr.write(f"LogWriter: Failed to write {len(lines)} {kind} log lines: {str(error)}\n")
+            sys.stderr.write(''.join(lines))
+            sys.stderr.flush()
+        except (OSError, ValueError):
+            pass
+
+    def _target(self, kind):
+        # 로그 종류에 해당하는 파일 상태를 반환합니다. 날짜가 바뀌면 새 파일로 전환합니다.
+        date_str = datetime.now().strftime('%Y%m%d')
+        target = self.targets.get(kind)
+        if target is None or target[0] != date_str:
+            base_name = f"{date_str}_{kind}.log"
+            file_path = os.path.join(self.log_dir, base_name)
+            # 파일 크기는 처음 열 때 한 번만 확인하고, 이후에는 메모리에서 추적합니다.
+            target = [date_str, base_name, file_path, get_log_file_size(file_path)]
+            self.targets[kind] = target
+        return target
+
+    def _write_lines(self, kind, lines):
+        # 모아 둔 줄을 파일에 한 번에 기록합니다. 기록 중 5MB를 넘으면 파일을 회전한 뒤 이어서 기록합니다.
+        target = self._target(kind)
+        chunk = []
+        for line in lines:
+            if target[3] >= MAX_LOG_FILE_SIZE:
+                self._append(target[2], chunk)
+                chunk = []
+                self._rotate_log_file(target[2], target[1])
+                target[3] = 0
+            chunk.append(line)
+            target[3] += len(line.encode('utf-8'))
+        self._append(target[2], chunk)
+
+    def _append(self, file_path, lines):
+        # 여러 줄을 한 번의 파일 열기로 기록합니다.
+        if lines:
+            with open(file_path, 'a', encoding='utf-8') as log_file:
+                log_file.write(''.join(lines))
+
+    def _rotate_log_file(self, file_path, base_name):
+        # 로그 파일을 회전(백업)합니다.
+        base, ext = os.path.splitext(base_name)
+        counter = 1
+        # 로그 파일이 이미 존재할 경우, 숫자를 증가시켜 새 이름을 만듭니다.
+        new_file_path = os.path.join(self.log_dir, f"{base}_{counter}{ext}")
+        while os.path.exists(new_file_path):
+            counter += 1
+            new_file_path = os.path.join(self.log_dir, f"{base}_{counter}{ext}")
+        # 오래된 로그 파일을 새 이름으로 변경합니다.
+        os.rename(file_path, new_file_path)
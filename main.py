@@ -1,4 +1,5 @@
 import sys  # 파이썬 인터프리터와 상호작용하기 위한 모듈을 불러옵니다.
+import multiprocessing  # 프로세스 풀을 실행 파일로 배포할 때 필요한 모듈을 불러옵니다.
 import os  # 운영체제와 상호작용하기 위한 모듈을 불러옵니다.
 import psutil  # 시스템 및 프로세스 정보를 가져오기 위한 모듈을 불러옵니다.
 from PySide6.QtWidgets import QApplication, QDialog  # PySide6 라이브러리에서 GUI 관련 클래스를 불러옵니다.
@@ -13,7 +14,7 @@ class AppContext:
         # EQPID(장비 ID)를 설정 파일에서 불러옵니다.
         self.eqpid = load_eqpid()
         # 설정 파일에서 다양한 설정을 불러옵니다.
-        self.monitored_folders, self.dest_folder, self.regex_folders, self.exclude_folders, self.base_date_folder, self.target_compare_folders,self.target_image_folder, self.wait_time, self.image_save_folder, self.wafer_flat_data_path, self.prealign_data_path, self.image_data_path, slef.error_data_path, self.event_data_path, self.wave_data_path = load_settings()
+        self.monitored_folders, self.dest_folder, self.regex_folders, self.exclude_folders, self.base_date_folder, self.target_compare_folders,self.target_image_folder, self.wait_time, self.image_save_folder, self.wafer_flat_data_path, self.prealign_data_path, self.image_data_path, self.error_data_path, self.event_data_path, self.wave_data_path = load_settings()
         self.base_dir = base_dir  # 로그를 저장할 기본 디렉토리를 설정합니다.
         self.logger = None  # 로거를 초기화하기 전까지는 None으로 설정합니다.
 
@@ -38,7 +39,7 @@ class AppContext:
             self.wafer_flat_data_path,
             self.prealign_data_path,
             self.image_data_path,
-            slef.error_data_path,
+            self.error_data_path,
             self.event_data_path,
             self.wave_data_path
         )
@@ -66,6 +67,7 @@ def remove_pid_file(pid_file):
 
 # 프로그램의 시작점입니다. 메인 프로그램이 여기서 실행됩니다.
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # 실행 파일로 배포했을 때 프로세스 풀의 작업 프로세스가 프로그램을 다시 시작하지 않도록 합니다.
     PID_FILE = 'program.pid'  # PID 파일의 이름을 설정합니다.
     
     # 다른 인스턴스가 실행 중인지 확인합니다.
@@ -1,51 +1,72 @@
 import psutil  # 시스템 및 프로세스 유틸리티를 제공하는 라이브러리
 from datetime import datetime  # 날짜와 시간을 처리하는 모듈
+from collections import deque  # 최근 샘플을 보관하기 위한 고정 길이 큐
+import threading  # 백그라운드 샘플링 스레드를 위한 모듈
 import os  # 운영체제와 상호작용하기 위한 모듈
-from utils import normalize_path, get_log_file_size  # 경로 정규화 및 파일 크기 확인을 위한 유틸리티 함수
+from utils import normalize_path  # 경로 정규화를 위한 유틸리티 함수
+from log_writer import LogWriter  # 로그를 모아서 기록하는 백그라운드 기록기
 
 class PerformanceMonitor:
     # 시스템 성능(예: CPU 및 메모리 사용량)을 모니터링하고 로그로 기록하는 클래스입니다.
-    def __init__(self, base_dir):
+    def __init__(self, base_dir, sample_interval=1.0, history_size=60, writer=None):
         # 로그를 저장할 디렉토리 경로를 설정합니다.
         self.log_dir = normalize_path(base_dir)
         # 로그 디렉토리가 존재하지 않으면 생성합니다.
         os.makedirs(self.log_dir, exist_ok=True)
-        # 현재 날짜를 'YYYYMMDD' 형식으로 설정합니다.
-        self.current_date = datetime.now().strftime('%Y%m%d')
-        # 성능 로그 파일의 기본 이름을 설정합니다.
-        self.log_file_base_name = f"{self.current_date}_performance.log"
-        # 로그 파일의 경로를 설정합니다.
-        self.log_file_path = os.path.join(self.log_dir, self.log_file_base_name)
+        # 로그 기록은 LogWriter가 담당합니다. 공유할 LogWriter가 없으면 직접 만들어 사용합니다.
+        self.owns_writer = writer is None
+        self.writer = writer if writer is not None else LogWriter(self.log_dir).start()
+        # 백그라운드 샘플러 설정입니다. 최근 샘플은 (시각, CPU %, 메모리 %) 형태로 링 버퍼에 보관합니다.
+        self.sample_interval = float(sample_interval)
+        self.samples = deque(maxlen=int(history_size))
+        self._stop_event = threading.Event()
+        self._sampler_thread = None
 
-    def _update_log_file_path(self):
-        # 날짜가 변경되었는지 확인하여 로그 파일 경로를 업데이트합니다.
-        new_date = datetime.now().strftime('%Y%m%d')
-        if new_date != self.current_date:
-            self.current_date = new_date
-            self.log_file_base_name = f"{self.current_date}_performance.log"
-            self.log_file_path = os.path.join(self.log_dir, self.log_file_base_name)
+    def start(self):
+        # 일정 간격으로 CPU와 메모리 사용량을 측정하는 백그라운드 스레드를 시작합니다.
+        if self._sampler_thread and self._sampler_thread.is_alive():
+            return
+        self._stop_event.clear()
+        psutil.cpu_percent(interval=None)  # 첫 호출은 기준점만 잡으므로 미리 한 번 호출합니다.
+        self._sample()
+        self._sampler_thread = threading.Thread(target=self._sampler_loop, name="PerformanceSampler")
+        self._sampler_thread.daemon = True
+        self._sampler_thread.start()
 
-    def _rotate_log_file(self, file_path, base_name):
-        # 로그 파일의 크기가 5MB 이상인 경우, 파일을 회전(백업)합니다.
-        if get_log_file_size(file_path) >= 5 * 1024 * 1024:  # 5MB
-            base, ext = os.path.splitext(base_name)
-            counter = 1
-            # 동일한 이름의 파일이 이미 존재할 경우, 숫자를 증가시켜 새 이름을 만듭니다.
-            new_file_path = os.path.join(self.log_dir, f"{base}_{counter}{ext}")
-            while os.path.exists(new_file_path):
-                counter += 1
-                new_file_path = os.path.join(self.log_dir, f"{base}_{counter}{ext}")
-            # 오래된 로그 파일을 새 이름으로 변경합니다.
-            os.rename(file_path, new_file_path)
+    def stop(self):
+        # 백그라운드 샘플링 스레드를 중지합니다.
+        self._stop_event.set()
+        if self._sampler_thread:
+            self._sampler_thread.join()
+            self._sampler_thread = None
+        if self.owns_writer:
+            self.writer.close()  # 직접 만든 LogWriter라면 남은 로그를 기록하고 종료합니다.
+
+    def _sampler_loop(self):
+        # 중지 요청이 있을 때까지 sample_interval 간격으로 샘플을 수집합니다.
+        while not self._stop_event.wait(self.sample_interval):
+            self._sample()
+
+    def _sample(self):
+        # interval=None으로 호출하면 직전 호출 이후의 CPU 사용률을 즉시 반환하므로 블로킹되지 않습니다.
+        cpu_usage = psutil.cpu_percent(interval=None)
+        memory_usage = psutil.virtual_memory().percent
+        self.samples.append((datetime.now(), cpu_usage, memory_usage))
+
+    def latest(self):
+        # 가장 최근 샘플의 (CPU %, 메모리 %)를 반환합니다. 샘플이 없으면 (None, None)을 반환합니다.
+        try:
+            _, cpu_usage, memory_usage = self.samples[-1]
+        except IndexError:
+            return None, None
+        return cpu_usage, memory_usage
 
     def log_performance(self):
         # 현재 시스템의 성능 정보를 로그 파일에 기록합니다.
-        self._update_log_file_path()
-        self._rotate_log_file(self.log_file_path, self.log_file_base_name)
-        with open(self.log_file_path, 'a', encoding='utf-8') as log_file:
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-            # CPU 사용량과 메모리 사용량을 얻습니다.
-            cpu_usage = psutil.cpu_percent(interval=1)
-            memory_info = psutil.virtual_memory()
-            # 성능 정보를 로그 파일에 기록합니다.
-            log_file.write(f"{timestamp} - PerformanceMonitor: CPU Usage: {cpu_usage}%, Memory Usage: {memory_info.percent}%\n")
+        # 측정은 백그라운드 샘플러가 담당하므로, 여기서는 캐시된 최신 값만 읽어 블로킹되지 않습니다.
+        cpu_usage, memory_usage = self.latest()
+        if cpu_usage is None:
+            return  # 샘플러가 아직 시작되지 않았으면 기록하지 않습니다.
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+        # 성능 정보를 LogWriter에 넘겨 'YYYYMMDD_performance.log' 파일에 기록합니다.
+        self.writer.write('performance', f"{timestamp} - PerformanceMonitor: CPU Usage: {cpu_usage}%, Memory Usage: {memory_usage}%\n")
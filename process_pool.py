@@ -0,0 +1,55 @@
+import os  # 운영체제와 상호작용하기 위한 모듈
+import threading  # 프로세스 풀 생성을 보호하기 위한 모듈
+from concurrent.futures import ProcessPoolExecutor  # CPU 작업을 별도 프로세스에서 실행하기 위한 실행기
+from concurrent.futures.process import BrokenProcessPool  # 작업 프로세스가 비정상 종료되었을 때의 예외
+from config import load_performance_settings  # [Performance] 섹션 설정을 불러오는 함수
+
+# PDF 변환, 결과 파일 분석처럼 CPU를 많이 쓰는 작업을 GUI와 감시 스레드가 있는 프로세스 밖에서 실행하는 프로세스 풀입니다.
+# 처음 작업을 실행할 때 만들어지며, 작업 함수와 인자는 pickle로 전달할 수 있어야 하고 결과는 경로나 DataFrame처럼 작게 돌려받습니다.
+# 프로세스 수는 [Performance] 섹션의 process_workers로 정하며, 0이면 풀을 만들지 않고 호출한 스레드에서 바로 실행합니다.
+# 애플리케이션 종료 중에 풀을 닫으면 다시 만들지 않습니다.
+_pool = None
+_pool_lock = threading.Lock()
+_disabled = False
+_closed = False
+
+# 프로세스 풀을 반환하는 함수입니다. 아직 없으면 설정에 따라 만들고, 사용하지 않도록 설정되었으면 None을 반환합니다.
+# shutdown_process_pool로 닫은 뒤에는 RuntimeError가 발생합니다.
+def get_process_pool():
+    global _pool, _disabled
+    with _pool_lock:
+        if _closed:
+            raise RuntimeError("process pool has been shut down")
+        if _pool is None and not _disabled:
+            workers = int(load_performance_settings()['process_workers'])
+            if workers <= 0:
+                _disabled = True
+            else:
+                _pool = ProcessPoolExecutor(max_workers=min(workers, os.cpu_count() or 1))
+        return _pool
+
+# func(*args, **kwargs)를 프로세스 풀에서 실행하고 결과를 기다려 반환하는 함수입니다.
+# 작업에서 발생한 예외는 호출한 쪽에서 다시 발생합니다. 작업 프로세스가 비정상 종료되면 풀을 버리고 다음 작업에서 새로 만듭니다.
+def run_cpu_job(func, *args, **kwargs):
+    global _pool
+    pool = get_process_pool()
+    if pool is None:
+        return func(*args, **kwargs)
+    try:
+        return pool.submit(func, *args, **kwargs).result()
+    except BrokenProcessPool:
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        pool.shutdown(wait=False)
+        raise
+
+# 프로세스 풀을 종료하는 함수입니다. 실행 중인 작업이 끝날 때까지 기다리고, 대기 중인 작업은 취소합니다.
+# 종료 후에는 풀이 닫힌 것으로 표시되어, 늦게 도착한 작업이 풀을 다시 만들지 않습니다.
+def shutdown_process_pool():
+    global _pool, _closed
+    with _pool_lock:
+        pool, _pool = _pool, None
+        _closed = True
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 테스트에서 저장소 최상위 모듈(utils, file_monitor 등)을 불러올 수 있도록 경로를 추가합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
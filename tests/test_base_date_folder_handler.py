@@ -0,0 +1,47 @@
+import queue
+from watchdog.events import FileCreatedEvent, FileModifiedEvent, FileMovedEvent
+from utils import normalize_path
+from file_monitor.debounce_table import DebounceTable
+from file_monitor.base_date_folder_handler import BaseDateFolderHandler
+
+def _noop(*args):
+    pass
+
+def _handler(tmp_path, event_queue):
+    return BaseDateFolderHandler(str(tmp_path), str(tmp_path / 'save'), _noop, _noop, event_queue, DebounceTable())
+
+# 생성 이벤트는 파일을 읽지 않고 큐에만 넣어야 하며, 디바운스 시간 안의 중복 이벤트는 무시해야 합니다.
+def test_created_event_is_queued_without_parsing(tmp_path):
+    event_queue = queue.Queue()
+    handler = _handler(tmp_path, event_queue)
+    path = str(tmp_path / 'missing_base_date.txt')  # 존재하지 않는 파일이어도 감시 스레드에서는 읽지 않습니다.
+    handler.on_created(FileCreatedEvent(path))
+    handler.on_created(FileCreatedEvent(path))
+
+    assert event_queue.get_nowait() == ('base_date_created', normalize_path(path))
+    assert event_queue.empty()
+
+# 생성 직후의 수정 이벤트는 무시하고, 그렇지 않은 수정 이벤트는 큐에 넣어야 합니다.
+def test_modified_event_after_creation_is_ignored(tmp_path):
+    event_queue = queue.Queue()
+    handler = _handler(tmp_path, event_queue)
+    created = str(tmp_path / 'a.txt')
+    handler.on_created(FileCreatedEvent(created))
+    event_queue.get_nowait()
+    handler.on_modified(FileModifiedEvent(created))
+    assert event_queue.empty()
+
+    modified = str(tmp_path / 'b.txt')
+    handler.on_modified(FileModifiedEvent(modified))
+    assert event_queue.get_nowait() == ('base_date_modified', normalize_path(modified))
+
+# 복사 중인 임시 파일은 무시하고, 임시 파일이 최종 이름으로 바뀌면 생성 이벤트로 처리해야 합니다.
+def test_partial_copy_is_queued_when_renamed(tmp_path):
+    event_queue = queue.Queue()
+    handler = _handler(tmp_path, event_queue)
+    partial = str(tmp_path / '.a.txt.123.part')
+    final = str(tmp_path / 'a.txt')
+    handler.on_created(FileCreatedEvent(partial))
+    assert event_queue.empty()
+    handler.on_moved(FileMovedEvent(partial, final))
+    assert event_queue.get_nowait() == ('base_date_created', normalize_path(final))
@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+import config
+from upload import db_info
+from upload import bulk_insert as bulk_insert_module
+from upload.bulk_insert import bulk_insert
+
+def _noop(message):
+    pass
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    settings_file = tmp_path / 'settings.ini'
+    settings_file.write_text(f"[Database]\nurl = sqlite:///{tmp_path / 'db.sqlite'}\n", encoding='utf-8')
+    monkeypatch.setattr(config, 'CONFIG_FILE', str(settings_file))
+    db_info.dispose_db_engine()
+    yield db_info.get_db_engine()
+    db_info.dispose_db_engine()
+
+def _count(engine, table):
+    with engine.connect() as connection:
+        return connection.exec_driver_sql(f"SELECT COUNT(*) FROM {table}").scalar()
+
+# 여러 DataFrame은 한 번의 트랜잭션으로 추가해야 합니다.
+def test_frames_are_inserted_in_one_transaction(engine, monkeypatch):
+    begins = []
+    original_begin = engine.begin
+    monkeypatch.setattr(engine, 'begin', lambda: (begins.append(1), original_begin())[1])
+    frames = [pd.DataFrame({'a': [1, 2], 'b': ['x', 'y']}), None, pd.DataFrame({'a': [3], 'b': ['z']})]
+
+    assert bulk_insert('t', frames, chunk_size=1, log=_noop) == 3
+    assert len(begins) == 1
+    assert _count(engine, 't') == 3
+
+# 중간에 실패하면 앞서 추가한 행까지 모두 롤백해야 합니다.
+def test_failure_rolls_back_every_frame(engine):
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE t (a INTEGER, b TEXT NOT NULL)")
+    frames = [pd.DataFrame({'a': [1], 'b': ['x']}), pd.DataFrame({'a': [2], 'b': [None]})]
+
+    with pytest.raises(Exception):
+        bulk_insert('t', frames, log=_noop)
+    assert _count(engine, 't') == 0
+
+# 테이블에 없는 열은 업로드하지 않고 기록해야 합니다.
+def test_columns_missing_from_table_are_skipped(engine):
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE t (a INTEGER, b TEXT)")
+    frames = [pd.DataFrame({'a': [1], 'B': ['x'], 'NotchAngle': [0.1]}), pd.DataFrame({'Extra': [2]})]
+    messages = []
+
+    assert bulk_insert('t', frames, log=messages.append) == 1
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT a, b FROM t").fetchall() == [(1, 'x')]
+    assert any('Skipped columns not in t: Extra, NotchAngle' in message for message in messages)
+
+# 추가할 행이 없으면 데이터베이스에 연결하지 않아야 합니다.
+def test_empty_frames_skip_database(monkeypatch):
+    monkeypatch.setattr(bulk_insert_module, 'get_db_engine', lambda: pytest.fail("engine requested"))
+    assert bulk_insert('t', [None, pd.DataFrame()], log=_noop) == 0
@@ -0,0 +1,97 @@
+import threading
+import time
+import pytest
+from file_monitor.delayed_scheduler import DelayedJobScheduler
+from file_monitor.image_index import ImageIndex
+from file_monitor.bundle_tracker import BundleTracker
+
+KEY = ('20240101', '120000')
+
+def _noop(message):
+    pass
+
+@pytest.fixture
+def scheduler():
+    scheduler = DelayedJobScheduler(1, _noop)
+    scheduler.start()
+    yield scheduler
+    scheduler.shutdown()
+
+# 이미지 폴더에 이미지를 만들고 색인과 추적기에 알립니다.
+def _add_image(tmp_path, image_index, tracker, number):
+    path = tmp_path / f"20240101_120000_WF_{number}.jpg"
+    path.write_bytes(b'')
+    tracker.image_added(image_index.add(str(path)))
+
+# 작업을 등록하고, 완료 시각과 변환 시점의 이미지 목록을 기록합니다.
+def _schedule(tracker, image_index, wait_time):
+    result = {'started': time.monotonic(), 'done': threading.Event()}
+
+    def bundle():
+        result['images'] = image_index.find(*KEY)
+        result['elapsed'] = time.monotonic() - result['started']
+
+    tracker.schedule(KEY, wait_time, bundle, on_done=lambda ok: result['done'].set())
+    return result
+
+# 첫 이미지가 들어오기 전에는 조용한 시간이 지나도 변환하지 않고, 첫 이미지 뒤 조용한 시간이 지나면 변환해야 합니다.
+def test_quiet_period_starts_after_first_image(tmp_path, scheduler):
+    image_index = ImageIndex(str(tmp_path), _noop)
+    tracker = BundleTracker(scheduler, image_index, 0.2, 0, _noop)
+    result = _schedule(tracker, image_index, 3)
+
+    time.sleep(0.4)
+    assert not result['done'].is_set()
+    _add_image(tmp_path, image_index, tracker, 1)
+    _add_image(tmp_path, image_index, tracker, 2)
+
+    assert result['done'].wait(2)
+    assert 0.5 <= result['elapsed'] < 1.5
+    assert len(result['images']) == 2
+
+# 이미지가 이미 있으면 조용한 시간 뒤에 변환해야 합니다.
+def test_existing_images_use_quiet_period(tmp_path, scheduler):
+    (tmp_path / "20240101_120000_WF_1.jpg").write_bytes(b'')
+    image_index = ImageIndex(str(tmp_path), _noop)
+    tracker = BundleTracker(scheduler, image_index, 0.1, 0, _noop)
+    result = _schedule(tracker, image_index, 3)
+
+    assert result['done'].wait(1)
+    assert result['elapsed'] < 0.5
+
+# 이미지 수가 expected_count에 도달하면 조용한 시간을 기다리지 않고 바로 변환해야 합니다.
+def test_expected_count_converts_immediately(tmp_path, scheduler):
+    image_index = ImageIndex(str(tmp_path), _noop)
+    tracker = BundleTracker(scheduler, image_index, 5, 3, _noop)
+    result = _schedule(tracker, image_index, 10)
+
+    for number in range(1, 4):
+        _add_image(tmp_path, image_index, tracker, number)
+
+    assert result['done'].wait(1)
+    assert [path.rsplit('_', 1)[1] for path in result['images']] == ['1.jpg', '2.jpg', '3.jpg']
+
+# 이미지가 계속 들어와도 처음 등록한 뒤 wait_time이 지나면 변환해야 합니다.
+def test_wait_time_caps_the_bundle(tmp_path, scheduler):
+    image_index = ImageIndex(str(tmp_path), _noop)
+    tracker = BundleTracker(scheduler, image_index, 0.3, 0, _noop)
+    result = _schedule(tracker, image_index, 0.6)
+
+    number = 0
+    while not result['done'].is_set() and time.monotonic() - result['started'] < 2:
+        number += 1
+        _add_image(tmp_path, image_index, tracker, number)
+        time.sleep(0.05)
+
+    assert result['done'].is_set()
+    assert 0.55 <= result['elapsed'] < 1.0
+
+# 이미지가 들어오지 않으면 wait_time까지 기다린 뒤 실행해야 합니다.
+def test_no_images_waits_for_wait_time(tmp_path, scheduler):
+    image_index = ImageIndex(str(tmp_path), _noop)
+    tracker = BundleTracker(scheduler, image_index, 0.1, 0, _noop)
+    result = _schedule(tracker, image_index, 0.5)
+
+    assert result['done'].wait(2)
+    assert result['elapsed'] >= 0.45
+    assert result['images'] == []
@@ -0,0 +1,42 @@
+import os
+import queue
+import time
+from datetime import datetime
+from file_monitor.catchup_scanner import CatchUpScanner, date_folder_end
+
+def _noop(message):
+    pass
+
+# 연도와 월이 있고 월이 1~12인 이름만 날짜 이름 폴더로 보아야 합니다.
+def test_date_folder_end():
+    assert date_folder_end('20240131') == datetime(2024, 2, 1).timestamp()
+    assert date_folder_end('2024-02-29') == datetime(2024, 3, 1).timestamp()
+    assert date_folder_end('2024_12') == datetime(2025, 1, 1).timestamp()
+    assert date_folder_end('202401') == datetime(2024, 2, 1).timestamp()
+    for name in ['2023-13', '2023_00', '2023', '2023-01_05', '2023-02-30', '2023-01-00', '1999-01', 'LOT2023']:
+        assert date_folder_end(name) is None, name
+
+def _make_tree(tmp_path):
+    root = tmp_path / 'root'
+    for name in ['2020-01', 'LOT2020']:
+        folder = root / name
+        folder.mkdir(parents=True)
+        (folder / 'late.txt').write_text('data')
+    return root
+
+def _scan(tmp_path, root, **kwargs):
+    scanner = CatchUpScanner(str(tmp_path / 'watermarks.json'), [], _noop, **kwargs)
+    scanner.watermarks[os.path.normpath(str(root))] = time.time() - 60
+    event_queue = queue.Queue()
+    scanner.scan([str(root)], event_queue)
+    return sorted(os.path.basename(os.path.dirname(event_queue.get_nowait()[1])) for _ in range(event_queue.qsize()))
+
+# 날짜 이름 폴더 건너뛰기는 기본적으로 꺼져 있어, 오래된 날짜 폴더에 늦게 들어온 파일도 찾아야 합니다.
+def test_date_folders_are_scanned_by_default(tmp_path):
+    root = _make_tree(tmp_path)
+    assert _scan(tmp_path, root) == ['2020-01', 'LOT2020']
+
+# 켜면 워터마크보다 충분히 이전에 끝난 날짜 이름 폴더만 건너뛰어야 합니다.
+def test_old_date_folders_are_pruned_when_enabled(tmp_path):
+    root = _make_tree(tmp_path)
+    assert _scan(tmp_path, root, prune_date_folders=True) == ['LOT2020']
@@ -0,0 +1,77 @@
+import os
+import time
+from file_monitor.copy_engine import CopyEngine, is_partial_copy
+
+def _engine(messages=None):
+    log = messages.append if messages is not None else (lambda message: None)
+    return CopyEngine(log, chunk_size=4096, stable_interval=0.01, stable_checks=1, stable_timeout=1)
+
+def _write_source(tmp_path, data):
+    src_path = tmp_path / 'src' / 'wafer.bin'
+    src_path.parent.mkdir()
+    src_path.write_bytes(data)
+    # 수정 후 충분히 시간이 지난 파일로 만들어 안정 대기를 건너뜁니다.
+    old = time.time() - 60
+    os.utime(src_path, (old, old))
+    return str(src_path)
+
+# 같은 원본의 임시 파일이 남아 있으면 이어서 복사하고, 끝나면 임시 파일을 대상 파일로 바꿔야 합니다.
+def test_copy_resumes_from_partial_file(tmp_path):
+    data = os.urandom(100000)
+    src_path = _write_source(tmp_path, data)
+    dest_dir = tmp_path / 'dest'
+    dest_dir.mkdir()
+    dest_path = str(dest_dir / 'wafer.bin')
+    partial_path = dest_dir / f".wafer.bin.{os.stat(src_path).st_mtime_ns}.part"
+    partial_path.write_bytes(data[:30000])
+
+    messages = []
+    assert _engine(messages).copy(src_path, dest_path) == 'copied'
+
+    with open(dest_path, 'rb') as file:
+        assert file.read() == data
+    assert not partial_path.exists()
+    assert os.stat(dest_path).st_mtime_ns == os.stat(src_path).st_mtime_ns
+    assert any('Resuming copy' in message for message in messages)
+
+# 원본보다 큰 임시 파일은 버리고 처음부터 다시 복사해야 합니다.
+def test_oversized_partial_file_restarts_copy(tmp_path):
+    data = b'wafer' * 1000
+    src_path = _write_source(tmp_path, data)
+    dest_dir = tmp_path / 'dest'
+    dest_dir.mkdir()
+    dest_path = str(dest_dir / 'wafer.bin')
+    (dest_dir / f".wafer.bin.{os.stat(src_path).st_mtime_ns}.part").write_bytes(b'x' * (len(data) + 10))
+
+    assert _engine().copy(src_path, dest_path) == 'copied'
+    with open(dest_path, 'rb') as file:
+        assert file.read() == data
+
+# 대상 파일이 이미 같으면 복사를 건너뛰고, 원본이 없으면 'unstable'을 반환해야 합니다.
+def test_skip_up_to_date_and_missing_source(tmp_path):
+    src_path = _write_source(tmp_path, b'wafer')
+    dest_path = str(tmp_path / 'wafer.bin')
+    engine = _engine()
+    assert engine.copy(src_path, dest_path) == 'copied'
+    assert engine.copy(src_path, dest_path) == 'skipped'
+    assert engine.copy(str(tmp_path / 'missing.bin'), dest_path) == 'unstable'
+
+# 오래된 임시 파일만 삭제하고, 최근 임시 파일과 일반 파일은 남겨 두어야 합니다.
+def test_cleanup_removes_only_stale_partial_files(tmp_path):
+    old = time.time() - 7200
+    stale = tmp_path / '.a.txt.1.part'
+    recent = tmp_path / '.b.txt.2.part'
+    regular = tmp_path / 'c.txt'
+    for path in (stale, recent, regular):
+        path.write_bytes(b'data')
+    os.utime(stale, (old, old))
+    os.utime(regular, (old, old))
+
+    assert _engine().cleanup_partials([str(tmp_path), str(tmp_path / 'missing')], 3600) == 1
+    assert not stale.exists()
+    assert recent.exists() and regular.exists()
+
+def test_is_partial_copy():
+    assert is_partial_copy('/dest/.wafer.bin.123.part')
+    assert not is_partial_copy('/dest/wafer.part')
+    assert not is_partial_copy('/dest/.wafer.bin')
@@ -0,0 +1,30 @@
+import config
+from upload import db_info
+
+def _use_database(tmp_path, monkeypatch, url):
+    settings_file = tmp_path / 'settings.ini'
+    settings_file.write_text(f"[Database]\nurl = {url}\n", encoding='utf-8')
+    monkeypatch.setattr(config, 'CONFIG_FILE', str(settings_file))
+    db_info.dispose_db_engine()
+
+# 엔진은 한 번만 만들어 함께 사용하고, dispose 후에는 새로 만들어야 합니다.
+def test_engine_is_shared_until_disposed(tmp_path, monkeypatch):
+    _use_database(tmp_path, monkeypatch, f"sqlite:///{tmp_path / 'db.sqlite'}")
+    engine = db_info.get_db_engine()
+    try:
+        assert db_info.get_db_engine() is engine
+        assert str(engine.url).endswith('db.sqlite')
+    finally:
+        db_info.dispose_db_engine()
+    other = db_info.get_db_engine()
+    db_info.dispose_db_engine()
+    assert other is not engine
+
+# SQLite에서는 연결 풀 크기 설정 없이 엔진을 만들 수 있어야 합니다.
+def test_sqlite_engine_connects(tmp_path, monkeypatch):
+    _use_database(tmp_path, monkeypatch, 'sqlite://')
+    try:
+        with db_info.get_db_engine().connect() as connection:
+            assert connection.exec_driver_sql("SELECT 1").scalar() == 1
+    finally:
+        db_info.dispose_db_engine()
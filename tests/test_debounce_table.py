@@ -0,0 +1,43 @@
+import time
+from file_monitor.debounce_table import DebounceTable
+
+# window 안에 다시 들어온 같은 키는 중복으로 보고 걸러야 합니다.
+def test_duplicate_within_window_is_filtered():
+    table = DebounceTable()
+    assert table.should_process('a', 0.1)
+    assert not table.should_process('a', 0.1)
+    assert table.should_process('b', 0.1)
+    time.sleep(0.15)
+    assert table.should_process('a', 0.1)
+
+# mark로 기록한 키는 seen_within으로 확인할 수 있어야 합니다.
+def test_mark_and_seen_within():
+    table = DebounceTable()
+    assert not table.seen_within('a', 1)
+    table.mark('a')
+    assert table.seen_within('a', 1)
+    time.sleep(0.05)
+    assert not table.seen_within('a', 0.01)
+
+# ttl이 지난 항목은 새 항목을 기록할 때 제거되어야 합니다.
+def test_expired_entries_are_evicted():
+    table = DebounceTable(ttl=0.05)
+    table.mark('a')
+    table.mark('b')
+    time.sleep(0.1)
+    table.mark('c')
+    assert len(table) == 1
+    assert table.should_process('a', 1)
+
+# 최대 크기를 넘으면 가장 오래된 항목부터 제거해야 합니다.
+def test_max_size_evicts_oldest_entries():
+    table = DebounceTable(max_size=3)
+    for key in 'abcd':
+        table.mark(key)
+    assert len(table) == 3
+    assert not table.seen_within('a', 60)
+    # 다시 기록한 키는 가장 최근 항목이 되어 남아 있어야 합니다.
+    table.mark('b')
+    table.mark('e')
+    assert table.seen_within('b', 60)
+    assert not table.seen_within('c', 60)
@@ -0,0 +1,103 @@
+import threading
+import time
+from file_monitor.delayed_scheduler import DelayedJobScheduler
+
+def _noop(message):
+    pass
+
+def _start():
+    scheduler = DelayedJobScheduler(2, _noop)
+    scheduler.start()
+    return scheduler
+
+# 같은 키로 여러 번 등록하면 작업은 한 번만 마지막 인자로 실행되고, 합쳐진 콜백은 모두 호출되어야 합니다.
+def test_same_key_is_coalesced_into_one_job():
+    scheduler = _start()
+    calls, results = [], []
+    finished = threading.Event()
+
+    def on_done(ok):
+        results.append(ok)
+        if len(results) == 3:
+            finished.set()
+
+    for value in range(3):
+        scheduler.schedule('wafer', 0.1, calls.append, value, on_done=on_done)
+    assert finished.wait(2)
+    scheduler.shutdown()
+
+    assert calls == [2]
+    assert results == [True, True, True]
+
+# 다시 등록하면 마감 시각이 연장되어야 합니다.
+def test_rescheduling_extends_the_deadline():
+    scheduler = _start()
+    finished = threading.Event()
+    started = time.monotonic()
+    scheduler.schedule('wafer', 0.2, finished.set)
+    time.sleep(0.1)
+    scheduler.schedule('wafer', 0.2, finished.set)
+    assert finished.wait(2)
+    elapsed = time.monotonic() - started
+    scheduler.shutdown()
+
+    assert elapsed >= 0.28
+
+# 실패한 작업은 기록하고 콜백에 False를 전달해야 합니다.
+def test_failed_job_reports_failure():
+    messages, results = [], []
+    scheduler = DelayedJobScheduler(1, messages.append)
+    scheduler.start()
+    finished = threading.Event()
+
+    def fail():
+        raise OSError("pdf failed")
+
+    scheduler.schedule('wafer', 0, fail, on_done=lambda ok: (results.append(ok), finished.set()))
+    assert finished.wait(1)
+    scheduler.shutdown()
+
+    assert results == [False]
+    assert any('failed' in message for message in messages)
+
+# 종료할 때 대기 중인 작업은 실행하지 않고 콜백도 호출하지 않아야 합니다.
+def test_shutdown_cancels_pending_jobs():
+    scheduler = _start()
+    results = []
+    scheduler.schedule('wafer', 5, results.append, 'ran', on_done=results.append)
+    assert scheduler.is_pending('wafer')
+    scheduler.shutdown()
+
+    assert results == []
+    assert not scheduler.is_pending('wafer')
+
+# 다시 등록하면 마감 시각이 연장되지만 max_delay는 넘기지 않아야 합니다.
+def test_rescheduling_extends_up_to_max_delay():
+    scheduler = _start()
+    finished = threading.Event()
+    started = time.monotonic()
+    scheduler.schedule('wafer', 0.2, lambda: None, on_done=lambda ok: finished.set(), max_delay=0.5)
+    while not finished.is_set() and time.monotonic() - started < 2:
+        scheduler.schedule('wafer', 0.2, lambda: None)
+        time.sleep(0.05)
+    elapsed = time.monotonic() - started
+    scheduler.shutdown()
+
+    assert finished.is_set()
+    assert 0.45 <= elapsed < 1.0
+
+# reschedule은 대기 중인 작업의 마감 시각을 앞당길 수 있고, run_now는 바로 실행해야 합니다.
+def test_reschedule_and_run_now():
+    scheduler = _start()
+    finished = threading.Event()
+    scheduler.schedule('a', 5, lambda: None, on_done=lambda ok: finished.set())
+    assert scheduler.reschedule('a', 0.05)
+    assert finished.wait(1)
+    assert not scheduler.reschedule('a', 0.05)
+
+    finished.clear()
+    scheduler.schedule('b', 5, lambda: None, on_done=lambda ok: finished.set())
+    assert scheduler.run_now('b')
+    assert finished.wait(1)
+    assert not scheduler.run_now('b')
+    scheduler.shutdown()
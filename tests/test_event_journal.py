@@ -0,0 +1,94 @@
+import sqlite3
+import pytest
+from file_monitor.event_journal import EventJournal, JournaledQueue
+
+# 확인되지 않은 이벤트는 다시 열었을 때 기록된 순서대로 다시 큐에 들어가야 합니다.
+def test_unacked_events_are_replayed_in_order(tmp_path):
+    db_path = str(tmp_path / 'journal.db')
+    journal = EventJournal(db_path)
+    event_queue = JournaledQueue(journal)
+    event_queue.put(('created', '/src/a.txt'))
+    event_queue.put(('moved', '/src/b.txt', '/src/c.txt'))
+    event_queue.put(('deleted', '/src/d.txt'))
+    first_id, _ = event_queue.get()
+    event_queue.ack(first_id)
+    journal.close()
+
+    journal = EventJournal(db_path)
+    event_queue = JournaledQueue(journal)
+    assert event_queue.replay() == 2
+    assert [event_queue.get()[1] for _ in range(2)] == [('moved', '/src/b.txt', '/src/c.txt'), ('deleted', '/src/d.txt')]
+    journal.close()
+
+# 새 항목 ID는 다시 열어도 이전 항목과 겹치지 않아야 합니다.
+def test_entry_ids_continue_after_reopen(tmp_path):
+    db_path = str(tmp_path / 'journal.db')
+    journal = EventJournal(db_path)
+    first_id = journal.append(('created', '/src/a.txt'))
+    journal.close()
+
+    journal = EventJournal(db_path)
+    assert journal.append(('created', '/src/b.txt')) > first_id
+    journal.close()
+
+# 실패한 이벤트는 저널에 남고, max_attempts번 실패하면 다시 처리하지 않아야 합니다.
+def test_failed_events_stop_replaying_after_max_attempts(tmp_path):
+    db_path = str(tmp_path / 'journal.db')
+    journal = EventJournal(db_path)
+    entry_id = journal.append(('created', '/src/a.txt'))
+    journal.close()
+
+    for attempt in range(3):
+        journal = EventJournal(db_path)
+        event_queue = JournaledQueue(journal)
+        assert event_queue.replay(3) == 1
+        replayed_id, _ = event_queue.get()
+        assert replayed_id == entry_id
+        event_queue.fail(replayed_id)
+        journal.close()
+
+    journal = EventJournal(db_path)
+    assert journal.pending(3) == []
+    assert len(journal.pending()) == 1
+    # 다시 처리하지 않는 이벤트는 journal_failed 테이블로 옮겨 저널에 쌓이지 않아야 합니다.
+    assert journal.purge_failed(3) == 1
+    assert journal.pending() == []
+    assert journal.append(('created', '/src/b.txt')) > entry_id
+    journal.close()
+
+    connection = sqlite3.connect(db_path)
+    assert connection.execute("SELECT id, attempts FROM journal_failed").fetchall() == [(entry_id, 3)]
+    connection.close()
+
+# 항목 ID를 메모리에서 발급하므로, 같은 저널 파일을 두 인스턴스가 동시에 열 수 없어야 합니다.
+def test_journal_file_is_locked_while_open(tmp_path):
+    db_path = str(tmp_path / 'journal.db')
+    journal = EventJournal(db_path)
+    journal.append(('created', '/src/a.txt'))
+    with pytest.raises(sqlite3.OperationalError):
+        EventJournal(db_path, timeout=0.1)
+    journal.close()
+
+    journal = EventJournal(db_path)
+    assert len(journal.pending()) == 1
+    journal.close()
+
+# 실패 횟수 열이 없는 이전 저널 파일도 열 수 있어야 합니다.
+def test_old_journal_without_attempts_column(tmp_path):
+    db_path = str(tmp_path / 'journal.db')
+    connection = sqlite3.connect(db_path)
+    connection.execute("CREATE TABLE journal (id INTEGER PRIMARY KEY, event TEXT NOT NULL, created REAL NOT NULL)")
+    connection.execute("INSERT INTO journal VALUES (1, '[\"created\", \"/src/a.txt\"]', 0)")
+    connection.commit()
+    connection.close()
+
+    journal = EventJournal(db_path)
+    assert journal.pending(3) == [(1, ('created', '/src/a.txt'))]
+    journal.close()
+
+# 저널이 없는 큐는 항목 ID 없이 이벤트를 전달해야 합니다.
+def test_queue_without_journal():
+    event_queue = JournaledQueue()
+    event_queue.put(('created', '/src/a.txt'))
+    assert event_queue.get() == (None, ('created', '/src/a.txt'))
+    assert event_queue.replay() == 0
@@ -0,0 +1,91 @@
+import random
+import threading
+import time
+from file_monitor.event_worker_pool import EventWorkerPool
+
+def _noop(message):
+    pass
+
+# 같은 원본 경로의 이벤트는 워커 수와 관계없이 넣은 순서대로 처리되어야 합니다.
+def test_events_for_the_same_path_keep_their_order():
+    processed = {}
+    lock = threading.Lock()
+
+    def handle_event(event, ack):
+        time.sleep(random.uniform(0, 0.002))
+        with lock:
+            processed.setdefault(event[1], []).append(event[2])
+
+    pool = EventWorkerPool(4, handle_event, _noop)
+    pool.start()
+    paths = [f"/src/file_{index}.txt" for index in range(10)]
+    for sequence in range(30):
+        for path in paths:
+            pool.submit(('modified', path, sequence))
+    pool.shutdown()
+
+    assert sorted(processed) == paths
+    for path in paths:
+        assert processed[path] == list(range(30))
+
+# 이벤트를 여러 워커에 나누어 처리해야 합니다.
+def test_events_are_spread_over_workers():
+    threads = set()
+
+    def handle_event(event, ack):
+        threads.add(threading.current_thread().name)
+
+    pool = EventWorkerPool(4, handle_event, _noop)
+    pool.start()
+    for index in range(100):
+        pool.submit(('created', f"/src/file_{index}.txt"))
+    pool.shutdown()
+
+    assert len(threads) > 1
+
+# 처리 중 예외가 발생해도 워커는 멈추지 않고 다음 이벤트를 처리해야 하며, 실패한 이벤트는 on_failed로 알려야 합니다.
+def test_worker_survives_a_failing_event():
+    processed = []
+    messages = []
+    done = []
+    failed = []
+
+    def handle_event(event, ack):
+        if event[0] == 'fail':
+            raise OSError("copy failed")
+        processed.append(event[1])
+
+    pool = EventWorkerPool(1, handle_event, messages.append, on_done=done.append, on_failed=failed.append)
+    pool.start()
+    pool.submit(('fail', '/src/a.txt'), 1)
+    pool.submit(('created', '/src/b.txt'), 2)
+    pool.shutdown()
+
+    assert processed == ['/src/b.txt']
+    assert done == [2]
+    assert failed == [1]
+    assert any('failed to process' in message for message in messages)
+
+# handle_event가 False를 반환하면 워커는 완료 처리하지 않고, 넘겨받은 작업이 성공 여부와 함께 ack를 호출해야 합니다.
+def test_deferred_event_is_acked_by_its_owner():
+    done = []
+    deferred = []
+
+    def handle_event(event, ack):
+        if event[0] == 'defer':
+            deferred.append(ack)
+            return False
+
+    failed = []
+    pool = EventWorkerPool(1, handle_event, _noop, on_done=done.append, on_failed=failed.append)
+    pool.start()
+    pool.submit(('defer', '/src/a.txt'), 1)
+    pool.submit(('defer', '/src/b.txt'), 2)
+    pool.submit(('created', '/src/c.txt'), 3)
+    pool.shutdown()
+
+    assert done == [3]
+    deferred[0]()
+    deferred[1](False)
+    assert done == [3, 1]
+    assert failed == [2]
@@ -0,0 +1,64 @@
+import codecs
+from file_monitor import event_processor
+from file_monitor.event_processor import read_header_datetime, HEADER_CHUNK_SIZE
+
+HEADER = "Date and Time:   08/25/2023 01:23:45 PM"
+
+def _write(tmp_path, data):
+    path = tmp_path / 'base_date.txt'
+    path.write_bytes(data)
+    return str(path)
+
+# cp949로 저장된 한글 헤더에서도 값을 찾아야 합니다.
+def test_cp949_header(tmp_path):
+    text = f"장비명: 측정기\n{HEADER}\nPoint#,X,Y\n"
+    assert read_header_datetime(_write(tmp_path, text.encode('cp949'))) == "08/25/2023 01:23:45 PM"
+
+# UTF-16 BOM이 있으면 UTF-16으로 읽어야 합니다.
+def test_utf16_header(tmp_path):
+    for encoding, bom in (('utf-16-le', codecs.BOM_UTF16_LE), ('utf-16-be', codecs.BOM_UTF16_BE)):
+        data = bom + f"Lot: 한글\r\n{HEADER}\r\n".encode(encoding)
+        assert read_header_datetime(_write(tmp_path, data)) == "08/25/2023 01:23:45 PM", encoding
+
+# 값이 청크 경계에 걸쳐 있어도 찾아야 합니다.
+def test_header_split_across_chunks(tmp_path):
+    prefix = b"x" * (HEADER_CHUNK_SIZE - 10) + b"\n"
+    data = prefix + HEADER.encode('ascii') + b"\n"
+    assert read_header_datetime(_write(tmp_path, data)) == "08/25/2023 01:23:45 PM"
+
+# 측정 표('Point#')가 시작된 뒤의 값은 헤더가 아니므로 찾지 않고, 그 뒤의 내용은 읽지 않아야 합니다.
+def test_stops_at_table_marker(tmp_path, monkeypatch):
+    data = b"Lot: A\nPoint#,X,Y\n" + HEADER.encode('ascii') + b"\n" + b"1,2,3\n" * 10000
+    reads = []
+    real_open = open
+
+    class _CountingFile:
+        def __init__(self, file):
+            self.file = file
+
+        def read(self, size):
+            reads.append(size)
+            return self.file.read(size)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self.file.close()
+
+    monkeypatch.setattr(event_processor, 'open', lambda path, mode: _CountingFile(real_open(path, mode)), raising=False)
+    assert read_header_datetime(_write(tmp_path, data)) is None
+    assert len(reads) == 1
+
+# 헤더가 없으면 max_bytes까지만 읽고 None을 반환해야 합니다.
+def test_missing_header(tmp_path):
+    assert read_header_datetime(_write(tmp_path, b"Lot: A\n" * 20000)) is None
+    assert read_header_datetime(_write(tmp_path, b"")) is None
+    data = b"x" * (HEADER_CHUNK_SIZE * 2) + HEADER.encode('ascii')
+    assert read_header_datetime(_write(tmp_path, data), max_bytes=HEADER_CHUNK_SIZE) is None
+
+# UTF-16 파일에서도 값이 청크 경계에 걸쳐 있으면 찾아야 합니다.
+def test_utf16_header_split_across_chunks(tmp_path):
+    prefix = "x" * (HEADER_CHUNK_SIZE // 2 - 10) + "\n"
+    data = codecs.BOM_UTF16_LE + (prefix + HEADER + "\n").encode('utf-16-le')
+    assert read_header_datetime(_write(tmp_path, data)) == "08/25/2023 01:23:45 PM"
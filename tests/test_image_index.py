@@ -0,0 +1,46 @@
+from file_monitor.image_index import ImageIndex, natural_key
+
+def _noop(message):
+    pass
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b'')
+    return str(path)
+
+# 처음 조회할 때 폴더의 기존 파일을 색인하고, 날짜 문자열로 찾은 결과를 자연 정렬 순서로 반환해야 합니다.
+def test_find_by_datetime_token(tmp_path):
+    for number in (10, 2, 1):
+        _touch(tmp_path / 'lot' / f"20240101_120000_WF_{number}.jpg")
+    _touch(tmp_path / '20240101_130000_WF_1.jpg')
+    index = ImageIndex(str(tmp_path), _noop)
+
+    found = index.find('20240101', '120000')
+    assert [path.rsplit('_', 1)[1] for path in found] == ['1.jpg', '2.jpg', '10.jpg']
+
+# 날짜 문자열이 아닌 키는 색인 전체에서 찾아야 합니다.
+def test_find_without_datetime_token(tmp_path):
+    _touch(tmp_path / 'LOT1_W01_a.jpg')
+    _touch(tmp_path / '20240101_120000_LOT1_W01.jpg')
+    _touch(tmp_path / 'LOT2_W01_a.jpg')
+    index = ImageIndex(str(tmp_path), _noop)
+    assert len(index.find('LOT1', 'W01')) == 2
+
+# 추가, 제거, 이동한 파일이 조회 결과에 반영되어야 하며, 폴더 밖의 파일은 색인하지 않아야 합니다.
+def test_add_discard_and_move(tmp_path):
+    index = ImageIndex(str(tmp_path), _noop)
+    assert index.find('20240101', '120000') == []
+
+    first = _touch(tmp_path / '20240101_120000_#1.jpg')
+    assert index.add(first) == ['20240101_120000']
+    assert index.add(str(tmp_path.parent / '20240101_120000_x.jpg')) == []
+    second = _touch(tmp_path / '20240101_120000_2.jpg')
+    index.add(second)
+    index.discard(second)
+    moved = str(tmp_path / '20240101_120000_W07.jpg')
+    index.move(first, moved)
+
+    assert index.find('20240101', '120000') == [moved]
+
+def test_natural_key():
+    assert sorted(['a_10.jpg', 'a_2.jpg', 'A_1.jpg'], key=natural_key) == ['A_1.jpg', 'a_2.jpg', 'a_10.jpg']
@@ -0,0 +1,78 @@
+import os
+import shutil
+import time
+import pytest
+from watchdog.events import FileCreatedEvent
+import config
+from upload.processed_ledger import ProcessedLedger
+from upload.wafer_flat_data import WaferFlatHandler
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'wafer_flat.dat')
+
+class _RecordingQueue:
+    def __init__(self):
+        self.items = []
+
+    def submit(self, table, df):
+        self.items.append((table, df))
+
+@pytest.fixture(autouse=True)
+def inline_jobs(tmp_path, monkeypatch):
+    # 프로세스 풀을 만들지 않고 호출한 스레드에서 파일을 분석합니다.
+    settings_file = tmp_path / 'settings.ini'
+    settings_file.write_text("[Performance]\nprocess_workers = 0\n", encoding='utf-8')
+    monkeypatch.setattr(config, 'CONFIG_FILE', str(settings_file))
+
+def _handler(tmp_path, messages, delete_after_upload=False):
+    ledger = ProcessedLedger(str(tmp_path / 'ledger.log'), stable_interval=0.01, stable_checks=1, stable_timeout=1)
+    return WaferFlatHandler(str(tmp_path), 'EQP01', messages.append, upload_queue=_RecordingQueue(), ledger=ledger,
+                            delete_after_upload=delete_after_upload)
+
+def _copy_fixture(tmp_path, name='wafer.dat', extra=''):
+    path = tmp_path / name
+    shutil.copyfile(FIXTURE, path)
+    if extra:
+        with open(path, 'ab') as file:
+            file.write(extra.encode('cp949'))
+    old = time.time() - 60
+    os.utime(path, (old, old))
+    return str(path)
+
+# 필수 값이 없어 제거된 행은 핸들러의 로그로 기록해야 합니다.
+def test_dropped_rows_are_logged(tmp_path):
+    messages = []
+    handler = _handler(tmp_path, messages)
+    path = _copy_fixture(tmp_path, extra="x, 0.03, 103.5, 0.96, 0.0, 0.0, 2, 4, 1.0, d\n")
+    handler.process_file(path)
+    handler.stop()
+
+    (table, df), = handler.upload_queue.items
+    assert table == 'wf'
+    assert len(df) == 3
+    assert any('Dropped 1 rows' in message for message in messages)
+
+# 생성 이벤트가 들어온 파일은 워커에서 한 번만 처리하고, 처리한 것으로 기록해야 합니다.
+def test_created_file_is_processed_once(tmp_path):
+    messages = []
+    handler = _handler(tmp_path, messages)
+    path = _copy_fixture(tmp_path)
+    stat = os.stat(path)
+    handler.on_created(FileCreatedEvent(path))
+    handler.on_created(FileCreatedEvent(str(tmp_path / '.wafer.dat.1.part')))
+    handler.stop()
+
+    assert len(handler.upload_queue.items) == 1
+    assert os.path.exists(path)  # delete_after_upload를 켜지 않으면 원본 파일을 남겨 둡니다.
+    assert handler.ledger.entries[os.path.normpath(path)] == (stat.st_size, stat.st_mtime_ns)
+
+# delete_after_upload를 켜면 업로드 큐에 넣은 원본 파일을 삭제해야 합니다.
+def test_delete_after_upload_is_opt_in(tmp_path):
+    messages = []
+    handler = _handler(tmp_path, messages, delete_after_upload=True)
+    path = _copy_fixture(tmp_path)
+    handler.process_file(path)
+    handler.stop()
+
+    assert len(handler.upload_queue.items) == 1
+    assert not os.path.exists(path)
+    assert any('Deleted uploaded file' in message for message in messages)
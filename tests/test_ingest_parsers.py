@@ -0,0 +1,48 @@
+import os
+import pandas as pd
+from upload.prealign_data import PreAlignParser
+from upload.image_data import ImageDataParser
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+# PreAlign 파일은 헤더 값과 측정 표를 함께 읽어야 합니다.
+def test_prealign_parser():
+    parser = PreAlignParser()
+    path = os.path.join(FIXTURES, 'PreAlign_LOT123_W07.dat')
+    assert parser.accepts(path)
+    assert not parser.accepts(os.path.join(FIXTURES, 'image_data.csv'))
+
+    df = parser.parse(path, 'EQP01')
+    assert df['Point'].tolist() == [1, 2]
+    assert (df['LotID'] == 'LOT123').all()
+    assert (df['WaferID'] == 7).all()
+    assert (df['Recipe'] == 'PA_RCP').all()
+    assert (df['EqpId'] == 'EQP01').all()
+    assert df['DateTime'][0] == pd.Timestamp('2023-08-25 13:23:45')
+    # 열 정의에 없는 측정 표의 열은 정리한 이름과 추론한 형식으로 가져옵니다. (테이블에 없는 열은 업로드할 때 건너뜁니다.)
+    assert df['NotchAngle'].tolist() == [0.12, 0.15]
+    assert df['OffsetY'].tolist() == [-2.0, -1.8]
+
+# 머리글보다 값이 많거나 적은 줄도 읽고, 스키마에 정의된 열은 정해진 형식으로 바꿔야 합니다.
+def test_rows_with_extra_fields_and_dtypes(tmp_path):
+    path = tmp_path / 'PreAlign_LOT1_W01.dat'
+    path.write_text(
+        "Lot ID: LOT1\nWafer ID: LOT1-W01\nDate and Time: 08/25/2023 01:23:45 PM\nRecipe Name: R\n"
+        "Point,Notch Angle (deg),Offset X (um)\n1, 0.1, 2.0,\n2, 0.2, 3.0, 99, 100\n3, 0.3\n",
+        encoding='cp949')
+    df = PreAlignParser().parse(str(path), 'EQP01')
+    assert df['Point'].tolist() == [1, 2, 3]
+    assert df['OffsetX'].tolist()[:2] == [2.0, 3.0] and pd.isna(df['OffsetX'].tolist()[2])
+    assert str(df['Point'].dtype) == 'Int32'
+    assert str(df['WaferID'].dtype) == 'Int32'
+    assert str(df['NotchAngle'].dtype) == 'float64'
+    assert str(df['DateTime'].dtype).startswith('datetime64')
+
+# 이미지 정보 파일은 다이 위치와 이미지 파일 이름을 읽어야 합니다.
+def test_image_data_parser():
+    df = ImageDataParser().parse(os.path.join(FIXTURES, 'image_data.csv'), 'EQP01')
+    assert df['DieRow'].tolist() == [1, 3]
+    assert df['DieCol'].tolist() == [2, 4]
+    assert df['ImageFile'].tolist() == ['20230825_132345_die_1_2.jpg', '20230825_132345_die_3_4.jpg']
+    assert (df['WaferID'] == 7).all()
+    assert df['DefectSize'].tolist()[0] == 0.5 and pd.isna(df['DefectSize'].tolist()[1])
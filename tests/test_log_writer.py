@@ -0,0 +1,86 @@
+import log_writer
+from log_writer import LogWriter
+
+def _log_files(tmp_path, kind):
+    return sorted(path.name for path in tmp_path.glob(f"*_{kind}*.log"))
+
+# 모아 둔 줄은 flush_lines개마다 한 번의 파일 쓰기로 기록되어야 합니다.
+def test_lines_are_written_in_batches(tmp_path, monkeypatch):
+    writer = LogWriter(str(tmp_path), flush_lines=5, flush_interval=60)
+    batches = []
+    original_append = writer._append
+    monkeypatch.setattr(writer, '_append', lambda file_path, lines: (batches.append(len(lines)), original_append(file_path, lines)))
+    writer.start()
+    for index in range(12):
+        writer.write('event', f"line {index}\n")
+    writer.close()
+
+    assert batches == [5, 5, 2]
+    (log_file,) = tmp_path.glob('*_event.log')
+    assert log_file.read_text(encoding='utf-8') == ''.join(f"line {index}\n" for index in range(12))
+
+# 로그 종류마다 다른 파일에 기록해야 합니다.
+def test_kinds_go_to_separate_files(tmp_path):
+    writer = LogWriter(str(tmp_path)).start()
+    writer.write('event', "event line\n")
+    writer.write('debug', "debug line\n")
+    writer.close()
+
+    assert len(_log_files(tmp_path, 'event')) == 1
+    assert len(_log_files(tmp_path, 'debug')) == 1
+
+# 파일 크기가 최대 크기를 넘으면 기존 파일을 번호를 붙여 회전하고 새 파일에 이어서 기록해야 합니다.
+def test_large_log_is_rotated(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_writer, 'MAX_LOG_FILE_SIZE', 20)
+    writer = LogWriter(str(tmp_path), flush_lines=100).start()
+    for index in range(5):
+        writer.write('event', f"line {index:04d}\n")  # 한 줄은 10바이트입니다.
+    writer.close()
+
+    names = _log_files(tmp_path, 'event')
+    assert len(names) == 3
+    contents = ''.join((tmp_path / name).read_text(encoding='utf-8') for name in names)
+    assert sorted(contents.splitlines()) == [f"line {index:04d}" for index in range(5)]
+
+# close 이후에 들어온 로그는 버리지 않고 호출한 스레드에서 바로 기록해야 합니다.
+def test_writes_after_close_are_synchronous(tmp_path):
+    writer = LogWriter(str(tmp_path)).start()
+    writer.write('debug', "before close\n")
+    writer.close()
+    writer.write('debug', "after close\n")
+
+    (log_file,) = tmp_path.glob('*_debug.log')
+    assert log_file.read_text(encoding='utf-8') == "before close\nafter close\n"
+
+# 스레드를 시작하지 않았어도 close할 때 큐에 남은 로그를 기록해야 합니다.
+def test_close_without_thread_flushes_queue(tmp_path):
+    writer = LogWriter(str(tmp_path))
+    writer.write('event', "queued\n")
+    writer.close()
+
+    (log_file,) = tmp_path.glob('*_event.log')
+    assert log_file.read_text(encoding='utf-8') == "queued\n"
+
+# 파일 쓰기가 한 번 실패하면 다시 시도하고, 계속 실패하면 표준 오류로 내보내야 합니다.
+def test_failed_write_is_retried_then_sent_to_stderr(tmp_path, monkeypatch, capsys):
+    writer = LogWriter(str(tmp_path))
+    original_append = writer._append
+    failures = {'remaining': 1}
+
+    def flaky_append(file_path, lines):
+        if failures['remaining']:
+            failures['remaining'] -= 1
+            raise PermissionError("locked")
+        original_append(file_path, lines)
+
+    monkeypatch.setattr(writer, '_append', flaky_append)
+    writer._flush({'event': ["retried\n"]})
+    (log_file,) = tmp_path.glob('*_event.log')
+    assert log_file.read_text(encoding='utf-8') == "retried\n"
+
+    failures['remaining'] = 2
+    writer._flush({'event': ["lost\n"]})
+    assert log_file.read_text(encoding='utf-8') == "retried\n"
+    captured = capsys.readouterr()
+    assert "Failed to write 1 event log lines" in captured.err
+    assert "lost\n" in captured.err
@@ -0,0 +1,154 @@
+import io
+import re
+import pytest
+import config
+from PIL import Image
+from pypdf import PdfReader
+from file_monitor.pdf_writer import read_jpeg_header, prepare_image, write_images_pdf, PdfProfile, load_pdf_profile
+
+def _jpeg(mode='RGB', size=(40, 30), **options):
+    buffer = io.BytesIO()
+    Image.new(mode, size).save(buffer, 'JPEG', **options)
+    return buffer.getvalue()
+
+def _save(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+# SOF 마커를 다른 마커로 바꾸거나 정밀도를 바꾼 JPEG를 만듭니다.
+def _patch_sof(data, marker=None, precision=None):
+    index = data.index(b'\xff\xc0')
+    data = bytearray(data)
+    if marker is not None:
+        data[index + 1] = marker
+    if precision is not None:
+        data[index + 4] = precision
+    return bytes(data)
+
+def test_read_jpeg_header():
+    assert read_jpeg_header(_jpeg('RGB', (40, 30))) == (40, 30, 3, False)
+    assert read_jpeg_header(_jpeg('L', (7, 9))) == (7, 9, 1, False)
+    assert read_jpeg_header(b'not a jpeg') is None
+
+# PDF 뷰어가 지원하지 않을 수 있는 프로그레시브, 산술 부호화, 12비트 JPEG는 그대로 넣지 않아야 합니다.
+def test_unsupported_jpegs_are_rejected():
+    data = _jpeg()
+    assert read_jpeg_header(_patch_sof(data, marker=0xC2)) is None
+    assert read_jpeg_header(_patch_sof(data, marker=0xC9)) is None
+    assert read_jpeg_header(_patch_sof(data, marker=0xC3)) is None
+    assert read_jpeg_header(_patch_sof(data, precision=12)) is None
+
+# 프로그레시브 JPEG는 PIL로 디코딩해 Flate로 넣어야 합니다.
+def test_progressive_jpeg_uses_pil(tmp_path):
+    image = prepare_image(_save(tmp_path, 'progressive.jpg', _jpeg('RGB', (40, 30), progressive=True)))
+    assert (image.width, image.height, image.filter_name) == (40, 30, '/FlateDecode')
+
+# 크기 정보 전에 끝나는 JPEG는 None을 반환해야 합니다.
+def test_truncated_jpeg_before_frame_header():
+    data = _jpeg()
+    index = data.index(b'\xff\xc0')
+    for end in (2, 3, index, index + 1):
+        assert read_jpeg_header(data[:end]) is None, end
+
+# SOF 세그먼트의 크기 정보가 잘린 JPEG도 예외 없이 None을 반환해야 합니다.
+def test_truncated_frame_header():
+    data = _jpeg()
+    index = data.index(b'\xff\xc0')
+    for end in range(index + 2, index + 10):
+        assert read_jpeg_header(data[:end]) is None, end
+    assert read_jpeg_header(b'\xff\xd8\xff\xc0\x00\x11') is None
+    assert read_jpeg_header(data[:index + 10]) == (40, 30, 3, False)
+
+# Adobe가 만든 CMYK JPEG는 색상 값을 뒤집는 Decode 배열을 지정해야 합니다.
+def test_adobe_cmyk_jpeg_uses_decode(tmp_path):
+    image = prepare_image(_save(tmp_path, 'cmyk.jpg', _jpeg('CMYK')))
+    assert image.color_space == '/DeviceCMYK'
+    assert image.decode == '[1 0 1 0 1 0 1 0]'
+    assert image.filter_name == '/DCTDecode'
+
+# JPEG가 아닌 이미지는 PIL로 읽어 Flate로 압축해야 합니다.
+def test_non_jpeg_uses_pil(tmp_path):
+    path = tmp_path / 'image.png'
+    Image.new('RGBA', (5, 6)).save(path)
+    image = prepare_image(str(path))
+    assert (image.width, image.height, image.color_space, image.filter_name) == (5, 6, '/DeviceRGB', '/FlateDecode')
+
+# 여러 장의 이미지를 순서대로 한 페이지씩 쓰고, 상호 참조 표의 위치가 각 객체의 시작을 가리켜야 합니다.
+def test_pdf_pages_and_xref(tmp_path):
+    sizes = [(40, 30), (20, 50), (60, 10)]
+    paths = [_save(tmp_path, f"{index}.jpg", _jpeg('RGB', size)) for index, size in enumerate(sizes)]
+    paths.append(_save(tmp_path, 'cmyk.jpg', _jpeg('CMYK', (8, 8))))
+    pdf_path = str(tmp_path / 'out.pdf')
+
+    assert write_images_pdf(paths, pdf_path, workers=2, window=2) == pdf_path
+    assert not (tmp_path / 'out.pdf.tmp').exists()
+
+    data = open(pdf_path, 'rb').read()
+    xref_offset = int(re.search(rb'startxref\n(\d+)\n%%EOF\n$', data).group(1))
+    assert data[xref_offset:].startswith(b'xref\n')
+    entries = re.findall(rb'(\d{10}) 00000 n \n', data[xref_offset:])
+    for object_id, offset in enumerate(entries, start=1):
+        assert data[int(offset):].startswith(f"{object_id} 0 obj\n".encode('ascii')), object_id
+
+    reader = PdfReader(pdf_path, strict=True)
+    assert [(int(page.mediabox.width), int(page.mediabox.height)) for page in reader.pages] == sizes + [(8, 8)]
+    image = reader.pages[3]['/Resources']['/XObject']['/Im0']
+    assert image['/Decode'] == [1, 0, 1, 0, 1, 0, 1, 0]
+
+# 이미지를 준비하다 실패하면 임시 파일을 지우고 PDF를 만들지 않아야 합니다.
+def test_failure_removes_temp_file(tmp_path):
+    paths = [_save(tmp_path, '0.jpg', _jpeg()), str(tmp_path / 'missing.jpg')]
+    pdf_path = tmp_path / 'out.pdf'
+    with pytest.raises(OSError):
+        write_images_pdf(paths, str(pdf_path))
+    assert not pdf_path.exists()
+    assert not (tmp_path / 'out.pdf.tmp').exists()
+
+# downscale은 큰 이미지만 줄이고 페이지 크기는 원본 크기로 유지해야 합니다.
+def test_downscale_profile(tmp_path):
+    profile = PdfProfile('downscale', max_edge=100, quality=60)
+    large = profile.prepare(_save(tmp_path, 'large.jpg', _jpeg('RGB', (400, 200))))
+    assert (large.width, large.height) == (100, 50)
+    assert (large.page_width, large.page_height) == (400, 200)
+
+    small_data = _jpeg('RGB', (80, 40))
+    small = profile.prepare(_save(tmp_path, 'small.jpg', small_data))
+    assert small.data == small_data  # 충분히 작은 JPEG는 그대로 넣습니다.
+
+# recompress는 크기를 유지한 채 다시 압축하고, passthrough는 원본을 그대로 넣어야 합니다.
+def test_recompress_and_passthrough_profiles(tmp_path):
+    data = _jpeg('L', (60, 30), quality=95)
+    path = _save(tmp_path, 'gray.jpg', data)
+    recompressed = PdfProfile('recompress', quality=10).prepare(path)
+    assert (recompressed.width, recompressed.height, recompressed.color_space) == (60, 30, '/DeviceGray')
+    assert recompressed.data != data
+    assert PdfProfile('passthrough').prepare(path).data == data
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError):
+        PdfProfile('lossless')
+
+# [PdfProfile] 섹션의 설정으로 프로필을 만들어야 합니다.
+def test_load_pdf_profile(tmp_path, monkeypatch):
+    settings_file = tmp_path / 'settings.ini'
+    settings_file.write_text("[PdfProfile]\nprofile = downscale\nmax_edge = 800\nquality = 200\n", encoding='utf-8')
+    monkeypatch.setattr(config, 'CONFIG_FILE', str(settings_file))
+    profile = load_pdf_profile()
+    assert (profile.name, profile.max_edge, profile.quality) == ('downscale', 800, 95)
+
+# 저장 폴더별 프로필이 있으면 그 값을, 없으면 [PdfProfile] 섹션의 값을 사용해야 합니다.
+def test_profile_per_save_folder(tmp_path, monkeypatch):
+    settings_file = tmp_path / 'settings.ini'
+    settings_file.write_text("[PdfProfile]\nprofile = recompress\nquality = 50\n", encoding='utf-8')
+    monkeypatch.setattr(config, 'CONFIG_FILE', str(settings_file))
+    folder = str(tmp_path / 'pdf_a')
+    config.save_pdf_profile_settings(folder, {'profile': 'downscale', 'max_edge': 640})
+
+    profile = load_pdf_profile(folder)
+    assert (profile.name, profile.max_edge, profile.quality) == ('downscale', 640, 50)
+    other = load_pdf_profile(str(tmp_path / 'pdf_b'))
+    assert (other.name, other.quality) == ('recompress', 50)
+    assert load_pdf_profile().name == 'recompress'
+    # 다른 섹션은 저장할 때 그대로 유지되어야 합니다.
+    assert '[PdfProfile]' in settings_file.read_text(encoding='utf-8')
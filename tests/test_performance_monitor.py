@@ -0,0 +1,43 @@
+import time
+from performance_monitor import PerformanceMonitor
+
+# 샘플러를 시작하면 바로 첫 샘플을 만들고, 이후 sample_interval마다 샘플을 추가해야 합니다.
+def test_sampler_collects_samples_until_stopped(tmp_path):
+    monitor = PerformanceMonitor(str(tmp_path), sample_interval=0.02, history_size=5)
+    assert monitor.latest() == (None, None)
+    monitor.start()
+    try:
+        cpu_usage, memory_usage = monitor.latest()
+        assert cpu_usage is not None and memory_usage is not None
+        time.sleep(0.3)
+    finally:
+        monitor.stop()
+    # 보관하는 샘플 수는 history_size를 넘지 않아야 합니다.
+    assert len(monitor.samples) == 5
+    count = len(monitor.samples)
+    time.sleep(0.1)
+    assert len(monitor.samples) == count
+    assert monitor._sampler_thread is None
+
+class _RecordingWriter:
+    def __init__(self):
+        self.lines = []
+
+    def write(self, kind, line):
+        self.lines.append((kind, line))
+
+# 샘플이 없으면 기록하지 않고, 샘플이 있으면 최신 값을 성능 로그에 넘겨야 합니다.
+def test_log_performance_uses_latest_sample(tmp_path):
+    writer = _RecordingWriter()
+    monitor = PerformanceMonitor(str(tmp_path), sample_interval=60, writer=writer)
+    monitor.log_performance()
+    assert writer.lines == []
+
+    monitor.start()
+    monitor.stop()
+    monitor.log_performance()
+    cpu_usage, memory_usage = monitor.latest()
+    assert len(writer.lines) == 1
+    kind, line = writer.lines[0]
+    assert kind == 'performance'
+    assert f"CPU Usage: {cpu_usage}%, Memory Usage: {memory_usage}%" in line
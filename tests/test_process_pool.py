@@ -0,0 +1,82 @@
+import io
+import os
+import pickle
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from PIL import Image
+import config
+import process_pool
+from process_pool import run_cpu_job, shutdown_process_pool
+from file_monitor.pdf_writer import PdfProfile, write_images_pdf, prepare_image
+
+@pytest.fixture
+def workers(tmp_path, monkeypatch):
+    # 설정 파일의 process_workers 값을 바꾸고, 테스트가 끝나면 풀을 종료해 다른 테스트에 영향을 주지 않도록 합니다.
+    def use(count):
+        settings_file = tmp_path / 'settings.ini'
+        settings_file.write_text(f"[Performance]\nprocess_workers = {count}\n", encoding='utf-8')
+        monkeypatch.setattr(config, 'CONFIG_FILE', str(settings_file))
+    monkeypatch.setattr(process_pool, '_pool', None)
+    monkeypatch.setattr(process_pool, '_disabled', False)
+    monkeypatch.setattr(process_pool, '_closed', False)
+    yield use
+    shutdown_process_pool()
+
+def _fail(message):
+    raise ValueError(message)
+
+def _crash():
+    os._exit(1)
+
+# 작업은 다른 프로세스에서 실행되고, 결과와 예외는 호출한 쪽으로 전달되어야 합니다.
+def test_job_runs_in_another_process(workers):
+    workers(1)
+    assert run_cpu_job(os.getpid) != os.getpid()
+    with pytest.raises(ValueError, match='bad file'):
+        run_cpu_job(_fail, 'bad file')
+
+# process_workers가 0이면 호출한 스레드에서 바로 실행해야 합니다.
+def test_zero_workers_run_inline(workers):
+    workers(0)
+    assert run_cpu_job(os.getpid) == os.getpid()
+    assert process_pool.get_process_pool() is None
+
+# 풀을 닫은 뒤에 도착한 작업은 풀을 다시 만들지 않고 RuntimeError를 발생시켜야 합니다.
+def test_jobs_after_shutdown_raise(workers):
+    workers(1)
+    assert run_cpu_job(os.getpid) != os.getpid()
+    shutdown_process_pool()
+    with pytest.raises(RuntimeError):
+        run_cpu_job(os.getpid)
+    assert process_pool._pool is None
+
+# 작업 프로세스가 비정상 종료되면 BrokenProcessPool을 전달하고, 다음 작업에서 풀을 새로 만들어야 합니다.
+def test_broken_pool_is_replaced(workers):
+    workers(1)
+    with pytest.raises(BrokenProcessPool):
+        run_cpu_job(_crash)
+    assert process_pool._pool is None
+    assert run_cpu_job(os.getpid) != os.getpid()
+
+# PDF 변환 작업의 함수와 인자는 pickle로 전달할 수 있어야 합니다.
+def test_pdf_job_arguments_are_picklable(tmp_path):
+    profile = PdfProfile('downscale', 100, 60)
+    prepare = pickle.loads(pickle.dumps(profile.prepare))
+    assert (prepare.__self__.name, prepare.__self__.max_edge) == ('downscale', 100)
+    for value in (write_images_pdf, prepare_image, [str(tmp_path / 'a.jpg')], str(tmp_path / 'a.pdf')):
+        pickle.dumps(value)
+
+# 프로세스 풀에서 PDF를 만들 수 있어야 합니다.
+def test_pdf_is_written_in_the_pool(tmp_path, workers):
+    workers(1)
+    paths = []
+    for index in range(2):
+        buffer = io.BytesIO()
+        Image.new('RGB', (30, 20)).save(buffer, 'JPEG')
+        path = tmp_path / f"{index}.jpg"
+        path.write_bytes(buffer.getvalue())
+        paths.append(str(path))
+    pdf_path = str(tmp_path / 'out.pdf')
+
+    assert run_cpu_job(write_images_pdf, paths, pdf_path, prepare=PdfProfile('recompress').prepare) == pdf_path
+    assert open(pdf_path, 'rb').read().startswith(b'%PDF-1.4')
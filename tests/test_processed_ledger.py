@@ -0,0 +1,66 @@
+import os
+import time
+from upload.processed_ledger import ProcessedLedger
+
+def _ledger(tmp_path, max_entries=10000):
+    return ProcessedLedger(str(tmp_path / 'ledger.log'), max_entries, stable_interval=0.01, stable_checks=1, stable_timeout=1)
+
+def _write(tmp_path, name, data=b'data'):
+    path = tmp_path / name
+    path.write_bytes(data)
+    old = time.time() - 60
+    os.utime(path, (old, old))
+    return str(path)
+
+# 처리한 파일은 다시 claim하지 않고, 크기나 수정 시각이 바뀌면 새 파일로 보아야 합니다.
+def test_marked_file_is_not_claimed_again(tmp_path):
+    ledger = _ledger(tmp_path)
+    path = _write(tmp_path, 'a.dat')
+    stat = ledger.claim(path)
+    assert stat is not None
+    ledger.mark(path, stat)
+    assert ledger.claim(path) is None
+
+    _write(tmp_path, 'a.dat', b'changed data')
+    assert ledger.claim(path) is not None
+
+# 처리 기록은 다시 열어도 유지되어야 합니다.
+def test_entries_persist_across_instances(tmp_path):
+    path = _write(tmp_path, 'a.dat')
+    ledger = _ledger(tmp_path)
+    ledger.mark(path, ledger.claim(path))
+
+    assert _ledger(tmp_path).claim(path) is None
+
+# 없는 파일은 claim하지 않아야 합니다.
+def test_missing_file_is_not_claimed(tmp_path):
+    assert _ledger(tmp_path).claim(str(tmp_path / 'missing.dat')) is None
+
+# 최근 max_entries개만 보관하고, 기록 파일은 줄 수가 많아지면 보관 중인 항목만 남도록 다시 써야 합니다.
+def test_ledger_is_bounded_and_compacted(tmp_path):
+    ledger = _ledger(tmp_path, max_entries=2)
+    paths = [_write(tmp_path, f"{index}.dat") for index in range(6)]
+    for path in paths:
+        ledger.mark(path, os.stat(path))
+
+    assert len(ledger.entries) == 2
+    assert len((tmp_path / 'ledger.log').read_text(encoding='utf-8').splitlines()) <= 4
+    reopened = _ledger(tmp_path, max_entries=2)
+    assert reopened.claim(paths[0]) is not None
+    assert reopened.claim(paths[-1]) is None
+
+# 손상된 줄은 건너뛰고 나머지 기록은 읽어야 합니다.
+def test_corrupt_lines_are_skipped(tmp_path):
+    path = _write(tmp_path, 'a.dat')
+    stat = os.stat(path)
+    (tmp_path / 'ledger.log').write_text(f"garbage\nx\ty\tz\n{stat.st_size}\t{stat.st_mtime_ns}\t{os.path.normpath(path)}\n", encoding='utf-8')
+    assert _ledger(tmp_path).claim(path) is None
+
+# is_processed는 기다리지 않고 현재 크기와 수정 시각으로 확인해야 하며, 사라진 파일은 처리한 것으로 보아야 합니다.
+def test_is_processed(tmp_path):
+    ledger = _ledger(tmp_path)
+    path = _write(tmp_path, 'a.dat')
+    assert not ledger.is_processed(path)
+    ledger.mark(path, os.stat(path))
+    assert ledger.is_processed(path)
+    assert ledger.is_processed(str(tmp_path / 'missing.dat'))
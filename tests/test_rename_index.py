@@ -0,0 +1,60 @@
+import os
+from file_monitor.rename_index import RenameIndex
+
+def _noop(*args):
+    pass
+
+# 처음 조회할 때 폴더에 있던 파일을 색인하고, 날짜와 비교 문자열이 맞는 파일만 이름을 바꿔야 합니다.
+def test_rename_seeds_existing_files(tmp_path):
+    sub = tmp_path / 'lot'
+    sub.mkdir()
+    matching = sub / '20240101_120000_A_#1.jpg'
+    other_compare = tmp_path / '20240101_120000_B_#1.jpg'
+    other_date = tmp_path / '20240102_120000_A_#1.jpg'
+    for path in (matching, other_compare, other_date):
+        path.write_bytes(b'')
+
+    events = []
+    index = RenameIndex(str(tmp_path), _noop)
+    assert index.rename(('20240101_120000', '_A_', 'W07'), lambda *args: events.append(args)) == 1
+
+    assert (sub / '20240101_120000_A_W07.jpg').exists()
+    assert other_compare.exists() and other_date.exists()
+    assert len(events) == 1
+    # 이름을 바꾼 파일은 색인에서 빠져 다시 바꾸지 않아야 합니다.
+    assert index.rename(('20240101_120000', '_A_', 'W07'), _noop) == 0
+
+# 새로 추가된 파일도 찾아야 하고, 제거되었거나 대상이 아닌 파일은 무시해야 합니다.
+def test_add_and_discard(tmp_path):
+    index = RenameIndex(str(tmp_path), _noop)
+    index.rename(('00000000_000000', '', ''), _noop)  # 빈 폴더로 색인을 먼저 만듭니다.
+
+    added = tmp_path / '20240101_120000_A_#1.jpg'
+    removed = tmp_path / '20240101_120000_A_B_#1.jpg'
+    for path in (added, removed):
+        path.write_bytes(b'')
+        index.add(str(path))
+    index.discard(str(removed))
+    index.add(str(tmp_path / '20240101_120000_A_done.jpg'))  # "#1"이 없는 파일은 색인하지 않습니다.
+    index.add(str(tmp_path.parent / '20240101_120000_A_#1.jpg'))  # 폴더 밖의 파일도 색인하지 않습니다.
+
+    assert index.rename(('20240101_120000', '_A_', 'W07'), _noop) == 1
+    assert (tmp_path / '20240101_120000_A_W07.jpg').exists()
+    assert removed.exists()
+
+# 파일 이름에 날짜 문자열이 여러 개 있으면 각 날짜로 찾을 수 있어야 합니다.
+def test_file_is_indexed_under_every_datetime(tmp_path):
+    path = tmp_path / '20240101_120000_20240101_130000_#1.jpg'
+    path.write_bytes(b'')
+    index = RenameIndex(str(tmp_path), _noop)
+    assert index.rename(('20240101_130000', '#1', 'W01'), _noop) == 1
+    assert (tmp_path / '20240101_120000_20240101_130000_W01.jpg').exists()
+
+# on_renamed는 이름을 바꾼 파일마다 (이전 경로, 새 경로)로 호출되어야 합니다.
+def test_on_renamed_reports_moves(tmp_path):
+    path = tmp_path / '20240101_120000_A_#1.jpg'
+    path.write_bytes(b'')
+    moves = []
+    index = RenameIndex(str(tmp_path), _noop)
+    index.rename(('20240101_120000', '_A_', 'W07'), _noop, on_renamed=lambda old, new: moves.append((old, new)))
+    assert [(os.path.basename(old), os.path.basename(new)) for old, new in moves] == [('20240101_120000_A_#1.jpg', '20240101_120000_A_W07.jpg')]
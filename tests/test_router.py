@@ -0,0 +1,100 @@
+import itertools
+import re
+from utils import normalize_path
+from file_monitor.router import Router
+
+# 라우터를 도입하기 전과 같은 방식으로, 등록 순서대로 규칙을 하나씩 확인해 첫 번째로 맞는 폴더를 찾습니다.
+def _first_match(regex_folders, filename):
+    for pattern, folder in regex_folders.items():
+        if re.search(pattern, filename):
+            return normalize_path(folder)
+    return None
+
+REGEX_FOLDERS = {
+    r"_IMG_\d+\.jpg$": "images",
+    r"^\d{8}_\d{6}_": "dated",
+    r"WF": "wafer",
+    r"\.csv$": "csv",
+    r"[Rr]esult\.(txt|TXT)$": "text",
+    r"IMG": "any_image",
+}
+
+FILENAMES = [
+    "20240101_120000_WF_IMG_1.jpg",
+    "LOT_WF_IMG_2.jpg",
+    "20240101_120000_A.csv",
+    "data.csv",
+    "result.txt",
+    "Result.TXT",
+    "IMG_only.png",
+    "WF.csv",
+    "nothing.bin",
+    "",
+]
+
+# 합친 정규식의 결과는 규칙을 등록 순서대로 하나씩 확인한 결과와 같아야 합니다.
+def test_combined_regex_matches_first_rule_in_order():
+    router = Router(REGEX_FOLDERS)
+    assert router.snapshot[1] is not None  # 합친 정규식을 사용하는 경로를 확인합니다.
+    for filename in FILENAMES:
+        assert router.match(filename) == _first_match(REGEX_FOLDERS, filename), filename
+
+# 규칙의 순서를 바꿔도 항상 먼저 등록된 규칙이 우선해야 합니다.
+def test_rule_order_is_respected_for_every_permutation():
+    patterns = [r"WF", r"_IMG_\d+\.jpg$", r"^\d{8}_", r"\.jpg$", r"IMG"]
+    for order in itertools.permutations(patterns):
+        regex_folders = {pattern: f"folder{index}" for index, pattern in enumerate(order)}
+        router = Router(regex_folders)
+        for filename in FILENAMES:
+            assert router.match(filename) == _first_match(regex_folders, filename), (order, filename)
+
+# 역참조가 있는 규칙은 합치지 않고 하나씩 확인해야 합니다.
+def test_backreference_falls_back_to_per_rule_matching():
+    regex_folders = {r"(\d)\1": "repeat", r"\d": "digit"}
+    router = Router(regex_folders)
+    assert router.snapshot[1] is None
+    for filename in ["a11", "a12", "abc"]:
+        assert router.match(filename) == _first_match(regex_folders, filename), filename
+
+# 번호로 그룹을 가리키는 조건식이 있는 규칙도 합치지 않고 하나씩 확인해야 합니다.
+def test_conditional_group_reference_falls_back_to_per_rule_matching():
+    regex_folders = {r"(x)?(?(1)a|b)": "f0", r"(?P<n>zz)": "f1", r"\d": "f2", r"i$": "f3"}
+    router = Router(regex_folders)
+    assert router.snapshot[1] is None
+    assert router.match("_9xa0i") == normalize_path("f0")
+    for filename in ["xa", "zz", "b", "_9", "i", "nothing"]:
+        assert router.match(filename) == _first_match(regex_folders, filename), filename
+
+# 이름으로 가리키는 조건식은 합쳐도 같은 그룹을 가리키므로 합친 정규식을 사용할 수 있어야 합니다.
+def test_named_conditional_is_combined():
+    regex_folders = {r"(?P<n>x)?(?(n)a|b)": "f0", r"a": "f1"}
+    router = Router(regex_folders)
+    assert router.snapshot[1] is not None
+    for filename in ["xa", "a", "b", "c"]:
+        assert router.match(filename) == _first_match(regex_folders, filename), filename
+
+# 합칠 수 없는 인라인 플래그가 있어도 규칙을 하나씩 확인해 같은 결과를 내야 합니다.
+def test_inline_flags_keep_first_match_semantics():
+    regex_folders = {r"\.csv$": "csv", r"(?i)result\.txt$": "text", r"\.txt$": "other"}
+    router = Router(regex_folders)
+    for filename in ["data.csv", "RESULT.TXT", "result.txt", "notes.txt", "a.bin"]:
+        assert router.match(filename) == _first_match(regex_folders, filename), filename
+
+# 잘못된 규칙은 건너뛰고 나머지 규칙은 사용해야 합니다.
+def test_invalid_pattern_is_skipped():
+    messages = []
+    router = Router({r"(": "broken", r"\.csv$": "csv"}, messages.append)
+    assert router.match("data.csv") == normalize_path("csv")
+    assert any('Invalid regex' in message for message in messages)
+
+# 규칙을 다시 불러오면 새 규칙으로 찾아야 합니다.
+def test_reload_replaces_rules():
+    router = Router({r"\.csv$": "csv"})
+    assert router.match("data.txt") is None
+    router.reload({r"\.txt$": "text"})
+    assert router.match("data.txt") == normalize_path("text")
+    assert router.match("data.csv") is None
+
+def test_folders_are_unique_in_rule_order():
+    router = Router({r"a": "one", r"b": "two", r"c": "one"})
+    assert router.folders() == [normalize_path("one"), normalize_path("two")]
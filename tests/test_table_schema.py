@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+from upload.table_schema import ColumnSchema, TableSchema, get_schema
+
+def _schema():
+    return TableSchema('t', [
+        ColumnSchema('Name', 'str'),
+        ColumnSchema('Count', 'int32', nullable=False),
+        ColumnSchema('Value', 'float32'),
+        ColumnSchema('Total', 'float64', aliases=('Sum',)),
+        ColumnSchema('When', 'datetime'),
+    ])
+
+# 열은 스키마의 형식으로 변환되고, 잘못된 값과 소수점이 있는 정수 값은 NULL이 되어야 합니다.
+def test_convert_applies_column_dtypes():
+    df = pd.DataFrame({
+        'Name': [' a ', None, 'c'],
+        'Count': [' 1', '2', '3'],
+        'Value': ['0.5', 'bad', ' 1.5'],
+        'Total': [1, 2.5, None],
+        'When': ['2023-08-25 13:23:45', 'bad', None],
+        'Extra': ['x', 'y', 'z'],
+    })
+    df = _schema().convert(df)
+
+    assert df['Name'].tolist() == ['a', None, 'c']
+    assert str(df['Count'].dtype) == 'Int32'
+    assert df['Count'].tolist() == [1, 2, 3]
+    assert str(df['Value'].dtype) == 'float32'
+    assert pd.isna(df['Value'][1])
+    assert str(df['Total'].dtype) == 'float64'
+    assert df['When'][0] == pd.Timestamp('2023-08-25 13:23:45')
+    assert pd.isna(df['When'][1])
+    assert df['Extra'].tolist() == ['x', 'y', 'z']  # 스키마에 없는 열은 그대로 둡니다.
+
+# NULL을 허용하지 않는 열에 값이 없는 행은 제거하고, 제거한 행 수를 attrs에 남겨야 합니다.
+def test_rows_missing_required_columns_are_dropped():
+    df = pd.DataFrame({'Name': ['a', 'b', 'c'], 'Count': ['1', '', '2.5']})
+    df = _schema().convert(df)
+
+    assert df['Name'].tolist() == ['a']
+    assert df.attrs['dropped_rows'] == 2
+    assert 'dropped_rows' not in _schema().convert(pd.DataFrame({'Count': ['1']})).attrs
+
+# 머리글에서 열 이름, 지정한 키, 다른 이름(aliases) 순서로 열을 찾아야 합니다.
+def test_find_uses_aliases():
+    schema = _schema()
+    names = ['Sum', 'Name', 'Other']
+    assert schema.find(names, 'Total') == 0
+    assert schema.find(names, 'Name') == 1
+    assert schema.find(names, 'Value', 'Other') == 2
+    assert schema.find(names, 'Value') is None
+
+def test_unknown_dtype_is_rejected():
+    with pytest.raises(ValueError):
+        ColumnSchema('x', 'decimal')
+
+def test_registered_schemas():
+    for name in ('wf', 'prealign', 'image_data'):
+        assert get_schema(name).name == name
+    assert get_schema('missing') is None
+
+# wf 테이블의 MSE와 GOF는 float64로 변환해야 합니다.
+def test_wf_schema_keeps_float64_precision():
+    df = get_schema('wf').convert(pd.DataFrame({'Point': [1], 'MSE': ['0.123456789'], 'GOF': ['0.987654321']}))
+    assert str(df['MSE'].dtype) == 'float64'
+    assert df['GOF'][0] == 0.987654321
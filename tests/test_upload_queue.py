@@ -0,0 +1,83 @@
+import os
+import pandas as pd
+from sqlalchemy import exc
+from upload.upload_queue import UploadQueue, is_retryable_error
+
+def _queue(tmp_path, insert, messages, **kwargs):
+    return UploadQueue(str(tmp_path / 'spool'), ['wf'], messages.append, batch_size=10,
+                       retry_base_delay=0.01, retry_max_delay=0.01, insert=insert, **kwargs)
+
+def _frame(value):
+    return pd.DataFrame({'value': [value]})
+
+# 데이터 오류로 실패한 파일만 failed 폴더로 옮기고, 나머지 파일은 업로드한 뒤 대기열을 비워야 합니다.
+def test_poison_file_is_moved_to_failed_folder(tmp_path):
+    uploaded = []
+
+    def insert(table, frames):
+        if any(df['value'].iloc[0] == 'bad' for df in frames):
+            raise exc.IntegrityError('INSERT', {}, Exception('duplicate key'))
+        uploaded.extend(df['value'].iloc[0] for df in frames)
+
+    messages = []
+    upload_queue = _queue(tmp_path, insert, messages)
+    upload_queue.start()
+    for value in ['a', 'bad', 'b']:
+        upload_queue.submit('wf', _frame(value))
+    try:
+        assert upload_queue.drain(5)
+    finally:
+        upload_queue.shutdown()
+
+    assert sorted(uploaded) == ['a', 'b']
+    assert os.listdir(tmp_path / 'spool' / 'wf') == []
+    assert len(os.listdir(tmp_path / 'spool' / 'failed' / 'wf')) == 1
+    assert any('non-retryable' in message for message in messages)
+
+# 연결 오류는 다시 시도해 업로드해야 합니다.
+def test_connection_error_is_retried(tmp_path):
+    calls = []
+
+    def insert(table, frames):
+        calls.append(len(frames))
+        if len(calls) < 3:
+            raise exc.OperationalError('INSERT', {}, Exception('server has gone away'))
+
+    messages = []
+    upload_queue = _queue(tmp_path, insert, messages)
+    upload_queue.start()
+    upload_queue.submit('wf', _frame('a'))
+    try:
+        assert upload_queue.drain(5)
+    finally:
+        upload_queue.shutdown()
+
+    assert calls == [1, 1, 1]
+    assert not os.path.exists(tmp_path / 'spool' / 'failed')
+
+# 재시도 횟수를 넘긴 배치는 failed 폴더로 옮겨 종료 시 대기열 비우기를 막지 않아야 합니다.
+def test_retries_are_capped(tmp_path):
+    calls = []
+
+    def insert(table, frames):
+        calls.append(len(frames))
+        raise exc.OperationalError('INSERT', {}, Exception('server has gone away'))
+
+    messages = []
+    upload_queue = _queue(tmp_path, insert, messages, max_attempts=3)
+    upload_queue.start()
+    upload_queue.submit('wf', _frame('a'))
+    try:
+        assert upload_queue.drain(5)
+    finally:
+        upload_queue.shutdown()
+
+    assert len(calls) == 3
+    assert len(os.listdir(tmp_path / 'spool' / 'failed' / 'wf')) == 1
+    assert any('giving up' in message for message in messages)
+
+def test_is_retryable_error():
+    assert is_retryable_error(exc.OperationalError('SELECT 1', {}, Exception('timeout')))
+    assert is_retryable_error(ConnectionResetError())
+    assert not is_retryable_error(exc.IntegrityError('INSERT', {}, Exception('duplicate key')))
+    assert not is_retryable_error(ValueError('bad value'))
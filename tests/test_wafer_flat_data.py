@@ -0,0 +1,38 @@
+import os
+import pandas as pd
+from upload.wafer_flat_data import parse_wafer_flat_file, clean_header
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'wafer_flat.dat')
+
+# 헤더 값은 모든 행에 같은 값으로, 측정 표는 숫자 열로 읽어야 합니다.
+def test_parse_wafer_flat_file():
+    df = parse_wafer_flat_file(FIXTURE, 'EQP01')
+
+    assert len(df) == 3
+    assert (df['LotID'] == 'LOT123').all()
+    assert (df['WaferID'] == 7).all()
+    assert (df['EqpId'] == 'EQP01').all()
+    assert (df['Film'] == '산화막').all()
+    assert df['DateTime'][0] == pd.Timestamp('2023-08-25 13:23:45')
+    assert df['Point'].tolist() == [1, 2, 3]
+    assert df['T1'].tolist() == [100.5, 101.5, 102.5]
+    assert df['T1_noCal'][0] == 101.0
+    # 비어 있거나 숫자가 아닌 값은 NULL이 되어야 합니다.
+    assert pd.isna(df['MSE'][2])
+    assert pd.isna(df['T1_noCal'][2])
+    assert str(df['DieRow'].dtype) == 'Int32'
+    assert pd.isna(df['DieRow'][1])
+    # 파일에 없는 측정 항목은 비어 있는 열로 추가하고, 정의되지 않은 열은 업로드하지 않아야 합니다.
+    assert df['RgnHeight11'].isna().all()
+    assert 'Unused' not in df.columns
+
+# 측정 표가 없으면 None을 반환해야 합니다.
+def test_file_without_table(tmp_path):
+    path = tmp_path / 'empty.dat'
+    path.write_bytes("Lot ID: LOT123\n".encode('cp949'))
+    assert parse_wafer_flat_file(str(path), 'EQP01') is None
+
+def test_clean_header():
+    assert clean_header('T1 (mm)') == 'T1'
+    assert clean_header('T1(no Cal)') == 'T1_noCal'
+    assert clean_header('(Die X)') == 'DieX'
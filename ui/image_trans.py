@@ -1,5 +1,6 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QComboBox, QPushButton, QHBoxLayout, QFileDialog, QMessageBox, QGroupBox
-from config import save_settings
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QComboBox, QPushButton, QHBoxLayout, QFileDialog, QMessageBox, QGroupBox, QSpinBox
+from config import save_settings, save_pdf_profile_settings, load_pdf_profile_settings
+from file_monitor.pdf_writer import PROFILES
 import os
 
 class ImageTransFrame(QWidget):
@@ -57,9 +58,32 @@ class ImageTransFrame(QWidget):
         save_folder_layout.addWidget(self.image_save_folder_button)
         save_folder_group.setLayout(save_folder_layout)
 
+        # PDF Profile 섹션 (현재 이미지 저장 폴더에 적용되는 출력 프로필)
+        profile_group = QGroupBox("PDF Profile (Image Save Folder)")  # PDF 출력 프로필 그룹 박스를 생성합니다.
+        profile_layout = QHBoxLayout()  # PDF 출력 프로필 섹션의 수평 레이아웃을 설정합니다.
+        self.profile_combo = QComboBox()  # 출력 프로필을 선택하는 콤보박스를 생성합니다.
+        self.profile_combo.addItems(PROFILES)
+        self.max_edge_spin = QSpinBox()  # downscale에서 이미지 긴 변의 최대 픽셀 수를 입력합니다.
+        self.max_edge_spin.setRange(256, 10000)
+        self.max_edge_spin.setSingleStep(100)
+        self.quality_spin = QSpinBox()  # 다시 압축할 때 사용할 JPEG 품질을 입력합니다.
+        self.quality_spin.setRange(10, 95)
+        self.load_pdf_profile()  # 저장 폴더의 PDF 출력 프로필을 불러옵니다.
+        self.profile_combo.currentTextChanged.connect(self.update_pdf_profile)  # 값이 변경되면 저장합니다.
+        self.max_edge_spin.valueChanged.connect(self.update_pdf_profile)
+        self.quality_spin.valueChanged.connect(self.update_pdf_profile)
+
+        profile_layout.addWidget(self.profile_combo)
+        profile_layout.addWidget(QLabel("Max Edge"))
+        profile_layout.addWidget(self.max_edge_spin)
+        profile_layout.addWidget(QLabel("Quality"))
+        profile_layout.addWidget(self.quality_spin)
+        profile_group.setLayout(profile_layout)
+
         # 모든 구성 요소를 메인 레이아웃에 추가합니다.
         main_layout.addWidget(condition_group)
         main_layout.addWidget(save_folder_group)
+        main_layout.addWidget(profile_group)
         
         self.setLayout(main_layout)
 
@@ -79,6 +103,7 @@ class ImageTransFrame(QWidget):
             self.image_save_folder_path.setText(normalized_folder)
             self.app.image_save_folder = normalized_folder      # type: ignore
             self.update_settings()
+            self.load_pdf_profile()  # 새 저장 폴더의 PDF 출력 프로필을 표시합니다.
 
     def update_target_image_folder(self, text):
         """선택된 타겟 이미지 폴더를 업데이트합니다."""
@@ -90,6 +115,33 @@ class ImageTransFrame(QWidget):
         self.app.wait_time = text   # type: ignore
         self.update_settings()
 
+    def load_pdf_profile(self):
+        """현재 이미지 저장 폴더의 PDF 출력 프로필을 불러와 표시합니다. (불러오는 동안에는 저장하지 않습니다.)"""
+        pdf_profile = load_pdf_profile_settings(self.app.image_save_folder)     # type: ignore
+        for widget in (self.profile_combo, self.max_edge_spin, self.quality_spin):
+            widget.blockSignals(True)
+        self.profile_combo.setCurrentText(pdf_profile['profile'])
+        self.max_edge_spin.setValue(int(pdf_profile['max_edge']))
+        self.quality_spin.setValue(int(pdf_profile['quality']))
+        for widget in (self.profile_combo, self.max_edge_spin, self.quality_spin):
+            widget.blockSignals(False)
+        self.update_profile_controls()
+
+    def update_pdf_profile(self, *args):
+        """현재 이미지 저장 폴더의 PDF 출력 프로필을 저장합니다. 다음에 만드는 PDF부터 적용됩니다."""
+        save_pdf_profile_settings(self.app.image_save_folder, {     # type: ignore
+            'profile': self.profile_combo.currentText(),
+            'max_edge': self.max_edge_spin.value(),
+            'quality': self.quality_spin.value(),
+        })
+        self.update_profile_controls()
+
+    def update_profile_controls(self):
+        """선택한 프로필에서 사용하는 입력만 활성화합니다."""
+        profile = self.profile_combo.currentText()
+        self.max_edge_spin.setEnabled(self.profile_combo.isEnabled() and profile == 'downscale')
+        self.quality_spin.setEnabled(self.profile_combo.isEnabled() and profile != 'passthrough')
+
     def update_settings(self):
         """현재 설정을 저장합니다."""
         save_settings(
@@ -116,3 +168,5 @@ class ImageTransFrame(QWidget):
         self.clear_button.setEnabled(enabled)
         self.wait_time_combo.setEnabled(enabled)
         self.image_save_folder_button.setEnabled(enabled)
+        self.profile_combo.setEnabled(enabled)
+        self.update_profile_controls()
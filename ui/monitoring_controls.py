@@ -1,14 +1,32 @@
 from PySide6.QtWidgets import QWidget, QPushButton, QCheckBox, QHBoxLayout, QVBoxLayout, QLabel, QApplication, QMessageBox
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from threading import Thread
 from file_monitor.start_monitoring import start_monitoring
 from config import save_settings
+from upload.db_info import dispose_db_engine
+from process_pool import shutdown_process_pool
+from upload.upload_queue import shutdown_upload_queue
+
+# 종료할 때 모니터링 스레드가 남은 이벤트를 처리하고 멈출 때까지 기다리는 최대 시간(초)입니다.
+MONITOR_STOP_TIMEOUT = 60
+# 중지 요청 후 모니터링 스레드가 멈췄는지 확인하는 간격(밀리초)입니다.
+STOP_POLL_INTERVAL_MS = 200
 
 class MonitoringControls(QWidget):
     def __init__(self, parent=None, app=None):
         # 모니터링 제어 UI를 초기화하고 애플리케이션 컨텍스트를 설정합니다.
         super().__init__(parent)
         self.app = app
+        self.monitoring_thread = None
+        # 중지를 요청한 뒤 모니터링 스레드가 멈출 때까지 Run 버튼을 막아 두고, 멈추면 UI를 다시 활성화합니다.
+        self.stop_timer = QTimer(self)
+        self.stop_timer.setInterval(STOP_POLL_INTERVAL_MS)
+        self.stop_timer.timeout.connect(self._check_stopped)
+        # 종료 작업은 GUI 스레드를 막지 않도록 별도 스레드에서 실행하고, 끝나면 애플리케이션을 종료합니다.
+        self.shutdown_thread = None
+        self.quit_timer = QTimer(self)
+        self.quit_timer.setInterval(STOP_POLL_INTERVAL_MS)
+        self.quit_timer.timeout.connect(self._check_quit)
         self.initUI()
 
     def initUI(self):
@@ -47,6 +65,12 @@ class MonitoringControls(QWidget):
             print("App context is not set.")
             return
 
+        # 이전 모니터링 스레드가 남은 이벤트를 처리하는 중이면 새로 시작하지 않습니다.
+        # (같은 stop_event와 저널을 두 스레드가 함께 사용하지 않도록 합니다.)
+        if self.monitoring_thread and self.monitoring_thread.is_alive():
+            self.app.logger.log_debug("MonitoringControls: Previous monitoring run is still stopping")
+            return
+
         # 사용자가 선택한 폴더 설정을 저장합니다.
         self.app.app_context.base_date_folder = self.app.override_names_frame.base_date_combo.currentText()
         self.app.app_context.target_compare_folders = self.app.app_context.target_compare_folders
@@ -81,12 +105,24 @@ class MonitoringControls(QWidget):
             print("App context is not set.")
             return
 
-        # 상태를 'Stopped'로 설정하고, 버튼 상태를 업데이트합니다.
+        # 상태를 'Stopping'으로 설정하고, 모니터링 스레드가 남은 이벤트를 처리하고 멈출 때까지 Run 버튼을 막아 둡니다.
+        self.status_label.setText("Status: Stopping")
+        self.run_button.setEnabled(False)
+        self.stop_button.setEnabled(False)
+        self.app.stop_event.set()
+        self.app.tray_icon.setToolTip("LogFusion Agent (Stopping)")
+        self.app.update_tray_menu()
+        self.stop_timer.start()
+        self._check_stopped()
+
+    # 모니터링 스레드가 멈췄으면 상태를 'Stopped'로 바꾸고 UI를 다시 활성화합니다.
+    def _check_stopped(self):
+        if self.monitoring_thread and self.monitoring_thread.is_alive():
+            return
+        self.stop_timer.stop()
         self.status_label.setText("Status: Stopped")
         self.run_button.setEnabled(True)
-        self.stop_button.setEnabled(False)
         self.app.logger.log_event("Monitoring stopped", "")
-        self.app.stop_event.set()
 
         # 모니터링 중에 비활성화했던 UI 요소들을 다시 활성화합니다.
         self.app.override_names_frame.base_date_combo.setEnabled(True)
@@ -112,8 +148,45 @@ class MonitoringControls(QWidget):
             QMessageBox.warning(self, "Warning", "Stop monitoring before quitting the application.")
             return
 
+        # 남은 업로드를 처리하는 동안(최대 수십 초) 창이 응답하도록, 종료 작업은 별도 스레드에서 실행하고 진행 상태를 표시합니다.
+        self.status_label.setText("Status: Quitting")
+        self.run_button.setEnabled(False)
+        self.stop_button.setEnabled(False)
+        self.quit_button.setEnabled(False)
+        self.debug_checkbox.setEnabled(False)
+        self.app.tray_icon.setToolTip("LogFusion Agent (Quitting)")
+        self.app.update_tray_menu()
+        QApplication.setOverrideCursor(Qt.WaitCursor)  # type: ignore
         self.app.stop_event.set()
+        self.shutdown_thread = Thread(target=self._shutdown_services, name="Shutdown")
+        self.shutdown_thread.daemon = True
+        self.shutdown_thread.start()
+        self.quit_timer.start()
+
+    # 모니터링 스레드, 업로드 큐, 프로세스 풀, 데이터베이스 연결, 로거를 순서대로 멈춥니다. 종료 스레드에서 실행됩니다.
+    def _shutdown_services(self):
+        # 모니터링 스레드가 큐에 남은 이벤트(복사, PDF 변환 등)를 처리하고 멈출 때까지 먼저 기다립니다.
+        monitoring_thread = self.monitoring_thread
+        if monitoring_thread and monitoring_thread.is_alive():
+            monitoring_thread.join(MONITOR_STOP_TIMEOUT)
+            if monitoring_thread.is_alive():
+                self.app.logger.log_debug(f"MonitoringControls: Monitoring thread did not stop within {MONITOR_STOP_TIMEOUT} seconds")
+        try:
+            shutdown_upload_queue()  # 남은 업로드를 처리한 뒤 업로드 큐를 멈춥니다. (끝나지 않은 데이터는 스풀에 남습니다.)
+            shutdown_process_pool()  # PDF 변환, 파일 분석용 프로세스를 종료합니다.
+            dispose_db_engine()  # 데이터베이스 연결 풀의 연결을 모두 닫습니다.
+        except Exception as e:
+            self.app.logger.log_debug(f"MonitoringControls: Shutdown failed: {str(e)}")
+        # 다른 구성 요소가 모두 멈춘 뒤에 로거를 닫아, 마지막 로그까지 파일에 기록합니다.
         self.app.logger.log_event("Application quit", "")
+        self.app.logger.close()  # 모아 둔 로그를 모두 파일에 기록합니다.
+
+    # 종료 스레드가 끝났으면 GUI 스레드에서 트레이 아이콘을 숨기고 애플리케이션을 종료합니다.
+    def _check_quit(self):
+        if self.shutdown_thread and self.shutdown_thread.is_alive():
+            return
+        self.quit_timer.stop()
+        QApplication.restoreOverrideCursor()
         self.app.tray_icon.hide()
         QApplication.instance().quit()  # type: ignore  # 애플리케이션을 종료합니다.
 
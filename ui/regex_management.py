@@ -96,6 +96,13 @@ class RegexManagementFrame(QWidget):
         # 현재 앱의 설정에서 정규 표현식 목록을 가져와 리스트 뷰를 업데이트
         model = QStringListModel([f"{pattern} -> {subfolder}" for pattern, subfolder in self.app.regex_folders.items()])    # type: ignore
         self.regex_list.setModel(model)
+        self.reload_router()
+
+    def reload_router(self):
+        # 모니터링에 사용 중인 라우터가 있으면 변경된 규칙을 다시 컴파일하도록 알립니다.
+        router = getattr(self.app, 'router', None)
+        if router:
+            router.reload(self.app.regex_folders)     # type: ignore
 
     def select_subfolder(self, default_path=''):
         # 사용자가 선택한 폴더 경로를 반환
@@ -103,6 +103,13 @@ class SeparationFrame(QWidget):
         self.rename_combo.clear()
         self.rename_combo.addItem("Unselected")  # 기본값 설정
         self.rename_combo.addItems(self.app.regex_folders.values())     # type: ignore
+        self.reload_router()
+
+    def reload_router(self):
+        # 모니터링에 사용 중인 라우터가 있으면 변경된 규칙을 다시 컴파일하도록 알립니다.
+        router = getattr(self.app, 'router', None)
+        if router:
+            router.reload(self.app.regex_folders)     # type: ignore
 
     def clear_rename(self):
         # 날짜 변경 콤보박스를 초기화하는 메서드
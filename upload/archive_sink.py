@@ -0,0 +1,180 @@
+import glob
+import os
+import threading
+import time
+from datetime import date
+import pandas as pd
+from config import load_archive_settings
+
+# pyarrow가 설치되어 있지 않으면 보관 기능을 사용하지 않습니다.
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# 형식별 파일 확장자입니다.
+EXTENSIONS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+# ArchiveSink 클래스는 업로드할 DataFrame을 로컬 폴더에 날짜별 Parquet(또는 Arrow IPC) 파일로 보관합니다.
+# 폴더 구조: <archive_dir>/<테이블>/date=YYYY-MM-DD/part-<시각>.parquet
+# 데이터는 (테이블, 날짜)별로 메모리에 모았다가 flush_rows행이 되거나 flush_interval초가 지나면 하나의 파일(하나의 row group)로 씁니다.
+# compact_interval초마다 지난 날짜 폴더의 파일들을 하나로 합치고, 종료할 때는 이번 실행에서 쓴 모든 날짜 폴더를 합칩니다.
+# 데이터베이스에 커밋된 데이터만 보관하므로(커밋된 행의 로컬 사본), 장애 중 업로드하지 못한 데이터는 여기가 아니라 업로드 큐의 스풀에 남습니다.
+# load로 다시 읽으면 데이터베이스를 복구하거나 분석할 때 원본 파일을 다시 분석하지 않아도 됩니다.
+class ArchiveSink:
+    def __init__(self, archive_dir, log, file_format='parquet', compression='zstd', flush_rows=50000, flush_interval=30,
+                 compact_interval=3600):
+        # archive_dir: 보관 파일을 저장할 폴더
+        # log: 메시지를 기록하기 위한 함수
+        # file_format: 'parquet' 또는 'arrow'
+        # compression: 압축 방식 (예: 'zstd', 'snappy', 'none')
+        # flush_rows: 파일로 쓰기 전에 모아 둘 최대 행 수
+        # flush_interval: 파일로 쓰기 전에 모아 둘 최대 시간(초)
+        # compact_interval: 지난 날짜 폴더의 파일들을 합치는 주기(초)
+        if pa is None:
+            raise RuntimeError("pyarrow is required for the archive sink")
+        if file_format not in EXTENSIONS:
+            raise ValueError(f"Unknown archive format: {file_format}")
+        self.archive_dir = archive_dir
+        self.log = log
+        self.file_format = file_format
+        self.compression = None if compression in ('', 'none') else compression
+        self.flush_rows = max(1, int(flush_rows))
+        self.flush_interval = float(flush_interval)
+        self.compact_interval = float(compact_interval)
+        self.buffers = {}  # (테이블, 날짜) -> [DataFrame 목록, 행 수]
+        self.written = set()  # 이번 실행에서 파일을 쓴 (테이블, 날짜) 중 아직 합치지 않은 것
+        self.last_compact = time.monotonic()
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._flush_loop, name="ArchiveSink")
+        self.thread.daemon = True
+        self.thread.start()
+
+    # DataFrame을 보관 버퍼에 추가합니다. 날짜는 DateTime 열의 첫 번째 값(없으면 오늘)으로 정합니다.
+    def append(self, table, df):
+        if df is None or not len(df):
+            return
+        key = (table, _partition_date(df))
+        ready = None
+        with self.lock:
+            frames = self.buffers.setdefault(key, [[], 0])
+            frames[0].append(df)
+            frames[1] += len(df)
+            if frames[1] >= self.flush_rows:
+                ready = self.buffers.pop(key)[0]
+        if ready:
+            self._write(key, ready)
+
+    # 모아 둔 데이터를 모두 파일로 씁니다.
+    def flush(self):
+        with self.lock:
+            buffers, self.buffers = self.buffers, {}
+        for key, (frames, _) in buffers.items():
+            self._write(key, frames)
+
+    # 보관해 둔 데이터를 다시 읽습니다. (예: 데이터베이스를 복구하거나 지난 데이터를 분석할 때)
+    def load(self, table, partition_date):
+        paths = self._partition_files(table, partition_date)
+        if not paths:
+            return None
+        return pd.concat([self._read(path) for path in paths], ignore_index=True)
+
+    # 날짜 폴더의 작은 파일들을 하나의 파일로 합칩니다. 합친 파일 수를 반환합니다.
+    def compact(self, table, partition_date):
+        paths = self._partition_files(table, partition_date)
+        if len(paths) < 2:
+            return 0
+        self._write((table, partition_date), [self._read(path) for path in paths])
+        for path in paths:
+            os.remove(path)
+        self.log(f"ArchiveSink: Compacted {len(paths)} files in {table} {partition_date}")
+        return len(paths)
+
+    # 이번 실행에서 쓴 날짜 폴더 중 before보다 이전 날짜(없으면 모든 날짜)의 파일들을 합칩니다.
+    def compact_written(self, before=None):
+        with self.lock:
+            keys = [key for key in self.written if before is None or key[1] < before]
+            self.written.difference_update(keys)
+        for table, partition_date in keys:
+            try:
+                self.compact(table, partition_date)
+            except Exception as e:
+                self.log(f"ArchiveSink: Compaction of {table} {partition_date} failed: {str(e)}")
+
+    # 백그라운드 스레드를 멈추고 남은 데이터를 파일로 쓴 뒤, 이번 실행에서 쓴 날짜 폴더를 합칩니다.
+    def close(self):
+        self.stop_event.set()
+        self.thread.join()
+        self.flush()
+        self.compact_written()
+
+    def _flush_loop(self):
+        while not self.stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                self.log(f"ArchiveSink: Flush failed: {str(e)}")
+            # 오늘 날짜 폴더는 계속 파일이 추가되므로, 지난 날짜 폴더만 주기적으로 합칩니다.
+            if time.monotonic() - self.last_compact >= self.compact_interval:
+                self.last_compact = time.monotonic()
+                self.compact_written(before=date.today().strftime('%Y-%m-%d'))
+
+    # 여러 DataFrame을 하나의 테이블로 합쳐 임시 파일에 쓴 뒤 이름을 바꿉니다.
+    def _write(self, key, frames):
+        table_name, partition_date = key
+        directory = os.path.join(self.archive_dir, table_name, f"date={partition_date}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"part-{time.time_ns()}{EXTENSIONS[self.file_format]}")
+        arrow_table = pa.Table.from_pandas(pd.concat(frames, ignore_index=True), preserve_index=False)
+        temp_path = f"{path}.tmp"
+        if self.file_format == 'parquet':
+            pq.write_table(arrow_table, temp_path, compression=self.compression, row_group_size=arrow_table.num_rows or None)
+        else:
+            options = pa.ipc.IpcWriteOptions(compression=self.compression)
+            with pa.ipc.new_file(temp_path, arrow_table.schema, options=options) as writer:
+                writer.write_table(arrow_table)
+        os.replace(temp_path, path)
+        with self.lock:
+            self.written.add(key)
+        self.log(f"ArchiveSink: Wrote {arrow_table.num_rows} rows to {path}")
+
+    def _read(self, path):
+        if path.endswith(EXTENSIONS['parquet']):
+            return pq.read_table(path).to_pandas()
+        with pa.ipc.open_file(path) as reader:
+            return reader.read_all().to_pandas()
+
+    def _partition_files(self, table, partition_date):
+        directory = os.path.join(self.archive_dir, table, f"date={partition_date}")
+        return sorted(glob.glob(os.path.join(directory, 'part-*.parquet')) + glob.glob(os.path.join(directory, 'part-*.arrow')))
+
+# DataFrame이 속할 날짜(YYYY-MM-DD)를 정하는 함수입니다.
+def _partition_date(df):
+    if 'DateTime' in df.columns:
+        values = pd.to_datetime(df['DateTime'], errors='coerce').dropna()
+        if len(values):
+            return values.iloc[0].strftime('%Y-%m-%d')
+    return date.today().strftime('%Y-%m-%d')
+
+# [Archive] 섹션의 설정으로 보관 기능을 만드는 함수입니다.
+# 사용하지 않도록 설정되었거나 pyarrow가 없으면 None을 반환합니다.
+def create_archive_sink(dest_folder, log):
+    settings = load_archive_settings()
+    if settings['enabled'].lower() != 'true':
+        return None
+    if pa is None:
+        log("ArchiveSink: pyarrow is not installed, archive disabled")
+        return None
+    archive_dir = settings['folder'] or os.path.join(dest_folder, 'archive')
+    return ArchiveSink(
+        archive_dir,
+        log=log,
+        file_format=settings['format'],
+        compression=settings['compression'],
+        flush_rows=settings['flush_rows'],
+        flush_interval=settings['flush_interval'],
+        compact_interval=settings['compact_interval']
+    )
@@ -0,0 +1,60 @@
+import time
+from sqlalchemy import inspect
+from config import load_database_settings
+from upload.db_info import get_db_engine
+
+# (접속 URL, 테이블 이름) -> 데이터베이스 테이블의 열 이름(소문자) 집합입니다. 테이블마다 처음 업로드할 때 한 번만 조회하므로,
+# 실행 중에 테이블에 열을 추가했다면 프로그램을 다시 시작해야 새 열이 업로드됩니다.
+_table_columns = {}
+
+# 여러 DataFrame을 하나의 트랜잭션으로 테이블에 추가하는 함수입니다.
+# 파일마다 트랜잭션을 나누지 않고, 여러 행을 하나의 INSERT 문(VALUES (...), (...), ...)으로 묶어 chunk_size 행씩 보냅니다.
+# 중간에 오류가 나면 전체가 롤백되므로 일부 파일만 업로드되는 일이 없습니다. 추가한 행 수를 반환합니다.
+# 테이블이 이미 있으면 테이블에 없는 열(파서가 keep_unmapped로 가져온 새 열 등)은 업로드하지 않고 log로 기록합니다.
+# log는 처리 결과를 기록할 함수입니다. (예: 로거의 log_debug)
+def bulk_insert(table, frames, log, chunk_size=None):
+    frames = [df for df in frames if df is not None and len(df)]
+    if not frames:
+        return 0
+    if chunk_size is None:
+        chunk_size = int(load_database_settings()['insert_chunk_size'])
+
+    engine = get_db_engine()
+    # SQLite는 한 문장에 넣을 수 있는 값의 개수가 적으므로 여러 행 INSERT 대신 executemany를 사용합니다.
+    method = None if engine.dialect.name == 'sqlite' else 'multi'
+
+    started = time.perf_counter()
+    rows = 0
+    with engine.begin() as connection:
+        frames = _drop_unknown_columns(connection, table, frames, log)
+        for df in frames:
+            df.to_sql(table, con=connection, if_exists='append', index=False, method=method, chunksize=chunk_size)
+            rows += len(df)
+    elapsed = time.perf_counter() - started
+
+    rate = rows / elapsed if elapsed > 0 else float(rows)
+    log(f"bulk_insert: Inserted {rows} rows from {len(frames)} frames into {table} in {elapsed:.2f}s ({rate:.0f} rows/s)")
+    return rows
+
+# 데이터베이스 테이블에 없는 열을 DataFrame에서 뺍니다. 테이블이 아직 없으면 to_sql이 만들도록 그대로 둡니다.
+def _drop_unknown_columns(connection, table, frames, log):
+    key = (str(connection.engine.url), table)
+    columns = _table_columns.get(key)
+    if columns is None:
+        inspector = inspect(connection)
+        if not inspector.has_table(table):
+            return frames
+        columns = {column['name'].lower() for column in inspector.get_columns(table)}
+        _table_columns[key] = columns
+    result = []
+    skipped = set()
+    for df in frames:
+        extras = [name for name in df.columns if str(name).lower() not in columns]
+        if extras:
+            skipped.update(extras)
+            df = df.drop(columns=extras)
+        if len(df.columns):
+            result.append(df)
+    if skipped:
+        log(f"bulk_insert: Skipped columns not in {table}: {', '.join(sorted(map(str, skipped)))}")
+    return result
@@ -1,11 +1,37 @@
+import threading
 from sqlalchemy import create_engine
+from config import load_database_settings
 
+# 프로세스 전체에서 함께 사용하는 엔진입니다. 처음 요청될 때 한 번만 만들어집니다.
+_engine = None
+_engine_lock = threading.Lock()
+
+# 공유 데이터베이스 엔진을 반환하는 함수입니다.
+# 엔진은 연결 풀을 가지고 있으므로, 업로드할 때마다 새 연결을 만들지 않고 풀의 연결을 재사용합니다.
 def get_db_engine():
-    db_user = 'admin'
-    db_password = 'admin'
-    db_host = '10.135.77.154'
-    db_port = '3306'
-    db_name = 'logfusion'
-
-    engine = create_engine(f'mysql+pymysql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}')
-    return engine
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = _create_engine_from_settings()
+    return _engine
+
+# 공유 엔진의 연결을 모두 닫는 함수입니다. 애플리케이션을 종료할 때 호출합니다.
+def dispose_db_engine():
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+
+# [Database] 섹션의 설정으로 엔진을 만드는 함수입니다.
+def _create_engine_from_settings():
+    settings = load_database_settings()
+    url = settings['url']
+    options = {'pool_pre_ping': settings['pool_pre_ping'].lower() == 'true'}
+    # SQLite는 파일 기반이라 연결 풀 크기 설정을 지원하지 않으므로 MySQL 등에서만 지정합니다.
+    if not url.startswith('sqlite'):
+        options['pool_size'] = int(settings['pool_size'])
+        options['max_overflow'] = int(settings['max_overflow'])
+        options['pool_recycle'] = int(settings['pool_recycle'])
+    return create_engine(url, **options)
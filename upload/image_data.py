@@ -1,24 +1,24 @@
-import os
-import pandas as pd
-from upload.db_info import get_db_engine
+from upload.ingest import IngestParser, IngestHandler, Column, META, COLUMN, EQPID, wafer_number
 
-class ImageDataHandler:
-    def __init__(self, folder_to_track, eqpid):
-        self.folder_to_track = folder_to_track
-        self.processed_files = set()
-        self.eqpid = eqpid  # EqpId 값을 생성자에서 받아옵니다.
+# ImageDataParser 클래스는 다이 이미지 정보 파일을 'image_data' 테이블 형식으로 읽습니다.
+# '항목: 값' 헤더에서 랏, 웨이퍼, 시각을 가져오고, 다이 위치와 이미지 파일 이름 외의 열은 정리된 이름 그대로 업로드합니다.
+class ImageDataParser(IngestParser):
+    table = 'image_data'
+    columns = [
+        Column('LotID', META, 'Lot ID'),
+        Column('WaferID', META, 'Wafer ID', parse=wafer_number),
+        Column('DateTime', META, 'Date and Time'),
+        Column('DieRow', COLUMN, 'DieRow'),
+        Column('DieCol', COLUMN, 'DieCol'),
+        Column('ImageFile', COLUMN, 'ImageFile'),
+        Column('EqpId', EQPID),
+    ]
+    keep_unmapped = True
 
-    def on_modified(self, event):
-        for filename in os.listdir(self.folder_to_track):
-            file_path = os.path.join(self.folder_to_track, filename)
-            if os.path.isfile(file_path) and file_path not in self.processed_files:
-                self.process_file(file_path)
-                self.processed_files.add(file_path)
+    # 열 이름의 단위 표기와 공백을 제거합니다. ('Die Row' -> 'DieRow', 'Image File' -> 'ImageFile')
+    def clean_header(self, header):
+        return header.split('(', 1)[0].strip().replace(' ', '')
 
-    def process_file(self, file_path):
-        # Image 데이터 처리를 위한 로직을 추가하세요.
-        pass
-
-    def upload_to_mysql(self, df):
-        engine = get_db_engine()
-        df.to_sql('image_data', con=engine, if_exists='append', index=False)
+# ImageDataHandler 클래스는 다이 이미지 정보 파일을 'image_data' 테이블에 업로드합니다.
+class ImageDataHandler(IngestHandler):
+    parser = ImageDataParser()
@@ -0,0 +1,220 @@
+import fnmatch
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from watchdog.events import FileSystemEventHandler, FileCreatedEvent
+from file_monitor.copy_engine import is_partial_copy
+from upload.bulk_insert import bulk_insert
+from upload.processed_ledger import ProcessedLedger, default_ledger_path
+from upload.table_schema import get_schema
+from utils import normalize_path
+from process_pool import run_cpu_job
+
+# 열 값을 가져오는 위치입니다.
+META = 'meta'  # 헤더의 '항목: 값' 줄 (모든 행에 같은 값)
+COLUMN = 'column'  # 측정 표의 열 이름
+POSITION = 'position'  # 측정 표의 열 위치 (0부터 시작)
+EQPID = 'eqpid'  # 핸들러에 지정된 장비 ID
+
+# Column 클래스는 업로드할 열 하나의 값을 어디에서 가져올지 정의합니다. 형식은 테이블 스키마(table_schema)에서 정합니다.
+class Column:
+    def __init__(self, name, source, key=None, parse=None):
+        # name: 업로드할 테이블의 열 이름
+        # source: 값을 가져올 위치 (META, COLUMN, POSITION, EQPID)
+        # key: 헤더 항목 이름, 측정 표 열 이름 또는 열 위치
+        # parse: 헤더 값(문자열)을 변환하는 함수 (META에서만 사용)
+        self.name = name
+        self.source = source
+        self.key = key
+        self.parse = parse
+
+# 'W12' 같은 웨이퍼 ID에서 웨이퍼 번호(12)를 추출하는 함수입니다.
+def wafer_number(value):
+    match = re.search(r'W(\d+)', value) if value else None
+    return int(match.group(1)) if match else None
+
+# 형식이 정해지지 않은 열은 모든 값이 숫자로 바뀌면 숫자로, 아니면 문자열로 둡니다.
+def infer_column(series):
+    if series.dtype != object:
+        return series
+    stripped = series.str.strip()
+    numbers = pd.to_numeric(stripped, errors='coerce')
+    present = (stripped.notna() & (stripped != '')).sum()
+    return numbers if numbers.notna().sum() == present else stripped
+
+# IngestParser 클래스는 '항목: 값' 헤더 뒤에 구분자로 나뉜 측정 표가 오는 결과 파일을 읽는 공통 파서입니다.
+# 헤더는 한 줄씩 읽고, 측정 표의 머리글 줄을 만나면 나머지 내용은 같은 파일 객체에서 pandas.read_csv로 한 번에 읽습니다.
+# 하위 클래스는 테이블 이름, 측정 표 시작 문자열, 열 정의(columns)만 지정하며, 열 형식은 테이블 스키마에 따라 변환됩니다.
+class IngestParser:
+    table = None  # 업로드할 테이블 이름 (같은 이름의 스키마를 사용합니다.)
+    file_pattern = '*'  # 처리할 파일 이름 패턴
+    encoding = 'cp949'
+    delimiter = ','
+    header_separator = ':'
+    table_marker = None  # 측정 표 머리글 줄의 시작 문자열. None이면 구분자가 있고 ':'가 없는 첫 줄을 머리글로 봅니다.
+    columns = []  # Column 목록 (업로드할 열의 순서대로)
+    keep_unmapped = False  # columns에 없는 측정 표의 열도 원래 이름으로 업로드할지 여부 (테이블에 없는 열은 bulk_insert가 건너뜁니다.)
+
+    # 측정 표의 열 이름을 정리합니다. 하위 클래스에서 단위 표기 등을 제거하도록 바꿀 수 있습니다.
+    def clean_header(self, header):
+        return header.strip()
+
+    # 줄이 측정 표의 머리글인지 확인합니다.
+    def is_table_header(self, line):
+        if self.table_marker:
+            return line.startswith(self.table_marker)
+        return self.delimiter in line and self.header_separator not in line
+
+    # 처리할 파일인지 이름으로 확인합니다.
+    def accepts(self, file_path):
+        return fnmatch.fnmatch(os.path.basename(file_path), self.file_pattern)
+
+    # 파일을 읽어 업로드할 DataFrame을 반환합니다. 측정 표가 없으면 None을 반환합니다.
+    def parse(self, file_path, eqpid):
+        with open(file_path, 'r', encoding=self.encoding) as file:
+            metadata, header_line = self.read_header(file)
+            if header_line is None:
+                return None
+            names = [self.clean_header(name) for name in header_line.rstrip('\r\n').split(self.delimiter)]
+            # 머리글보다 값이 많은 줄(끝에 붙은 구분자 등)도 읽을 수 있도록 머리글 수만큼의 열만 읽고 나머지 값은 버립니다.
+            columns = list(range(len(names)))
+            table = pd.read_csv(file, header=None, names=columns, usecols=columns, index_col=False,
+                                sep=self.delimiter, skipinitialspace=True)
+        return self.build_frame(metadata, names, table, eqpid)
+
+    # 측정 표 머리글 줄이 나올 때까지 헤더를 읽어 (항목 딕셔너리, 머리글 줄)을 반환합니다.
+    def read_header(self, file):
+        metadata = {}
+        for line in iter(file.readline, ''):
+            if self.is_table_header(line):
+                return metadata, line
+            if self.header_separator in line:
+                key, value = line.split(self.header_separator, 1)
+                metadata[key.strip()] = value.strip()
+        return metadata, None
+
+    # 열 정의에 따라 헤더 값과 측정 표의 열을 모아 DataFrame을 만듭니다.
+    def build_frame(self, metadata, names, table, eqpid):
+        schema = get_schema(self.table)
+        df = pd.DataFrame(index=range(len(table)))
+        used = set()
+        for column in self.columns:
+            if column.source == META:
+                value = metadata.get(column.key)
+                df[column.name] = column.parse(value) if column.parse else value
+                continue
+            if column.source == EQPID:
+                df[column.name] = eqpid
+                continue
+            if column.source == POSITION:
+                index = column.key
+            elif schema:
+                index = schema.find(names, column.name, column.key)
+            else:
+                index = names.index(column.key) if column.key in names else None
+            if index is None or index >= table.shape[1]:
+                df[column.name] = None
+                continue
+            used.add(index)
+            df[column.name] = table.iloc[:, index].values
+
+        if self.keep_unmapped:
+            for index, name in enumerate(names[:table.shape[1]]):
+                if index not in used and name and name not in df.columns:
+                    df[name] = infer_column(table.iloc[:, index]).values
+        # 스키마에 정의된 열을 정해진 형식(float64, Int32 등)으로 한 번에 변환합니다.
+        return schema.convert(df) if schema else df
+
+# IngestHandler 클래스는 업로드 폴더의 파일 이벤트를 받아 파서로 읽고 데이터베이스(또는 업로드 큐)에 올립니다.
+# 하위 클래스는 parser만 지정합니다.
+class IngestHandler(FileSystemEventHandler):
+    parser = None  # IngestParser 인스턴스
+
+    def __init__(self, folder_to_track, eqpid, log, upload_queue=None, ledger=None, archive=None, delete_after_upload=False):
+        self.folder_to_track = folder_to_track
+        self.eqpid = eqpid  # EqpId 값을 생성자에서 받아옵니다.
+        self.log = log  # 메시지를 기록하기 위한 함수 (예: 로거의 log_debug)
+        self.upload_queue = upload_queue  # 지정하면 데이터베이스에 직접 쓰지 않고 업로드 큐에 넣습니다.
+        self.archive = archive  # 업로드 큐 없이 직접 업로드할 때, 커밋된 데이터를 로컬 Parquet/Arrow 파일로도 보관합니다.
+        self.delete_after_upload = delete_after_upload  # 업로드가 끝난(또는 업로드 큐에 넣은) 원본 파일을 삭제할지 여부
+        # 처리한 파일을 (경로, 크기, 수정 시각)으로 기억하는 기록입니다. 크기가 제한되고 파일에 저장됩니다.
+        self.ledger = ledger or ProcessedLedger(default_ledger_path(self.parser.table))
+        # 파일 쓰기가 끝나기를 기다리는 작업은 감시 스레드를 막지 않도록 핸들러 전용 워커 스레드에서 처리합니다.
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"Ingest-{self.parser.table}")
+        self.pending = set()  # 워커에 넘겼지만 아직 처리를 시작하지 않은 파일 경로
+        self.pending_lock = threading.Lock()
+
+    # 이벤트가 가리키는 파일 하나만 처리합니다. 감시 스레드에서는 이미 처리한 파일인지만 확인하고 워커에 넘깁니다.
+    def on_modified(self, event):
+        if event.is_directory or is_partial_copy(event.src_path) or not self.parser.accepts(event.src_path):
+            return
+        file_path = normalize_path(event.src_path)
+        if self.ledger.is_processed(file_path):
+            return
+        with self.pending_lock:
+            if file_path in self.pending:
+                return  # 같은 파일의 작업이 이미 대기 중입니다.
+            self.pending.add(file_path)
+        self.executor.submit(self._ingest, file_path)
+
+    def on_created(self, event):
+        self.on_modified(event)
+
+    # 복사 엔진이 임시 파일을 최종 이름으로 바꾸면 이동 이벤트가 발생하므로, 새 파일이 생성된 것으로 처리합니다.
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.on_modified(FileCreatedEvent(event.dest_path))
+
+    # 파일 분석은 프로세스 풀에서 실행하고, 업로드할 DataFrame만 돌려받습니다.
+    # 워커 스레드에서 파일 쓰기가 끝날 때까지 기다린 뒤 처리하고, 처리한 것으로 기록합니다.
+    def _ingest(self, file_path):
+        # 처리를 시작하기 전에 대기 목록에서 빼 두어, 기다리는 동안 파일이 다시 바뀌면 새 작업이 등록되도록 합니다.
+        with self.pending_lock:
+            self.pending.discard(file_path)
+        try:
+            stat = self.ledger.claim(file_path)
+            if stat is None:
+                return
+            self.process_file(file_path)
+            self.ledger.mark(file_path, stat)
+        except Exception as e:
+            self.log(f"IngestHandler: Failed to process {file_path}: {str(e)}")
+
+    # 대기 중인 파일을 모두 처리한 뒤 워커 스레드를 멈춥니다.
+    def stop(self):
+        self.executor.shutdown(wait=True)
+
+    # 파일 하나를 분석해 업로드합니다. 이벤트마다 호출되므로 upload_batch에는 항상 파일 하나만 넘기며,
+    # 여러 파일을 한 트랜잭션으로 묶는 일은 업로드 큐가 batch_size개씩 꺼내 처리할 때 이루어집니다.
+    def process_file(self, file_path):
+        df = run_cpu_job(self.parser.parse, file_path, self.eqpid)
+        if df is not None and df.attrs.get('dropped_rows'):
+            self.log(f"IngestHandler: Dropped {df.attrs['dropped_rows']} rows with missing required values from {file_path}")
+        self.upload_batch([(file_path, df)])
+
+    # (파일 경로, DataFrame) 목록을 한 번에 업로드합니다. 측정 표가 없는 파일(DataFrame이 None)은 업로드하지 않습니다.
+    # 업로드 큐를 사용하면 DataFrame마다 스풀 파일 하나로 들어가고, 업로드 큐 없이 직접 올릴 때만 목록 전체가 한 트랜잭션이 됩니다.
+    def upload_batch(self, batch):
+        uploaded = [(file_path, df) for file_path, df in batch if df is not None]
+        if not uploaded:
+            return
+        self.upload_to_mysql([df for _, df in uploaded])
+        if self.delete_after_upload:
+            for file_path, _ in uploaded:
+                os.remove(file_path)
+                self.log(f"IngestHandler: Deleted uploaded file {file_path}")
+
+    def upload_to_mysql(self, frames):
+        # 업로드 큐에 넣은 데이터는 스풀 파일로 저장되므로, 원본 파일은 바로 삭제해도 됩니다.
+        # 로컬 보관은 업로드 큐가 커밋한 뒤에 처리합니다.
+        if self.upload_queue:
+            for df in frames:
+                self.upload_queue.submit(self.parser.table, df)
+            return
+        bulk_insert(self.parser.table, frames, self.log)
+        # 커밋된 뒤에만 보관하므로, 실패한 업로드를 다시 시도해도 보관 파일에 같은 행이 두 번 들어가지 않습니다.
+        if self.archive:
+            for df in frames:
+                self.archive.append(self.parser.table, df)
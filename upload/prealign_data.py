@@ -1,24 +1,24 @@
-import os
-import pandas as pd
-from upload.db_info import get_db_engine
+from upload.ingest import IngestParser, IngestHandler, Column, META, POSITION, EQPID, wafer_number
 
-class PreAlignHandler:
-    def __init__(self, folder_to_track, eqpid):
-        self.folder_to_track = folder_to_track
-        self.processed_files = set()
-        self.eqpid = eqpid  # EqpId 값을 생성자에서 받아옵니다.
+# PreAlignParser 클래스는 PreAlign 결과 파일(PreAlign*.dat)을 'prealign' 테이블 형식으로 읽습니다.
+# '항목: 값' 헤더에서 랏, 웨이퍼, 시각, 레시피를 가져오고, 측정 표의 열은 정리된 이름 그대로 업로드합니다.
+class PreAlignParser(IngestParser):
+    table = 'prealign'
+    file_pattern = 'PreAlign*.dat'
+    columns = [
+        Column('LotID', META, 'Lot ID'),
+        Column('WaferID', META, 'Wafer ID', parse=wafer_number),
+        Column('DateTime', META, 'Date and Time'),
+        Column('Recipe', META, 'Recipe Name'),
+        Column('Point', POSITION, 0),
+        Column('EqpId', EQPID),
+    ]
+    keep_unmapped = True
 
-    def on_modified(self, event):
-        for filename in os.listdir(self.folder_to_track):
-            file_path = os.path.join(self.folder_to_track, filename)
-            if os.path.isfile(file_path) and file_path not in self.processed_files:
-                self.process_file(file_path)
-                self.processed_files.add(file_path)
+    # 열 이름의 단위 표기('(mm)', '(deg)' 등)와 공백을 제거합니다.
+    def clean_header(self, header):
+        return header.split('(', 1)[0].strip().replace(' ', '')
 
-    def process_file(self, file_path):
-        # PreAlign 데이터 처리를 위한 로직을 추가하세요.
-        pass
-
-    def upload_to_mysql(self, df):
-        engine = get_db_engine()
-        df.to_sql('prealign', con=engine, if_exists='append', index=False)
+# PreAlignHandler 클래스는 PreAlign 결과 파일을 'prealign' 테이블에 업로드합니다.
+class PreAlignHandler(IngestHandler):
+    parser = PreAlignParser()
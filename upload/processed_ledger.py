@@ -0,0 +1,94 @@
+import os
+import threading
+from collections import OrderedDict
+from utils import normalize_path, wait_until_stable
+
+# ProcessedLedger 클래스는 업로드한 파일을 (경로, 크기, 수정 시각)으로 기억해 같은 파일을 다시 처리하지 않도록 합니다.
+# 같은 경로라도 크기나 수정 시각이 바뀌면 새 파일로 보고 다시 처리합니다.
+# 최근 max_entries개만 보관하며, 기록은 파일 끝에 한 줄씩 추가하고 줄 수가 많아지면 현재 내용으로 다시 씁니다.
+class ProcessedLedger:
+    def __init__(self, ledger_file, max_entries=10000, stable_interval=0.5, stable_checks=2, stable_timeout=60):
+        # ledger_file: 처리 기록을 저장할 파일 경로
+        # max_entries: 보관할 최대 항목 수
+        # stable_interval, stable_checks, stable_timeout: 파일 쓰기가 끝났는지 확인하는 조건
+        self.ledger_file = normalize_path(ledger_file)
+        self.max_entries = max(1, int(max_entries))
+        self.stable_interval = float(stable_interval)
+        self.stable_checks = int(stable_checks)
+        self.stable_timeout = float(stable_timeout)
+        self.entries = OrderedDict()  # 경로 -> (크기, 수정 시각(ns))
+        self.lines = 0  # 기록 파일의 줄 수
+        self.lock = threading.Lock()
+        self._load()
+
+    # 현재 크기와 수정 시각으로 이미 처리한 파일인지 바로 확인합니다. 기다리지 않으므로 감시 스레드에서 호출할 수 있습니다.
+    def is_processed(self, file_path):
+        file_path = normalize_path(file_path)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return True  # 사라진 파일은 처리할 필요가 없습니다.
+        with self.lock:
+            return self.entries.get(file_path) == (stat.st_size, stat.st_mtime_ns)
+
+    # 파일 쓰기가 끝날 때까지 기다린 뒤, 아직 처리하지 않은 파일이면 os.stat 결과를 반환합니다.
+    # 파일이 사라졌거나, 쓰기가 끝나지 않았거나, 이미 처리한 파일이면 None을 반환합니다.
+    def claim(self, file_path):
+        file_path = normalize_path(file_path)
+        stat = wait_until_stable(file_path, self.stable_interval, self.stable_checks, self.stable_timeout)
+        if stat is None:
+            return None
+        with self.lock:
+            if self.entries.get(file_path) == (stat.st_size, stat.st_mtime_ns):
+                return None
+        return stat
+
+    # 파일을 처리한 것으로 기록합니다. stat은 claim이 반환한 값입니다.
+    def mark(self, file_path, stat):
+        file_path = normalize_path(file_path)
+        with self.lock:
+            self._set(file_path, (stat.st_size, stat.st_mtime_ns))
+            if self.lines >= self.max_entries * 2:
+                self._compact()
+            else:
+                with open(self.ledger_file, 'a', encoding='utf-8') as file:
+                    file.write(f"{stat.st_size}\t{stat.st_mtime_ns}\t{file_path}\n")
+                self.lines += 1
+
+    # 기록 파일을 읽어 항목을 복원합니다. 손상된 줄은 건너뜁니다.
+    def _load(self):
+        try:
+            with open(self.ledger_file, 'r', encoding='utf-8') as file:
+                for line in file:
+                    self.lines += 1
+                    parts = line.rstrip('\n').split('\t', 2)
+                    if len(parts) != 3:
+                        continue
+                    try:
+                        self._set(parts[2], (int(parts[0]), int(parts[1])))
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+
+    # 항목을 가장 최근 위치로 옮기고, 최대 항목 수를 넘으면 가장 오래된 항목을 제거합니다.
+    def _set(self, file_path, key):
+        self.entries[file_path] = key
+        self.entries.move_to_end(file_path)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    # 현재 보관 중인 항목만으로 기록 파일을 다시 씁니다.
+    def _compact(self):
+        temp_file = f"{self.ledger_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as file:
+            for file_path, (size, mtime_ns) in self.entries.items():
+                file.write(f"{size}\t{mtime_ns}\t{file_path}\n")
+        os.replace(temp_file, self.ledger_file)
+        self.lines = len(self.entries)
+
+# 업로드 핸들러의 기본 처리 기록 파일 경로를 반환하는 함수입니다. (실행 폴더의 EventLog 폴더에 저장합니다.)
+def default_ledger_path(name):
+    log_dir = os.path.join(os.getcwd(), 'EventLog')
+    os.makedirs(log_dir, exist_ok=True)
+    return os.path.join(log_dir, f"{name}_processed.log")
@@ -0,0 +1,159 @@
+import pandas as pd
+
+# 스키마에서 사용할 수 있는 형식과 변환 후 pandas 형식입니다. 정수 형식은 NULL을 허용하는 pandas 정수 형식을 사용합니다.
+DTYPES = {
+    'float32': 'float32',
+    'float64': 'float64',
+    'int32': 'Int32',
+    'int64': 'Int64',
+    'str': 'object',
+    'datetime': 'datetime64[ns]',
+}
+
+# ColumnSchema 클래스는 테이블의 열 하나의 이름, 형식, NULL 허용 여부, 원본 머리글의 다른 이름을 정의합니다.
+class ColumnSchema:
+    def __init__(self, name, dtype, nullable=True, aliases=()):
+        # name: 데이터베이스 열 이름
+        # dtype: DTYPES의 키 중 하나
+        # nullable: False이면 값이 없는 행은 업로드하지 않습니다.
+        # aliases: 측정 표 머리글에서 이 열을 가리키는 다른 이름 목록
+        if dtype not in DTYPES:
+            raise ValueError(f"Unknown dtype '{dtype}' for column {name}")
+        self.name = name
+        self.dtype = dtype
+        self.nullable = nullable
+        self.aliases = tuple(aliases)
+
+# TableSchema 클래스는 테이블 하나의 열 정의 목록입니다.
+# 처음 사용할 때 열마다 변환 함수를 한 번 만들어 두고(compile), 이후에는 DataFrame의 열을 한 번에 변환합니다.
+class TableSchema:
+    def __init__(self, name, columns):
+        self.name = name
+        self.columns = list(columns)
+        self.by_name = {column.name: column for column in self.columns}
+        self.converters = None  # 열 이름 -> 변환 함수 (compile에서 만듭니다.)
+
+    # 열마다 변환 함수를 만들어 저장합니다. 이미 만들었으면 저장된 것을 반환합니다.
+    def compile(self):
+        if self.converters is None:
+            self.converters = {column.name: _make_converter(column.dtype) for column in self.columns}
+        return self.converters
+
+    # 측정 표 머리글 목록에서 열의 위치를 찾습니다. 이름과 다른 이름(aliases)을 순서대로 확인하며, 없으면 None을 반환합니다.
+    def find(self, names, name, key=None):
+        column = self.by_name.get(name)
+        candidates = [key or name] + (list(column.aliases) if column else [])
+        for candidate in candidates:
+            if candidate in names:
+                return names.index(candidate)
+        return None
+
+    # DataFrame의 열을 스키마의 형식으로 변환합니다. 스키마에 없는 열은 그대로 둡니다.
+    # NULL을 허용하지 않는 열에 값이 없는 행은 제거하고, 제거한 행 수를 df.attrs['dropped_rows']에 남깁니다.
+    # (변환은 프로세스 풀에서 실행될 수 있으므로 직접 기록하지 않고, 호출한 쪽에서 로그를 남깁니다.)
+    def convert(self, df):
+        for name, converter in self.compile().items():
+            if name in df.columns:
+                df[name] = converter(df[name])
+        required = [column.name for column in self.columns if not column.nullable and column.name in df.columns]
+        if required:
+            valid = df[required].notna().all(axis=1)
+            dropped = len(df) - int(valid.sum())
+            if dropped:
+                df = df[valid].reset_index(drop=True)
+                df.attrs['dropped_rows'] = dropped
+        return df
+
+# 형식에 맞는 변환 함수를 만드는 함수입니다.
+def _make_converter(dtype):
+    target = DTYPES[dtype]
+    if dtype == 'str':
+        def convert(series):
+            present = series.notna()
+            return series.astype(str).str.strip().astype(object).where(present, None)
+    elif dtype == 'datetime':
+        def convert(series):
+            return pd.to_datetime(series, errors='coerce')
+    elif dtype.startswith('int'):
+        def convert(series):
+            numbers = _to_numeric(series)
+            # 소수점이 있는 값은 정수로 바꿀 수 없으므로 NULL로 처리합니다.
+            return numbers.where(numbers == numbers.round()).astype(target)
+    else:
+        def convert(series):
+            return _to_numeric(series).astype(target)
+    return convert
+
+# 공백이 섞인 문자열 열도 숫자로 변환합니다. 잘못된 값은 NaN이 됩니다.
+def _to_numeric(series):
+    if series.dtype == object:
+        series = series.str.strip()
+    return pd.to_numeric(series, errors='coerce')
+
+# 테이블 이름 -> TableSchema
+SCHEMAS = {}
+
+# 스키마를 등록하는 함수입니다. 같은 이름의 스키마가 있으면 바꿉니다.
+def register_schema(schema):
+    SCHEMAS[schema.name] = schema
+    return schema
+
+# 등록된 스키마를 반환하는 함수입니다. 없으면 None을 반환합니다.
+def get_schema(name):
+    return SCHEMAS.get(name)
+
+# 'wf' 테이블: WaferFlat 측정 결과
+register_schema(TableSchema('wf', [
+    ColumnSchema('CassetteRCP', 'str'),
+    ColumnSchema('StageRCP', 'str'),
+    ColumnSchema('StageGroup', 'str'),
+    ColumnSchema('LotID', 'str'),
+    ColumnSchema('WaferID', 'int32'),
+    ColumnSchema('DateTime', 'datetime'),
+    ColumnSchema('Film', 'str'),
+    ColumnSchema('Point', 'int32', nullable=False),
+    ColumnSchema('MSE', 'float64'),
+    ColumnSchema('EqpId', 'str'),
+    ColumnSchema('T1', 'float64'),
+    ColumnSchema('GOF', 'float64'),
+    ColumnSchema('HPL', 'float64'),
+    ColumnSchema('X', 'float64'),
+    ColumnSchema('Y', 'float64'),
+    ColumnSchema('DieX', 'float64'),
+    ColumnSchema('DieY', 'float64'),
+    ColumnSchema('DieRow', 'int32'),
+    ColumnSchema('DieCol', 'int32'),
+    ColumnSchema('DieNum', 'int32'),
+    ColumnSchema('DiePointTag', 'int32'),
+    ColumnSchema('Z', 'float64'),
+    ColumnSchema('SRVISZ', 'float64'),
+    ColumnSchema('T1_noCal', 'float64', aliases=('T1 _noCal',)),
+    ColumnSchema('CU_HT_noCal', 'float64', aliases=('CU_HT _noCal',)),
+    ColumnSchema('T1_CAL', 'float64'),
+    ColumnSchema('x1', 'float64'),
+    ColumnSchema('RgnHeight11', 'float64'),
+    ColumnSchema('RgnHeight16', 'float64'),
+    ColumnSchema('RgnHeight17', 'float64'),
+    ColumnSchema('RgnBWidth17', 'float64'),
+]))
+
+# 'prealign' 테이블: PreAlign 결과 (측정 표의 나머지 열은 파서가 추론한 형식으로 업로드합니다.)
+register_schema(TableSchema('prealign', [
+    ColumnSchema('LotID', 'str'),
+    ColumnSchema('WaferID', 'int32'),
+    ColumnSchema('DateTime', 'datetime'),
+    ColumnSchema('Recipe', 'str'),
+    ColumnSchema('Point', 'int32', nullable=False),
+    ColumnSchema('EqpId', 'str'),
+]))
+
+# 'image_data' 테이블: 다이 이미지 정보
+register_schema(TableSchema('image_data', [
+    ColumnSchema('LotID', 'str'),
+    ColumnSchema('WaferID', 'int32'),
+    ColumnSchema('DateTime', 'datetime'),
+    ColumnSchema('DieRow', 'int32', aliases=('Row',)),
+    ColumnSchema('DieCol', 'int32', aliases=('Col', 'Column')),
+    ColumnSchema('ImageFile', 'str', nullable=False, aliases=('FileName', 'Image', 'File')),
+    ColumnSchema('EqpId', 'str'),
+]))
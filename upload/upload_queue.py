@@ -0,0 +1,339 @@
+import itertools
+import os
+import pickle
+import queue
+import shutil
+import threading
+import time
+from functools import partial
+from sqlalchemy import exc
+from config import load_database_settings
+from upload.bulk_insert import bulk_insert
+from upload.archive_sink import create_archive_sink
+
+# 업로드할 데이터를 담은 스풀 파일의 확장자입니다.
+SPOOL_SUFFIX = '.pkl'
+# 업로드 큐가 관리하는 테이블 목록입니다.
+UPLOAD_TABLES = ('wf', 'prealign', 'image_data')
+# 업로드할 수 없는 스풀 파일을 옮겨 두는 폴더 이름입니다. (spool_dir/failed/<테이블>)
+FAILED_DIR = 'failed'
+
+# UploadQueue 클래스는 DataFrame 업로드를 백그라운드 워커에서 처리합니다.
+# 1. submit은 데이터를 먼저 스풀 폴더에 파일로 저장한 뒤 테이블별 메모리 큐에 넣으므로, 데이터베이스가 느려도 호출한 쪽은 기다리지 않습니다.
+# 2. 테이블마다 워커 스레드가 큐에서 최대 batch_size개를 꺼내 하나의 트랜잭션으로 업로드하고, 성공하면 스풀 파일을 삭제합니다.
+# 3. 연결 끊김 같은 일시적인 오류로 업로드에 실패하면 지수적으로 늘어나는 시간(retry_base_delay, 2배, 4배 ... 최대 retry_max_delay)만큼
+#    기다렸다가 최대 max_attempts번까지 다시 시도합니다. 데이터 오류처럼 다시 시도해도 성공할 수 없는 오류이거나 재시도 횟수를 넘기면,
+#    배치의 파일을 하나씩 다시 업로드해 보고 실패한 파일만 spool_dir/failed/<테이블> 폴더로 옮겨 뒤의 업로드를 막지 않도록 합니다.
+#    원인을 해결한 뒤 failed 폴더의 파일을 테이블 폴더로 다시 옮기면 다음 시작 시 업로드됩니다.
+# 4. 메모리 큐가 가득 차면 데이터는 스풀에만 남고, 큐가 비면 워커가 스풀에서 다시 읽어 옵니다.
+#    스풀에 쌓인 항목이 queue_size 이상이면 해당 테이블은 백프레셔(backpressure) 상태가 됩니다.
+# 5. 시작할 때 이전 실행에서 업로드하지 못한 스풀 파일을 다시 큐에 넣습니다.
+class UploadQueue:
+    def __init__(self, spool_dir, tables, log, queue_size=100, batch_size=20,
+                 retry_base_delay=1.0, retry_max_delay=60.0, max_attempts=10, insert=None, on_uploaded=None):
+        # spool_dir: 업로드 전 데이터를 저장할 폴더 (테이블별 하위 폴더가 만들어집니다.)
+        # tables: 업로드할 테이블 이름 목록 (예: ['wf', 'prealign', 'image_data'])
+        # log: 메시지를 기록하기 위한 함수
+        # queue_size: 테이블별 메모리 큐의 크기이자 백프레셔 기준
+        # batch_size: 한 트랜잭션으로 업로드할 최대 항목 수
+        # retry_base_delay, retry_max_delay: 재시도 대기 시간의 시작 값과 최대 값(초)
+        # max_attempts: 일시적인 오류로 실패한 배치를 업로드하는 최대 횟수
+        # insert: (테이블, DataFrame 목록)을 받아 업로드하는 함수 (기본값은 log로 기록하는 bulk_insert)
+        # on_uploaded: 업로드가 커밋된 뒤 DataFrame마다 (테이블, DataFrame)으로 호출되는 함수 (예: 로컬 보관)
+        self.spool_dir = spool_dir
+        self.log = log
+        self.queue_size = max(1, int(queue_size))
+        self.batch_size = max(1, int(batch_size))
+        self.retry_base_delay = float(retry_base_delay)
+        self.retry_max_delay = float(retry_max_delay)
+        self.max_attempts = max(1, int(max_attempts))
+        self.insert = insert or partial(bulk_insert, log=log)
+        self.on_uploaded = on_uploaded
+        self.counter = itertools.count()  # 같은 시각에 만든 스풀 파일의 순서를 구분하기 위한 순번
+        self.stop_event = threading.Event()
+        self.tables = {table: _TableState(self.queue_size) for table in tables}
+        self.threads = []
+
+    # 이전 실행에서 남은 스풀 파일을 큐에 넣고 테이블별 워커 스레드를 시작합니다.
+    def start(self):
+        self.stop_event.clear()
+        for table, state in self.tables.items():
+            os.makedirs(self._table_dir(table), exist_ok=True)
+            with state.lock:
+                state.spooled = len(self._list_spool(table))
+                state.overflow = state.spooled > 0
+                state.update_capacity(self.queue_size)
+            if state.spooled:
+                self.log(f"UploadQueue: {state.spooled} spooled uploads pending for {table}")
+            thread = threading.Thread(target=self._worker_loop, args=(table, state), name=f"UploadWorker-{table}")
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+
+    # DataFrame을 스풀에 저장하고 업로드 대기열에 넣습니다. 호출한 쪽을 막지 않습니다.
+    def submit(self, table, df):
+        state = self.tables[table]
+        path = self._write_spool(table, df)
+        with state.lock:
+            state.spooled += 1
+            state.update_capacity(self.queue_size)
+            # 스풀을 다시 읽는 중에 이미 큐에 들어간 파일은 다시 넣지 않습니다.
+            if not state.overflow and path not in state.queued:
+                try:
+                    state.queue.put_nowait(path)
+                    state.queued.add(path)
+                except queue.Full:
+                    # 큐가 가득 차면 스풀에만 남겨 두고, 큐가 비었을 때 워커가 스풀에서 다시 읽어 옵니다.
+                    state.overflow = True
+        return path
+
+    # 테이블에 업로드하지 못한 데이터가 queue_size 이상 쌓여 있으면 True를 반환합니다.
+    def is_backpressured(self, table):
+        return not self.tables[table].capacity.is_set()
+
+    # 테이블의 백프레셔가 풀릴 때까지 최대 timeout초 기다립니다. 풀렸으면 True를 반환합니다.
+    def wait_for_capacity(self, table, timeout=None):
+        return self.tables[table].capacity.wait(timeout)
+
+    # 테이블별로 아직 업로드하지 못한 항목 수를 반환합니다.
+    def pending_counts(self):
+        return {table: state.spooled for table, state in self.tables.items()}
+
+    # 대기 중인 업로드가 모두 끝날 때까지 최대 timeout초 기다립니다. 모두 끝났으면 True를 반환합니다.
+    def drain(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + float(timeout)
+        while any(self.pending_counts().values()):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            if self.stop_event.wait(0.1):
+                return False
+        return True
+
+    # 워커 스레드를 멈춥니다. 업로드하지 못한 데이터는 스풀에 남아 다음 시작 시 다시 업로드됩니다.
+    def shutdown(self):
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+
+    # 테이블 하나의 업로드를 담당하는 워커 루프입니다.
+    def _worker_loop(self, table, state):
+        while not self.stop_event.is_set():
+            batch = self._next_batch(table, state)
+            if not batch:
+                continue
+            items = []
+            for path in batch:
+                try:
+                    with open(path, 'rb') as file:
+                        items.append((path, pickle.load(file)))
+                except (OSError, pickle.UnpicklingError, EOFError) as e:
+                    self.log(f"UploadQueue: Discarding unreadable spool file {path}: {str(e)}")
+            frames = [df for _, df in items]
+            result = self._upload_with_retry(table, frames) if frames else 'ok'
+            if result == 'stopped':
+                # 종료 요청으로 중단된 경우 스풀 파일은 그대로 두고, 다음 시작 시 다시 업로드합니다.
+                return
+            if result == 'ok':
+                self._after_upload(table, frames)
+                self._finish(state, batch)
+                continue
+            # 배치 안의 어떤 파일이 실패의 원인인지 모르므로 파일을 한 번씩 업로드하고, 실패한 파일만 failed 폴더로 옮깁니다.
+            failed = []
+            for path, df in items:
+                if len(items) > 1:
+                    result = self._upload_with_retry(table, [df], max_attempts=1)
+                    if result == 'stopped':
+                        return
+                if result == 'ok':
+                    self._after_upload(table, [df])
+                else:
+                    self._move_to_failed(table, path)
+                    failed.append(path)
+            self._finish(state, batch)
+            if failed:
+                self.log(f"UploadQueue: Moved {len(failed)} of {len(batch)} spool files for {table} to {self._failed_dir(table)}")
+
+    # 큐에서 최대 batch_size개의 스풀 파일 경로를 꺼냅니다. 큐가 비었고 스풀에 남은 항목이 있으면 다시 채웁니다.
+    def _next_batch(self, table, state):
+        if state.queue.empty() and state.overflow:
+            self._refill(table, state)
+        try:
+            batch = [state.queue.get(timeout=1)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(state.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    # 스풀 폴더에서 아직 큐에 없는 파일을 오래된 순서대로 큐가 찰 때까지 넣습니다.
+    def _refill(self, table, state):
+        with state.lock:
+            for path in self._list_spool(table):
+                if path in state.queued:
+                    continue
+                try:
+                    state.queue.put_nowait(path)
+                    state.queued.add(path)
+                except queue.Full:
+                    return
+            state.overflow = False
+
+    # 일시적인 오류로 실패하면 지수 백오프로 최대 max_attempts번(기본값은 self.max_attempts)까지 업로드합니다.
+    # 성공하면 'ok', 다시 시도해도 성공할 수 없거나 재시도 횟수를 넘기면 'failed', 종료 요청으로 중단되면 'stopped'를 반환합니다.
+    def _upload_with_retry(self, table, frames, max_attempts=None):
+        max_attempts = max_attempts or self.max_attempts
+        attempt = 0
+        while True:
+            try:
+                self.insert(table, frames)
+                return 'ok'
+            except Exception as e:
+                attempt += 1
+                if not is_retryable_error(e):
+                    self.log(f"UploadQueue: Upload to {table} failed with a non-retryable error: {str(e)}")
+                    return 'failed'
+                if attempt >= max_attempts:
+                    self.log(f"UploadQueue: Upload to {table} failed {attempt} times, giving up: {str(e)}")
+                    return 'failed'
+                delay = min(self.retry_max_delay, self.retry_base_delay * (2 ** (attempt - 1)))
+                self.log(f"UploadQueue: Upload to {table} failed (attempt {attempt}), retrying in {delay:.1f}s: {str(e)}")
+                if self.stop_event.wait(delay):
+                    return 'stopped'
+
+    # 업로드할 수 없는 스풀 파일을 failed 폴더로 옮깁니다. 옮기지 못하면 스풀 폴더에서 삭제되지 않도록 그대로 둡니다.
+    def _move_to_failed(self, table, path):
+        directory = self._failed_dir(table)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            shutil.move(path, os.path.join(directory, os.path.basename(path)))
+            self.log(f"UploadQueue: Moved failed spool file {path} to {directory}")
+        except OSError as e:
+            self.log(f"UploadQueue: Failed to move spool file {path} to {directory}: {str(e)}")
+
+    # 커밋된 데이터를 on_uploaded에 넘깁니다. 실패해도 업로드는 끝난 것이므로 기록만 남깁니다.
+    def _after_upload(self, table, frames):
+        if not self.on_uploaded:
+            return
+        for df in frames:
+            try:
+                self.on_uploaded(table, df)
+            except Exception as e:
+                self.log(f"UploadQueue: Post-upload hook failed for {table}: {str(e)}")
+
+    # 업로드가 끝난 스풀 파일을 삭제하고 대기 항목 수를 줄입니다. (failed 폴더로 옮긴 파일은 이미 없으므로 건너뜁니다.)
+    def _finish(self, state, batch):
+        for path in batch:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.log(f"UploadQueue: Failed to remove spool file {path}: {str(e)}")
+        with state.lock:
+            state.queued.difference_update(batch)
+            state.spooled = max(0, state.spooled - len(batch))
+            state.update_capacity(self.queue_size)
+
+    # DataFrame을 임시 파일에 쓴 뒤 이름을 바꿔, 쓰는 도중의 파일을 워커가 읽지 않도록 합니다.
+    def _write_spool(self, table, df):
+        name = f"{time.time_ns():020d}_{next(self.counter):06d}{SPOOL_SUFFIX}"
+        path = os.path.join(self._table_dir(table), name)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as file:
+            pickle.dump(df, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        return path
+
+    def _table_dir(self, table):
+        return os.path.join(self.spool_dir, table)
+
+    def _failed_dir(self, table):
+        return os.path.join(self.spool_dir, FAILED_DIR, table)
+
+    # 테이블의 스풀 파일 경로를 만든 순서대로 반환합니다.
+    def _list_spool(self, table):
+        directory = self._table_dir(table)
+        try:
+            names = sorted(name for name in os.listdir(directory) if name.endswith(SPOOL_SUFFIX))
+        except OSError:
+            return []
+        return [os.path.join(directory, name) for name in names]
+
+# 다시 시도하면 성공할 수 있는 오류(연결 끊김, 시간 초과, 파일 입출력 오류)인지 확인하는 함수입니다.
+# 데이터 형식이 맞지 않거나 제약 조건을 어기는 오류처럼 같은 데이터로는 다시 시도해도 실패하는 오류는 False를 반환합니다.
+def is_retryable_error(error):
+    if isinstance(error, (exc.OperationalError, exc.InterfaceError, exc.TimeoutError, exc.DisconnectionError, OSError)):
+        return True
+    return isinstance(error, exc.DBAPIError) and error.connection_invalidated
+
+# [Database] 섹션의 설정으로 업로드 큐를 만드는 함수입니다. 시작은 호출한 쪽에서 start()로 합니다.
+def create_upload_queue(log, on_uploaded=None):
+    settings = load_database_settings()
+    spool_dir = settings['spool_folder']
+    if not os.path.isabs(spool_dir):
+        spool_dir = os.path.join(os.getcwd(), spool_dir)
+    return UploadQueue(
+        spool_dir,
+        UPLOAD_TABLES,
+        log=log,
+        queue_size=settings['upload_queue_size'],
+        batch_size=settings['upload_batch_size'],
+        retry_base_delay=settings['retry_base_delay'],
+        retry_max_delay=settings['retry_max_delay'],
+        max_attempts=settings['upload_max_attempts'],
+        on_uploaded=on_uploaded
+    )
+
+# 애플리케이션 전체에서 함께 사용하는 업로드 큐와 로컬 보관 기능입니다. 처음 요청될 때 만들어 시작합니다.
+_queue = None
+_archive = None
+_queue_lock = threading.Lock()
+
+# 공유 업로드 큐를 반환하는 함수입니다. 모니터링을 다시 시작해도 같은 큐(와 스풀)를 계속 사용합니다.
+# [Archive] 섹션에서 보관 기능을 켜면, 데이터베이스에 커밋된 데이터만 dest_folder 아래(또는 설정한 폴더)에 보관합니다.
+def get_upload_queue(log, dest_folder):
+    global _queue, _archive
+    with _queue_lock:
+        if _queue is None:
+            _archive = create_archive_sink(dest_folder, log)
+            _queue = create_upload_queue(log, on_uploaded=_archive.append if _archive else None)
+            _queue.start()
+        return _queue
+
+# 공유 업로드 큐의 남은 업로드를 최대 timeout초 동안 처리한 뒤 워커와 보관 기능을 멈추는 함수입니다. 애플리케이션을 종료할 때 호출합니다.
+# 시간 안에 끝나지 않은 데이터는 스풀에 남아 다음 실행에서 업로드됩니다.
+def shutdown_upload_queue(timeout=30):
+    global _queue, _archive
+    with _queue_lock:
+        upload_queue, _queue = _queue, None
+        archive, _archive = _archive, None
+    if upload_queue is None:
+        return
+    if not upload_queue.drain(timeout):
+        upload_queue.log(f"UploadQueue: Shutting down with pending uploads {upload_queue.pending_counts()}")
+    upload_queue.shutdown()
+    # 업로드 워커가 멈춘 뒤에 보관 기능을 닫아, 마지막으로 커밋된 데이터까지 파일로 쓰고 합칩니다.
+    if archive:
+        archive.close()
+
+# 테이블 하나의 업로드 대기 상태입니다.
+class _TableState:
+    def __init__(self, queue_size):
+        self.queue = queue.Queue(maxsize=queue_size)  # 업로드할 스풀 파일 경로
+        self.queued = set()  # 큐에 들어 있거나 업로드 중인 스풀 파일 경로
+        self.spooled = 0  # 업로드하지 못한 스풀 파일 수
+        self.overflow = False  # 큐에 넣지 못하고 스풀에만 남은 파일이 있는지 여부
+        self.capacity = threading.Event()  # 백프레셔 상태가 아니면 설정됩니다.
+        self.capacity.set()
+        self.lock = threading.Lock()
+
+    # 대기 항목 수에 따라 백프레셔 신호를 갱신합니다. 잠금을 잡은 상태에서 호출합니다.
+    def update_capacity(self, limit):
+        if self.spooled >= limit:
+            self.capacity.clear()
+        else:
+            self.capacity.set()
@@ -0,0 +1,25 @@
+from upload.wafer_flat_data import WaferFlatHandler
+from upload.prealign_data import PreAlignHandler
+from upload.image_data import ImageDataHandler
+from upload.upload_queue import get_upload_queue
+from config import load_database_settings
+
+# Upload Data 탭의 설정 이름과 해당 폴더를 처리하는 핸들러 클래스입니다.
+UPLOAD_HANDLERS = (
+    ('wafer_flat_data_path', WaferFlatHandler),
+    ('prealign_data_path', PreAlignHandler),
+    ('image_data_path', ImageDataHandler),
+)
+
+# Upload Data 탭에서 선택한 폴더마다 업로드 핸들러를 만드는 함수입니다. 선택하지 않은 폴더는 건너뜁니다.
+# 모든 핸들러는 공유 업로드 큐에 데이터를 넣으므로, 데이터베이스가 느려도 파일 처리가 멈추지 않습니다.
+# [Database] 섹션의 delete_after_upload를 켠 경우에만 업로드 큐에 넣은 원본 파일을 삭제합니다.
+def create_upload_handlers(app_context, log):
+    folders = [(getattr(app_context, name), handler_class) for name, handler_class in UPLOAD_HANDLERS]
+    folders = [(folder, handler_class) for folder, handler_class in folders if folder and folder != 'Unselected']
+    if not folders:
+        return []
+    upload_queue = get_upload_queue(log, app_context.dest_folder)
+    delete_after_upload = load_database_settings()['delete_after_upload'].lower() == 'true'
+    return [handler_class(folder, app_context.eqpid, log, upload_queue=upload_queue, delete_after_upload=delete_after_upload)
+            for folder, handler_class in folders]
@@ -1,4 +1,5 @@
 import os  # 운영체제와 상호작용하기 위한 모듈을 불러옵니다.
+import time  # 파일 상태를 일정 간격으로 확인하기 위한 모듈을 불러옵니다.
 
 # 경로를 정규화하여 반환하는 함수입니다.
 def normalize_path(path):
@@ -30,3 +31,42 @@ def get_log_file_size(file_path):
         return os.path.getsize(file_path)  # 파일의 크기를 바이트 단위로 반환합니다.
     except OSError:
         return 0  # 파일이 존재하지 않거나 접근할 수 없을 때 0을 반환합니다.
+
+# 파일의 크기와 수정 시각이 일정 시간 동안 변하지 않을 때까지 기다리는 함수입니다.
+def wait_until_stable(file_path, interval=0.5, checks=2, timeout=60):
+    """
+    다른 프로그램이 아직 쓰고 있는 파일을 읽지 않도록, 파일의 크기와 수정 시각이
+    interval초 간격으로 checks번 연속 같을 때까지 기다립니다.
+    마지막 수정 후 이미 interval * checks초 이상 지난 파일은 바로 안정된 것으로 봅니다.
+    
+    Args:
+        file_path (str): 확인할 파일의 경로.
+        interval (float): 확인 간격(초).
+        checks (int): 연속으로 같아야 하는 횟수.
+        timeout (float): 최대 대기 시간(초).
+    
+    Returns:
+        os.stat_result: 안정된 파일의 상태 정보. 파일이 사라졌거나 시간 안에 안정되지 않으면 None.
+    """
+    deadline = time.monotonic() + timeout
+    try:
+        previous = os.stat(file_path)
+    except OSError:
+        return None
+    if time.time() - previous.st_mtime >= interval * checks:
+        return previous
+    stable_count = 0
+    while time.monotonic() < deadline:
+        time.sleep(interval)
+        try:
+            current = os.stat(file_path)
+        except OSError:
+            return None
+        if (current.st_size, current.st_mtime_ns) == (previous.st_size, previous.st_mtime_ns):
+            stable_count += 1
+            if stable_count >= checks:
+                return current
+        else:
+            stable_count = 0
+        previous = current
+    return None